@@ -0,0 +1,60 @@
+"""
+Measures the per-object cost of ``Resource.from_response``.
+
+Hydrates the objects of the ``cards_all`` fixture as ``CardsFetch`` resources
+(one of the widest resources) with the generated hydrator, lazily and with
+the previous per-property loop, and prints the time per object of each.
+
+Usage: python benchmarks/hydration.py [iterations]
+"""
+
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from twitter_ads.creative import CardsFetch  # noqa: E402
+
+
+def legacy_from_response(obj, response):
+    """The per-property hydration loop used before the generated hydrators."""
+    for name in obj.PROPERTIES:
+        attr = '_{0}'.format(name)
+        value = response.get(name, None)
+        if isinstance(value, int) and value == 0:
+            continue
+        else:
+            setattr(obj, attr, value)
+    return obj
+
+
+def main(iterations):
+    fixture = os.path.join(os.path.dirname(__file__), '..', 'tests', 'fixtures',
+                           'cards_all.json')
+    with open(fixture) as f:
+        items = json.load(f)['data']
+    count = iterations * len(items)
+
+    def current():
+        for item in items:
+            CardsFetch(None).from_response(item)
+
+    def lazy():
+        for item in items:
+            obj = CardsFetch(None).from_response(item, lazy=True)
+            obj.id, obj.name, obj.updated_at
+
+    def legacy():
+        for item in items:
+            legacy_from_response(CardsFetch(None), item)
+
+    for name, func in (('legacy', legacy), ('generated', current), ('lazy', lazy)):
+        seconds = min(timeit.repeat(func, number=iterations, repeat=5))
+        print('{0:>10}: {1:.2f} us/object ({2} properties)'.format(
+            name, seconds / count * 1e6, len(CardsFetch.PROPERTIES)))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,57 @@
+"""
+Measures the per-object memory of hydrated ``LineItem`` and ``PromotedTweet``
+resources, for the regular classes and their ``compact`` (slotted) variants,
+both eagerly and lazily hydrated. Lazy objects keep their whole response
+dict alive, so they take about twice the memory of eager ones; slots do not
+change that.
+
+Usage: python benchmarks/memory.py [objects]
+"""
+
+import json
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from twitter_ads.campaign import LineItem  # noqa: E402
+from twitter_ads.creative import PromotedTweet  # noqa: E402
+from twitter_ads.resource import compact  # noqa: E402
+
+
+def load(name):
+    fixture = os.path.join(os.path.dirname(__file__), '..', 'tests', 'fixtures',
+                           name + '.json')
+    with open(fixture) as f:
+        return json.load(f)['data']
+
+
+def measure(klass, items, count, lazy):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    # copies of the response items, as a cursor would parse them from each page
+    responses = [json.loads(json.dumps(items[i % len(items)])) for i in range(count)]
+    objects = [klass(None).from_response(item, lazy=lazy) for item in responses]
+    if not lazy:
+        # eager objects do not keep the response items alive
+        del responses
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return (after - before) / count
+
+
+def main(count):
+    for klass, fixture in ((LineItem, 'line_items_all'),
+                           (PromotedTweet, 'promoted_tweets_all')):
+        items = load(fixture)
+        for name, variant in (('regular', klass), ('compact', compact(klass))):
+            for lazy in (False, True):
+                print('{0:>14} {1} {2:>5}: {3:7.0f} bytes/object'.format(
+                    klass.__name__, name, 'lazy' if lazy else 'eager',
+                    measure(variant, items, count, lazy)))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -43,15 +43,14 @@ if not ids:
     print('Error: A minimum of 1 items must be provided for entity_ids')
     sys.exit()
 
-sync_data = []
-# Sync/Async endpoint can handle max 20 entity IDs per request
-# so split the ids list into multiple requests
-for chunk_ids in split_list(ids, 20):
-    sync_data.append(LineItem.all_stats(account, chunk_ids, metric_groups))
+# all_stats splits the ids into requests of at most 20 entity IDs (and the
+# time range into windows of at most 7 days) and sends them concurrently
+sync_data = LineItem.all_stats(account, ids, metric_groups, max_workers=4)
 
 print(sync_data)
 
 # create async stats jobs and get job ids
+# note: the async endpoint can handle max 20 entity IDs per request
 queued_job_ids = []
 for chunk_ids in split_list(ids, 20):
     queued_job_ids.append(LineItem.queue_async_stats_job(account, chunk_ids, metric_groups).id)
@@ -69,3 +68,9 @@ for result in async_stats_job_results:
     async_data.append(LineItem.async_stats_job_data(account, url=result.url))
 
 print(async_data)
+
+# alternatively, let the SDK queue the jobs (20 entity IDs per job), poll their
+# status with an adaptive interval and download each result as soon as it is ready
+jobs = LineItem.async_stats_jobs(account, ids, metric_groups, max_concurrent_jobs=10)
+for job, data in jobs:
+    print(job.id, data)
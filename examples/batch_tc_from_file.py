@@ -51,4 +51,5 @@ for obj in targeting_data:
     tc.targeting_value = obj['params']['targeting_value']
     targeting.append(tc)
 
-TargetingCriteria.batch_save(account, targeting)
+# sent as batches of 500 targeting criteria, 8 batches at a time
+TargetingCriteria.batch_save(account, targeting, max_workers=8)
@@ -40,7 +40,11 @@ CLASSIFIERS = [
 
 extra_opts = {
     'setup_requires': ['flake8==3.7.7', 'pytest-runner'],
-    'tests_require': ['pytest', 'responses', 'mock']
+    'tests_require': ['pytest', 'responses', 'mock', 'aiohttp', 'aioresponses'],
+    'extras_require': {
+        'async': ['aiohttp'],
+        'numpy': ['numpy'],
+    }
 }
 
 if sys.version_info[0] > 2:
@@ -2,6 +2,12 @@ import sys
 import string
 import random
 
+import responses
+
+from twitter_ads.account import Account
+from twitter_ads.client import Client
+from twitter_ads import API_VERSION
+
 def with_resource(resource):
     return 'https://ads-api.twitter.com{resource}'.format(resource=resource)
 
@@ -12,3 +18,15 @@ def with_fixture(name):
 def characters(length):
     chars = string.ascii_uppercase + string.ascii_lowercase + string.digits
     return ''.join(random.choice(chars) for _ in range(length))
+
+
+def load_account(client=None, **options):
+    """Loads the 2iqph fixture account through a client, by default a new one with options."""
+    responses.add(responses.GET,
+                  with_resource('/' + API_VERSION + '/accounts/2iqph'),
+                  body=with_fixture('accounts_load'),
+                  content_type='application/json')
+    if client is None:
+        client = Client(characters(40), characters(40), characters(40), characters(40),
+                        options=options)
+    return Account.load(client, '2iqph')
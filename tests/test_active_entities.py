@@ -1,3 +1,5 @@
+import json
+import pytest
 import responses
 import unittest
 
@@ -7,6 +9,8 @@ from datetime import datetime, timedelta
 from twitter_ads.account import Account
 from twitter_ads.client import Client
 from twitter_ads.campaign import Campaign
+from twitter_ads.checkpoint import FileCheckpointStore
+from twitter_ads.enum import GRANULARITY, METRIC_GROUP
 from twitter_ads import API_VERSION
 
 
@@ -47,3 +51,62 @@ def test_active_entities():
     assert isinstance(active_entities, list)
     assert len(active_entities) == 4
     assert active_entities[0]['entity_id'] == '2mvb28'
+
+
+@responses.activate
+def test_sync_stats(tmp_path):
+    responses.add(responses.GET,
+                  with_resource('/' + API_VERSION + '/accounts/2iqph'),
+                  body=with_fixture('accounts_load'),
+                  content_type='application/json')
+
+    responses.add(responses.GET,
+                  with_resource('/' + API_VERSION + '/stats/accounts/2iqph/active_entities'),
+                  body=with_fixture('active_entities'),
+                  content_type='application/json')
+
+    def callback(request):
+        ids = request.params['entity_ids'].split(',')
+        data = [{'id': id, 'id_data': [{'segment': None, 'metrics': {'clicks': [1]}}]}
+                for id in ids]
+        return (200, {}, json.dumps({'data': data, 'time_series_length': 1}))
+
+    responses.add_callback(responses.GET,
+                           with_resource('/' + API_VERSION + '/stats/accounts/2iqph'),
+                           callback=callback,
+                           content_type='application/json')
+
+    client = Client(
+        characters(40),
+        characters(40),
+        characters(40),
+        characters(40)
+    )
+
+    account = Account.load(client, '2iqph')
+    store = FileCheckpointStore(str(tmp_path))
+
+    with pytest.raises(ValueError):
+        Campaign.sync_stats(account, [METRIC_GROUP.ENGAGEMENT], checkpoint_store=store)
+
+    results = Campaign.sync_stats(
+        account,
+        [METRIC_GROUP.ENGAGEMENT],
+        since=datetime(2019, 2, 28, 8),
+        until=datetime(2019, 3, 1, 8),
+        granularity=GRANULARITY.DAY,
+        checkpoint_store=store
+    )
+
+    # the PUBLISHER_NETWORK only entity is skipped, the others share two day ranges
+    assert [(start, end) for start, end, _ in results] == [
+        (datetime(2019, 2, 27), datetime(2019, 3, 2)),
+        (datetime(2019, 2, 28), datetime(2019, 3, 2))
+    ]
+    assert [entry['id'] for entry in results[0][2]] == ['2mvb29']
+    assert [entry['id'] for entry in results[1][2]] == ['2mvb28', '2n17dx']
+    assert store.load('2iqph:CAMPAIGN:sync_stats') == {'watermark': '2019-03-01T08:00:00Z'}
+
+    Campaign.sync_stats(account, [METRIC_GROUP.ENGAGEMENT], until=datetime(2019, 3, 1, 12),
+                        checkpoint_store=store)
+    assert 'start_time=2019-03-01T08%3A00%3A00Z' in responses.calls[4].request.url
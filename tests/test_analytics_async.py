@@ -1,3 +1,8 @@
+import gzip
+import json
+import re
+import time
+
 import responses
 
 from tests.support import with_resource, with_fixture, characters
@@ -55,6 +60,7 @@ def test_analytics_async():
     assert isinstance(stats, Analytics)
     assert stats.entity_ids == ids
     assert stats.concurrent_job_limit == '100'
+    assert type(stats) is Analytics
 
     stats2 = Analytics.queue_async_stats_job(
         account,
@@ -89,3 +95,110 @@ def test_analytics_async():
     assert job_result is not None
     assert isinstance(job_result, Analytics)
     assert job_result.url == 'https://ton.twimg.com/advertiser-api-async-analytics/stats.json.gz'
+
+
+@responses.activate
+def test_analytics_async_stats_jobs(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(time, 'sleep', lambda s: sleeps.append(s))
+
+    responses.add(responses.GET,
+                  with_resource('/' + API_VERSION + '/accounts/2iqph'),
+                  body=with_fixture('accounts_load'),
+                  content_type='application/json')
+
+    job = json.loads(with_fixture('analytics_async_post'))['data']
+    queued = []
+
+    def queue_callback(request):
+        queued.append(request.params['entity_ids'].split(','))
+        body = {'data': dict(job, id=str(len(queued)), entity_ids=queued[-1])}
+        return (200, {'x-concurrent-job-limit-remaining': '99'}, json.dumps(body))
+
+    polls = []
+
+    def result_callback(request):
+        job_ids = request.params['job_ids'].split(',')
+        polls.append(job_ids)
+        # each job succeeds on its second poll
+        data = [dict(job, id=id,
+                     status='SUCCESS' if sum(id in p for p in polls) > 1 else 'PROCESSING',
+                     url='https://ton.twimg.com/advertiser-api-async-analytics/{0}.json.gz'
+                     .format(id)) for id in job_ids]
+        return (200, {}, json.dumps({'data': data, 'next_cursor': None}))
+
+    def data_callback(request):
+        id = request.url.split('/')[-1].split('.')[0]
+        body = {'data': [{'id': entity_id, 'id_data': []} for entity_id in queued[int(id) - 1]]}
+        return (200, {}, gzip.compress(json.dumps(body).encode()))
+
+    responses.add_callback(responses.POST,
+                           with_resource('/' + API_VERSION + '/stats/jobs/accounts/2iqph'),
+                           callback=queue_callback,
+                           content_type='application/json')
+    responses.add_callback(responses.GET,
+                           with_resource('/' + API_VERSION + '/stats/jobs/accounts/2iqph'),
+                           callback=result_callback,
+                           content_type='application/json')
+    responses.add_callback(responses.GET,
+                           re.compile(r'https://ton\.twimg\.com/advertiser-api-async-analytics/.*'),
+                           callback=data_callback,
+                           content_type='application/gzip')
+
+    client = Client(
+        characters(40),
+        characters(40),
+        characters(40),
+        characters(40)
+    )
+
+    account = Account.load(client, '2iqph')
+
+    ids = ['id{0}'.format(i) for i in range(45)]
+    jobs = Campaign.async_stats_jobs(account, ids, [METRIC_GROUP.ENGAGEMENT],
+                                     granularity=GRANULARITY.TOTAL, max_concurrent_jobs=2,
+                                     poll_interval=1, max_poll_interval=4)
+    results = list(jobs)
+
+    assert len(queued) == 3
+    assert sorted(entity['id'] for _, data in results for entity in data) == sorted(ids)
+    assert all(isinstance(job, Analytics) for job, _ in results)
+    assert jobs.failed == []
+    # two jobs in flight at most, the third one is queued once a slot frees up
+    assert polls == [['1', '2'], ['1', '2'], ['3'], ['3']]
+    # the poll interval backs off while nothing completes
+    assert sleeps == [1, 1.5, 1, 1.5]
+
+
+@responses.activate
+def test_analytics_async_stats_job_data_stream():
+    responses.add(responses.GET,
+                  with_resource('/' + API_VERSION + '/accounts/2iqph'),
+                  body=with_fixture('accounts_load'),
+                  content_type='application/json')
+
+    body = {
+        'request': {'params': {'entity_ids': ['aaaa', 'bbbb']}},
+        'data': [{'id': id, 'id_data': [{'segment': None, 'metrics': {'impressions': [1] * 24}}]}
+                 for id in ['aaaa', 'bbbb', 'cccc']],
+        'time_series_length': 24
+    }
+    url = 'https://ton.twimg.com/advertiser-api-async-analytics/stats.json.gz'
+    responses.add(responses.GET, url,
+                  body=gzip.compress(json.dumps(body).encode()),
+                  content_type='application/gzip')
+
+    client = Client(
+        characters(40),
+        characters(40),
+        characters(40),
+        characters(40)
+    )
+
+    account = Account.load(client, '2iqph')
+
+    records = Campaign.async_stats_job_data(account, url=url, stream=True, chunk_size=16)
+    assert not isinstance(records, (list, dict))
+    assert list(records) == body['data']
+
+    assert Campaign.async_stats_job_data(account, url=url) == body
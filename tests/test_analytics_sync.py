@@ -1,9 +1,13 @@
+import json
 import responses
+
+from datetime import datetime, timedelta
 import unittest
 
 from tests.support import with_resource, with_fixture, characters
 
 from twitter_ads.account import Account
+from twitter_ads.cache import SQLiteStatsCache
 from twitter_ads.client import Client
 from twitter_ads.campaign import Campaign
 from twitter_ads.enum import METRIC_GROUP, GRANULARITY
@@ -46,3 +50,188 @@ def test_analytics_sync_stats():
     assert isinstance(stats, list)
     assert len(stats) == 2
     assert stats[0]['id'] == 'aaaa'
+
+
+@responses.activate
+def test_analytics_sync_stats_fan_out():
+    responses.add(responses.GET,
+                  with_resource('/' + API_VERSION + '/accounts/2iqph'),
+                  body=with_fixture('accounts_load'),
+                  content_type='application/json')
+
+    def callback(request):
+        params = request.params
+        start = datetime.strptime(params['start_time'], '%Y-%m-%dT%H:%M:%SZ')
+        end = datetime.strptime(params['end_time'], '%Y-%m-%dT%H:%M:%SZ')
+        length = int((end - start).total_seconds() // 3600)
+        ids = params['entity_ids'].split(',')
+        assert len(ids) <= 20
+        assert length <= 7 * 24
+        data = [{'id': id, 'id_data': [{'segment': None, 'metrics': {
+            'impressions': [start.day] * length,
+            'clicks': None if start.day == 1 else [1] * length}}]} for id in ids]
+        body = {'data': data, 'time_series_length': length, 'data_type': 'stats'}
+        return (200, {}, json.dumps(body))
+
+    responses.add_callback(responses.GET,
+                           with_resource('/' + API_VERSION + '/stats/accounts/2iqph'),
+                           callback=callback,
+                           content_type='application/json')
+
+    client = Client(
+        characters(40),
+        characters(40),
+        characters(40),
+        characters(40)
+    )
+
+    account = Account.load(client, '2iqph')
+
+    ids = ['id{0}'.format(i) for i in range(45)]
+    stats = Campaign.all_stats(
+        account,
+        ids,
+        [METRIC_GROUP.ENGAGEMENT],
+        granularity=GRANULARITY.HOUR,
+        start_time=datetime(2019, 1, 1),
+        end_time=datetime(2019, 1, 11),
+        max_workers=3
+    )
+
+    # 3 chunks of ids x 2 time windows
+    assert len(responses.calls) == 1 + 6
+    assert [entry['id'] for entry in stats] == ids
+    metrics = stats[0]['id_data'][0]['metrics']
+    assert metrics['impressions'] == [1] * 7 * 24 + [8] * 3 * 24
+    assert metrics['clicks'] == [0] * 7 * 24 + [1] * 3 * 24
+
+    # no entity IDs, no requests
+    assert Campaign.all_stats(account, [], [METRIC_GROUP.ENGAGEMENT],
+                              start_time=datetime(2019, 1, 1),
+                              end_time=datetime(2019, 1, 11)) == []
+    assert len(responses.calls) == 1 + 6
+
+
+@responses.activate
+def test_analytics_sync_stats_fan_out_missing_windows():
+    responses.add(responses.GET,
+                  with_resource('/' + API_VERSION + '/accounts/2iqph'),
+                  body=with_fixture('accounts_load'),
+                  content_type='application/json')
+
+    def callback(request):
+        params = request.params
+        start = datetime.strptime(params['start_time'], '%Y-%m-%dT%H:%M:%SZ')
+        end = datetime.strptime(params['end_time'], '%Y-%m-%dT%H:%M:%SZ')
+        length = int((end - start).total_seconds() // 3600)
+        data = []
+        # aaaa only has data in the second window, bbbb has a segment
+        # only in the first window
+        if start.day != 1:
+            data.append({'id': 'aaaa', 'id_data': [
+                {'segment': None, 'metrics': {'clicks': [1] * length}}]})
+        id_data = [{'segment': {'segment_value': 'all'}, 'metrics': {'clicks': [2] * length}}]
+        if start.day == 1:
+            id_data.append({'segment': {'segment_value': 'first'},
+                            'metrics': {'clicks': [3] * length}})
+        data.append({'id': 'bbbb', 'id_data': id_data})
+        body = {'data': data, 'time_series_length': length, 'data_type': 'stats'}
+        return (200, {}, json.dumps(body))
+
+    responses.add_callback(responses.GET,
+                           with_resource('/' + API_VERSION + '/stats/accounts/2iqph'),
+                           callback=callback,
+                           content_type='application/json')
+
+    client = Client(
+        characters(40),
+        characters(40),
+        characters(40),
+        characters(40)
+    )
+
+    account = Account.load(client, '2iqph')
+
+    stats = Campaign.all_stats(
+        account,
+        ['aaaa', 'bbbb', 'cccc'],
+        [METRIC_GROUP.ENGAGEMENT],
+        granularity=GRANULARITY.HOUR,
+        start_time=datetime(2019, 1, 1),
+        end_time=datetime(2019, 1, 11)
+    )
+
+    # entities without any data are left out
+    assert [entry['id'] for entry in stats] == ['aaaa', 'bbbb']
+    assert stats[0]['id_data'][0]['metrics']['clicks'] == [0] * 7 * 24 + [1] * 3 * 24
+    segments = dict((item['segment']['segment_value'], item['metrics']['clicks'])
+                    for item in stats[1]['id_data'])
+    assert segments['all'] == [2] * 10 * 24
+    assert segments['first'] == [3] * 7 * 24 + [0] * 3 * 24
+
+
+@responses.activate
+def test_analytics_sync_stats_cache(tmp_path):
+    responses.add(responses.GET,
+                  with_resource('/' + API_VERSION + '/accounts/2iqph'),
+                  body=with_fixture('accounts_load'),
+                  content_type='application/json')
+
+    def callback(request):
+        params = request.params
+        start = datetime.strptime(params['start_time'], '%Y-%m-%dT%H:%M:%SZ')
+        end = datetime.strptime(params['end_time'], '%Y-%m-%dT%H:%M:%SZ')
+        hours = [start + timedelta(hours=i)
+                 for i in range(int((end - start).total_seconds() // 3600))]
+        data = [{'id': id, 'id_data': [{'segment': None, 'metrics': {
+            'impressions': [hour.day * 100 + hour.hour for hour in hours],
+            'clicks': None}}]} for id in params['entity_ids'].split(',')]
+        body = {'data': data, 'time_series_length': len(hours), 'data_type': 'stats'}
+        return (200, {}, json.dumps(body))
+
+    responses.add_callback(responses.GET,
+                           with_resource('/' + API_VERSION + '/stats/accounts/2iqph'),
+                           callback=callback,
+                           content_type='application/json')
+
+    client = Client(
+        characters(40),
+        characters(40),
+        characters(40),
+        characters(40)
+    )
+
+    account = Account.load(client, '2iqph')
+    cache = SQLiteStatsCache(str(tmp_path / 'stats.db'))
+
+    def stats(ids, start_time, end_time):
+        return Campaign.all_stats(account, ids, [METRIC_GROUP.ENGAGEMENT],
+                                  granularity=GRANULARITY.HOUR, start_time=start_time,
+                                  end_time=end_time, cache=cache)
+
+    first = stats(['aaaa', 'bbbb'], datetime(2019, 1, 1), datetime(2019, 1, 3))
+    assert len(responses.calls) == 2
+
+    # only the missing day is requested
+    second = stats(['aaaa', 'bbbb'], datetime(2019, 1, 2), datetime(2019, 1, 4))
+    assert len(responses.calls) == 3
+    assert 'start_time=2019-01-03T00%3A00%3A00Z' in responses.calls[2].request.url
+    metrics = second[0]['id_data'][0]['metrics']
+    assert metrics['impressions'] == first[0]['id_data'][0]['metrics']['impressions'][24:] + \
+        [300 + hour for hour in range(24)]
+    assert metrics['clicks'] is None
+
+    # a new entity only fetches its own buckets
+    stats(['aaaa', 'cccc'], datetime(2019, 1, 1), datetime(2019, 1, 4))
+    assert len(responses.calls) == 4
+    assert 'entity_ids=cccc&' in responses.calls[3].request.url + '&'
+
+    cache.invalidate('2iqph', entity_ids=['aaaa'], start_time=datetime(2019, 1, 3))
+    stats(['aaaa', 'bbbb'], datetime(2019, 1, 1), datetime(2019, 1, 4))
+    assert len(responses.calls) == 5
+    assert 'entity_ids=aaaa&' in responses.calls[4].request.url + '&'
+
+    # recent buckets expire, final ones do not
+    now = datetime.utcnow()
+    assert cache.expires_at(now, now) is not None
+    assert cache.expires_at(now - timedelta(days=2), now) is None
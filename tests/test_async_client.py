@@ -0,0 +1,147 @@
+import asyncio
+import re
+
+import pytest
+from aioresponses import aioresponses
+
+from tests.support import with_resource, with_fixture, characters
+
+from twitter_ads.account import Account
+from twitter_ads.campaign import Campaign
+from twitter_ads.client import AsyncClient, Client
+from twitter_ads.cursor import AsyncCursor
+from twitter_ads.error import NotFound
+from twitter_ads.http import Request
+from twitter_ads import API_VERSION
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+def test_async_client_cursor():
+    async def scenario():
+        client = AsyncClient(characters(40), characters(40), characters(40), characters(40))
+        with aioresponses() as mocked:
+            mocked.get(with_resource('/' + API_VERSION + '/accounts/2iqph'),
+                       body=with_fixture('accounts_load'),
+                       content_type='application/json')
+            mocked.get(re.compile(re.escape(with_resource(
+                '/' + API_VERSION + '/accounts/2iqph/campaigns')) + r'.*'),
+                body=with_fixture('campaigns_all'),
+                content_type='application/json',
+                headers={'x-account-rate-limit-remaining': '9999'})
+
+            account = await client.accounts('2iqph')
+            cursor = Campaign.all_async(account)
+            campaigns = []
+            async for campaign in cursor:
+                campaigns.append(campaign)
+            requests = list(mocked.requests.keys())
+        await client.close()
+        return account, cursor, campaigns, requests
+
+    account, cursor, campaigns, requests = run(scenario())
+    assert isinstance(account, Account)
+    assert account.id == '2iqph'
+    assert isinstance(cursor, AsyncCursor)
+    assert cursor.exhausted
+    assert cursor.account_rate_limit_remaining == '9999'
+    assert len(campaigns) == cursor.fetched
+    assert all(isinstance(c, Campaign) for c in campaigns)
+    assert len(requests) == 2
+
+
+def test_async_client_signs_requests():
+    async def scenario():
+        client = AsyncClient(characters(40), characters(40), characters(40), characters(40))
+        with aioresponses() as mocked:
+            mocked.get(with_resource('/' + API_VERSION + '/accounts/2iqph'),
+                       body=with_fixture('accounts_load'),
+                       content_type='application/json')
+            await client.accounts('2iqph')
+            call = list(mocked.requests.values())[0][0]
+        await client.close()
+        return call
+
+    call = run(scenario())
+    assert call.kwargs['headers']['Authorization'].startswith('OAuth ')
+
+
+def test_async_client_context_manager():
+    client = AsyncClient(characters(40), characters(40), characters(40), characters(40))
+    with pytest.raises(TypeError):
+        with client:
+            pass
+
+    async def scenario():
+        async with client:
+            session = client.session
+        return session
+
+    session = run(scenario())
+    assert session.closed
+    assert client._session is None
+
+
+def test_async_client_deadline_keeps_timeout():
+    async def scenario():
+        client = AsyncClient(characters(40), characters(40), characters(40), characters(40),
+                             options={'timeout': (5, 10)})
+        with aioresponses() as mocked:
+            mocked.get(with_resource('/' + API_VERSION + '/accounts/2iqph'),
+                       body=with_fixture('accounts_load'),
+                       content_type='application/json')
+            await Account.load_async(client, '2iqph', deadline=100)
+            call = list(mocked.requests.values())[0][0]
+        await client.close()
+        return call
+
+    timeout = run(scenario()).kwargs['timeout']
+    assert (timeout.sock_connect, timeout.sock_read) == (5, 10)
+    assert 0 < timeout.total <= 100
+
+
+def test_async_client_perform_mismatch():
+    client = AsyncClient(characters(40), characters(40), characters(40), characters(40))
+    account = Account(client)
+    account._id = '2iqph'
+    with pytest.raises(TypeError, match='perform_async'):
+        account.campaigns()
+
+    sync_client = Client(characters(40), characters(40), characters(40), characters(40))
+    request = Request(sync_client, 'get', '/' + API_VERSION + '/accounts/2iqph')
+    with pytest.raises(TypeError, match='AsyncClient'):
+        run(request.perform_async())
+
+
+def test_async_client_retry(monkeypatch):
+    async def no_sleep(seconds):
+        pass
+
+    monkeypatch.setattr(asyncio, 'sleep', no_sleep)
+
+    async def scenario():
+        client = AsyncClient(characters(40), characters(40), characters(40), characters(40),
+                             options={'retry_max': 1, 'retry_on_status': [404]})
+        with aioresponses() as mocked:
+            url = with_resource('/' + API_VERSION + '/accounts/2iqph')
+            mocked.get(url, status=404, body=with_fixture('accounts_load'),
+                       content_type='application/json')
+            mocked.get(url, status=404, body=with_fixture('accounts_load'),
+                       content_type='application/json')
+            try:
+                await client.accounts('2iqph')
+            except NotFound as e:
+                error = e
+            calls = sum(len(v) for v in mocked.requests.values())
+        await client.close()
+        return error, calls
+
+    error, calls = run(scenario())
+    assert isinstance(error, NotFound)
+    assert calls == 2
@@ -0,0 +1,114 @@
+import json
+import threading
+
+import pytest
+import responses
+
+from tests.support import with_resource, load_account
+
+from twitter_ads.campaign import LineItem, TargetingCriteria
+from twitter_ads.error import BadRequest, BatchError
+from twitter_ads import API_VERSION
+
+
+BATCH_TARGETING_CRITERIA = with_resource(
+    '/' + API_VERSION + '/batch/accounts/2iqph/targeting_criteria')
+
+
+def targeting_criteria(account, count):
+    objs = []
+    for i in range(count):
+        tc = TargetingCriteria(account)
+        tc.line_item_id = '1a2bc'
+        tc.targeting_type = 'BROAD_KEYWORD'
+        tc.targeting_value = 'keyword{0}'.format(i)
+        objs.append(tc)
+    return objs
+
+
+@responses.activate
+def test_batch_save_chunks():
+    account = load_account()
+    lock = threading.Lock()
+    sizes = []
+
+    def callback(request):
+        body = json.loads(request.body)
+        with lock:
+            sizes.append(len(body))
+        if body[0]['params']['targeting_value'] == 'keyword500':
+            errors = [[] for _ in body]
+            errors[1] = [{'code': 'INVALID_PARAMETER', 'message': 'invalid keyword'}]
+            return (400, {}, json.dumps({'errors': [{'code': 'INVALID_PARAMETER'}],
+                                         'operation_errors': errors}))
+        data = [dict(item['params'], id='tc{0}'.format(item['params']['targeting_value']))
+                for item in body]
+        return (200, {}, json.dumps({'data': data}))
+
+    responses.add_callback(responses.POST, BATCH_TARGETING_CRITERIA, callback=callback,
+                           content_type='application/json')
+
+    objs = targeting_criteria(account, 1100)
+    with pytest.raises(BatchError) as excinfo:
+        TargetingCriteria.batch_save(account, objs, max_workers=3)
+
+    assert sorted(sizes) == [100, 500, 500]
+    # the other batches were saved
+    assert objs[0].id == 'tckeyword0'
+    assert objs[1099].id == 'tckeyword1099'
+    assert objs[500].id is None
+
+    error = excinfo.value
+    assert len(error.errors) == 1 and isinstance(error.errors[0], BadRequest)
+    assert [obj for obj, _ in error.failed] == objs[500:1000]
+    assert error.failed[1][1][0]['message'] == 'invalid keyword'
+    assert error.failed[0][1] == []
+
+
+@responses.activate
+def test_batch_save_single_request():
+    account = load_account()
+
+    responses.add(responses.POST,
+                  with_resource('/' + API_VERSION + '/batch/accounts/2iqph/line_items'),
+                  status=400,
+                  body=json.dumps({'errors': [{'code': 'INVALID_PARAMETER'}]}),
+                  content_type='application/json')
+
+    line_items = [LineItem(account) for _ in range(40)]
+    with pytest.raises(BatchError) as excinfo:
+        LineItem.batch_save(account, line_items)
+    assert len(responses.calls) == 2
+
+    error = excinfo.value
+    assert len(error.errors) == 1 and isinstance(error.errors[0], BadRequest)
+    assert [obj for obj, _ in error.failed] == line_items
+
+
+@responses.activate
+def test_batch_save_updates_changed_properties():
+    account = load_account()
+    bodies = []
+
+    def callback(request):
+        body = json.loads(request.body)
+        bodies.append(body)
+        data = [dict(item['params'], id=item['params']['targeting_criterion_id'])
+                for item in body]
+        return (200, {}, json.dumps({'data': data}))
+
+    responses.add_callback(responses.POST, BATCH_TARGETING_CRITERIA, callback=callback,
+                           content_type='application/json')
+
+    objs = [TargetingCriteria(account).from_response(
+        {'id': 'tc{0}'.format(i), 'line_item_id': '1a2bc', 'targeting_type': 'BROAD_KEYWORD',
+         'targeting_value': 'keyword{0}'.format(i)}) for i in range(3)]
+    objs[1].targeting_value = 'changed'
+
+    TargetingCriteria.batch_save(account, objs)
+    assert bodies == [[{'operation_type': 'Update', 'params': {
+        'targeting_value': 'changed', 'targeting_criterion_id': 'tc1'}}]]
+
+    # nothing changed anymore
+    TargetingCriteria.batch_save(account, objs)
+    assert len(bodies) == 1
@@ -0,0 +1,160 @@
+import time
+
+import pytest
+import responses
+
+from tests.support import with_resource, with_fixture, characters
+
+from twitter_ads.account import Account
+from twitter_ads.breaker import CircuitBreaker
+from twitter_ads.campaign import Campaign
+from twitter_ads.client import Client
+from twitter_ads.enum import CIRCUIT_STATE
+from twitter_ads.error import CircuitOpen, DeadlineExceeded, ServiceUnavailable
+from twitter_ads.scheduler import RateLimitScheduler
+from twitter_ads import API_VERSION
+
+
+def test_circuit_breaker_states(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, 'time', lambda: now[0])
+
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=30)
+    breaker.acquire('campaigns')
+    breaker.record('campaigns', 503)
+    breaker.record('campaigns', 404)
+    breaker.record('campaigns', 503)
+    assert breaker.state('campaigns') == CIRCUIT_STATE.CLOSED
+
+    breaker.record('campaigns', None)
+    assert breaker.states() == {'campaigns': CIRCUIT_STATE.OPEN}
+    with pytest.raises(CircuitOpen) as e:
+        breaker.acquire('campaigns')
+    assert e.value.family == 'campaigns'
+    assert e.value.retry_at == 1030.0
+    breaker.acquire('line_items')
+
+    # a single probe is let through once half-open
+    now[0] += 30
+    assert breaker.state('campaigns') == CIRCUIT_STATE.HALF_OPEN
+    breaker.acquire('campaigns')
+    with pytest.raises(CircuitOpen):
+        breaker.acquire('campaigns')
+    breaker.record('campaigns', 500)
+    assert breaker.state('campaigns') == CIRCUIT_STATE.OPEN
+
+    now[0] += 30
+    breaker.acquire('campaigns')
+    breaker.record('campaigns', 200)
+    assert breaker.state('campaigns') == CIRCUIT_STATE.CLOSED
+
+    breaker.record('campaigns', 503)
+    breaker.record('campaigns', 503)
+    breaker.reset()
+    assert breaker.states() == {}
+
+
+@responses.activate
+def test_circuit_breaker_fails_fast(monkeypatch):
+    monkeypatch.setattr(time, 'sleep', lambda s: None)
+
+    responses.add(responses.GET,
+                  with_resource('/' + API_VERSION + '/accounts/2iqph'),
+                  body=with_fixture('accounts_load'),
+                  content_type='application/json')
+    responses.add(responses.GET,
+                  with_resource('/' + API_VERSION + '/accounts/2iqph/campaigns'),
+                  status=503,
+                  body='{}',
+                  content_type='application/json')
+
+    breaker = CircuitBreaker(failure_threshold=2)
+    client = Client(
+        characters(40),
+        characters(40),
+        characters(40),
+        characters(40),
+        options={
+            'retry_max': 5,
+            'retry_on_status': [503],
+            'circuit_breaker': breaker
+        }
+    )
+
+    account = Account.load(client, '2iqph')
+
+    with pytest.raises(CircuitOpen):
+        Campaign.all(account)
+    assert len(responses.calls) == 3
+
+    with pytest.raises(CircuitOpen):
+        Campaign.all(account)
+    assert len(responses.calls) == 3
+    assert breaker.states() == {'accounts': CIRCUIT_STATE.CLOSED,
+                                'campaigns': CIRCUIT_STATE.OPEN}
+
+
+@responses.activate
+def test_circuit_breaker_probe_not_sent(monkeypatch):
+    now = [time.time()]
+    monkeypatch.setattr(time, 'time', lambda: now[0])
+
+    responses.add(responses.GET,
+                  with_resource('/' + API_VERSION + '/accounts/2iqph'),
+                  body=with_fixture('accounts_load'),
+                  content_type='application/json')
+    responses.add(responses.GET,
+                  with_resource('/' + API_VERSION + '/accounts/2iqph/campaigns'),
+                  status=503,
+                  body='{}',
+                  content_type='application/json')
+    responses.add(responses.GET,
+                  with_resource('/' + API_VERSION + '/accounts/2iqph/campaigns'),
+                  body=with_fixture('campaigns_all'),
+                  content_type='application/json')
+
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=30)
+    scheduler = RateLimitScheduler()
+    client = Client(
+        characters(40),
+        characters(40),
+        characters(40),
+        characters(40),
+        options={'circuit_breaker': breaker, 'rate_limit_scheduler': scheduler}
+    )
+    account = Account.load(client, '2iqph')
+
+    with pytest.raises(ServiceUnavailable):
+        Campaign.all(account)
+    now[0] += 30
+    assert breaker.state('campaigns') == CIRCUIT_STATE.HALF_OPEN
+
+    # the rate-limit wait does not fit in the deadline, no probe is sent
+    scheduler.update(('2iqph', 'campaigns'), {
+        'x-account-rate-limit-remaining': '0',
+        'x-account-rate-limit-reset': str(int(now[0]) + 600)
+    })
+    with pytest.raises(DeadlineExceeded):
+        Campaign.all(account, deadline=1)
+    assert breaker.state('campaigns') == CIRCUIT_STATE.HALF_OPEN
+
+    scheduler.update(('2iqph', 'campaigns'), {
+        'x-account-rate-limit-remaining': '100',
+        'x-account-rate-limit-reset': str(int(now[0]) + 1200)
+    })
+    assert Campaign.all(account).count == 10
+    assert breaker.state('campaigns') == CIRCUIT_STATE.CLOSED
+
+
+def test_circuit_breaker_release(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, 'time', lambda: now[0])
+
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=30)
+    breaker.record('campaigns', 503)
+    now[0] += 30
+    breaker.acquire('campaigns')
+    breaker.release('campaigns')
+    breaker.acquire('campaigns')
+    with pytest.raises(CircuitOpen):
+        breaker.acquire('campaigns')
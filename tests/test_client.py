@@ -1,5 +1,6 @@
 # Copyright (C) 2015 Twitter, Inc.
 import responses
+import time
 
 from tests.support import with_resource, with_fixture, characters
 
@@ -67,3 +68,53 @@ def test_accounts_with_options():
     assert client is not None
     assert isinstance(client, Client)
     assert len(client.options) == 5
+
+
+@responses.activate
+def test_client_reuses_session():
+    responses.add(responses.GET, with_resource('/' + API_VERSION + '/accounts/2iqph'),
+                  body=with_fixture('accounts_load'),
+                  content_type='application/json')
+
+    client = Client(
+        characters(40),
+        characters(40),
+        characters(40),
+        characters(40),
+        options={
+            'pool_connections': 2,
+            'pool_maxsize': 20
+        }
+    )
+
+    session = client.session
+    client.accounts('2iqph')
+    client.accounts('2iqph')
+    assert len(responses.calls) == 2
+    assert client.session is session
+
+    adapter = session.get_adapter(with_resource('/'))
+    assert adapter._pool_connections == 2
+    assert adapter._pool_maxsize == 20
+
+    client.close()
+    assert client.session is not session
+
+
+def test_client_session_idle_timeout(monkeypatch):
+    client = Client(
+        characters(40),
+        characters(40),
+        characters(40),
+        characters(40),
+        options={'pool_idle_timeout': 60}
+    )
+
+    now = [1000.0]
+    monkeypatch.setattr(time, 'time', lambda: now[0])
+
+    session = client.session
+    now[0] += 30
+    assert client.session is session
+    now[0] += 61
+    assert client.session is not session
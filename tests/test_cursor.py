@@ -0,0 +1,291 @@
+import gc
+import json
+import threading
+
+import pytest
+import responses
+from responses import matchers
+
+from tests.support import with_resource, with_fixture, characters, load_account
+
+from twitter_ads.campaign import Campaign
+from twitter_ads.checkpoint import FileCheckpointStore, SQLiteCheckpointStore
+from twitter_ads.client import Client
+from twitter_ads.cursor import Cursor, checkpoint_key, pop_cursor_options
+from twitter_ads.error import DeadlineExceeded, ServerError
+from twitter_ads.http import Request
+from twitter_ads import API_VERSION
+
+
+CAMPAIGNS = with_resource('/' + API_VERSION + '/accounts/2iqph/campaigns')
+
+
+def add_pages(size, fail_cursor=None):
+    """Registers the campaigns_all fixture split into pages of `size` items."""
+    fixture = json.loads(with_fixture('campaigns_all'))
+    data = fixture['data']
+    pages = [data[i:i + size] for i in range(0, len(data), size)]
+
+    for index, page in reversed(list(enumerate(pages))):
+        body = dict(fixture, data=page)
+        body['next_cursor'] = 'c{0}'.format(index + 1) if index + 1 < len(pages) else None
+        kwargs = {}
+        if index > 0:
+            cursor = 'c{0}'.format(index)
+            kwargs['match'] = [matchers.query_param_matcher({'cursor': cursor},
+                                                            strict_match=False)]
+            if cursor == fail_cursor:
+                responses.add(responses.GET, CAMPAIGNS, status=500,
+                              body=with_fixture('campaigns_all'),
+                              content_type='application/json', **kwargs)
+        responses.add(responses.GET, CAMPAIGNS, body=json.dumps(body),
+                      content_type='application/json', **kwargs)
+    return data
+
+
+def new_client(**options):
+    return Client(characters(40), characters(40), characters(40), characters(40),
+                  options=options)
+
+
+@responses.activate
+def test_cursor_pagination():
+    account = load_account(new_client())
+    data = add_pages(3)
+
+    cursor = Campaign.all(account)
+    assert [c.id for c in cursor] == [d['id'] for d in data]
+    assert cursor.exhausted
+    assert len(responses.calls) == 5
+
+
+@responses.activate
+def test_cursor_deadline(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr('time.monotonic', lambda: now[0])
+
+    account = load_account(new_client())
+    add_pages(3)
+
+    cursor = Campaign.all(account, deadline=10)
+    assert cursor.next().id == '2wap7'
+    now[0] += 5
+    assert len([cursor.next() for _ in range(5)]) == 5
+    assert len(responses.calls) == 3
+
+    now[0] += 5
+    with pytest.raises(DeadlineExceeded):
+        list(cursor)
+    assert len(responses.calls) == 3
+
+
+@responses.activate
+def test_cursor_lazy_hydration():
+    account = load_account(new_client(lazy_hydration=True))
+    data = add_pages(3)
+
+    campaigns = list(Campaign.all(account))
+    assert [c._raw for c in campaigns] == data
+    assert [c.id for c in campaigns] == [d['id'] for d in data]
+    assert campaigns[0].to_params() == Campaign(account).from_response(data[0]).to_params()
+
+
+@responses.activate
+def test_cursor_prefetch():
+    account = load_account(new_client())
+    data = add_pages(3)
+
+    request = Request(account.client, 'get', CAMPAIGNS.replace(with_resource(''), ''))
+    with Cursor(Campaign, request, init_with=[account], prefetch=2) as cursor:
+        # the worker only starts once the first page runs out
+        assert cursor._worker is None
+        ids, worker = [], None
+        for campaign in cursor:
+            ids.append(campaign.id)
+            worker = worker or cursor._worker
+
+    assert ids == [d['id'] for d in data]
+    assert cursor.exhausted
+    assert len(responses.calls) == 5
+    assert cursor._worker is None
+    assert not worker.is_alive()
+
+
+@responses.activate
+def test_cursor_prefetch_abandoned():
+    account = load_account(new_client(prefetch=1))
+    add_pages(3)
+
+    workers = threading.active_count()
+    for _ in range(5):
+        assert Campaign.all(account).first.id == '2wap7'
+    assert len(responses.calls) == 6
+    assert threading.active_count() == workers
+
+    cursor = Campaign.all(account)
+    next(cursor)
+    for _ in range(3):
+        next(cursor)
+    worker = cursor._worker
+    assert worker.is_alive()
+
+    # the worker exits once the cursor is garbage collected
+    del cursor
+    gc.collect()
+    worker.join(2)
+    assert not worker.is_alive()
+
+
+@responses.activate
+def test_cursor_prefetch_propagates_errors():
+    account = load_account(new_client(prefetch=1))
+    data = add_pages(3, fail_cursor='c2')
+
+    cursor = Campaign.all(account)
+    ids = []
+    try:
+        for campaign in cursor:
+            ids.append(campaign.id)
+    except ServerError as e:
+        error = e
+
+    assert isinstance(error, ServerError)
+    assert ids == [d['id'] for d in data[:6]]
+
+    # the failed page is requested again on the next call
+    ids.extend(c.id for c in cursor)
+    assert ids[6:] == [d['id'] for d in data[6:]]
+    cursor.close()
+
+
+@responses.activate
+def test_cursor_streaming():
+    account = load_account(new_client())
+    data = add_pages(3)
+
+    request = Request(account.client, 'get', CAMPAIGNS.replace(with_resource(''), ''))
+    cursor = Cursor(Campaign, request, init_with=[account], streaming=True)
+
+    ids = []
+    for campaign in cursor:
+        ids.append(campaign.id)
+        assert len(cursor._collection) <= 3
+
+    assert ids == [d['id'] for d in data]
+    assert cursor.fetched == 10
+    assert cursor.count == 10
+    assert cursor.first.id == data[0]['id']
+    assert cursor._collection == []
+    assert list(cursor) == []
+
+
+@responses.activate
+def test_cursor_options_of_all():
+    account = load_account(new_client())
+    data = add_pages(3)
+
+    cursor = account.campaigns(streaming=True, lazy=True, prefetch=1)
+    assert cursor._streaming is True
+    assert cursor._lazy is True
+    assert [c.id for c in cursor] == [d['id'] for d in data]
+    assert cursor._collection == []
+    for call in responses.calls[1:]:
+        assert 'streaming' not in call.request.url
+        assert 'lazy' not in call.request.url
+        assert 'prefetch' not in call.request.url
+
+    # booleans flattened to strings by FlattenParams are restored
+    assert pop_cursor_options({'lazy': 'false', 'streaming': 'true', 'count': 5}) == \
+        {'lazy': False, 'streaming': True}
+
+
+@responses.activate
+def test_cursor_restart_from_next_cursor():
+    account = load_account(new_client())
+    data = add_pages(3)
+
+    cursor = Campaign.all(account)
+    token = cursor.next_cursor
+    assert token == 'c1'
+
+    restarted = Campaign.all(account, cursor=token)
+    assert [c.id for c in restarted] == [d['id'] for d in data[3:]]
+
+
+@responses.activate
+def test_cursor_checkpoint_resume():
+    client = new_client()
+    account = load_account(client)
+    data = add_pages(3)
+
+    cursor = Campaign.all(account)
+    ids = [next(cursor).id for _ in range(4)]
+    checkpoint = json.loads(json.dumps(cursor.checkpoint()))
+    assert checkpoint['klass'] == 'twitter_ads.campaign.Campaign'
+    assert checkpoint['account_id'] == '2iqph'
+    assert checkpoint['cursor'] == 'c1'
+    assert checkpoint['index'] == 1
+    assert checkpoint['fetched'] == 3
+
+    data = add_pages(3)
+    resumed = Cursor.resume(client, checkpoint)
+    assert resumed.fetched == 6
+    ids.extend(c.id for c in resumed)
+    assert ids == [d['id'] for d in data]
+    assert resumed.fetched == 10
+    assert all(c.account.id == '2iqph' for c in resumed)
+
+
+@pytest.mark.parametrize('store_type', ['file', 'sqlite'])
+@responses.activate
+def test_cursor_checkpoint_store(tmp_path, store_type):
+    if store_type == 'file':
+        store = FileCheckpointStore(str(tmp_path))
+    else:
+        store = SQLiteCheckpointStore(str(tmp_path / 'checkpoints.db'))
+
+    client = new_client()
+    account = load_account(client)
+    add_pages(3)
+
+    request = Request(client, 'get', CAMPAIGNS.replace(with_resource(''), ''))
+    cursor = Cursor(Campaign, request, init_with=[account],
+                    checkpoint_store=store, checkpoint_key='campaigns:2iqph')
+    for _ in range(5):
+        next(cursor)
+    assert store.load('campaigns:2iqph')['cursor'] == 'c1'
+
+    # restart the crawl from the last saved page
+    data = add_pages(3)
+    resumed = Cursor.resume(client, store.load('campaigns:2iqph'),
+                            checkpoint_store=store, checkpoint_key='campaigns:2iqph')
+    assert [c.id for c in resumed] == [d['id'] for d in data[3:]]
+    assert store.load('campaigns:2iqph') is None
+
+
+@pytest.mark.parametrize('store_type', ['file', 'sqlite'])
+@responses.activate
+def test_cursor_checkpoint_store_default_key(tmp_path, store_type):
+    if store_type == 'file':
+        store = FileCheckpointStore(str(tmp_path))
+    else:
+        store = SQLiteCheckpointStore(str(tmp_path / 'checkpoints.db'))
+
+    client = new_client()
+    account = load_account(client)
+    add_pages(3)
+
+    resource = CAMPAIGNS.replace(with_resource(''), '')
+    request = Request(client, 'get', resource, params={'with_deleted': 'true'})
+    cursor = Cursor(Campaign, request, init_with=[account], checkpoint_store=store)
+    for _ in range(5):
+        next(cursor)
+    key = checkpoint_key('get', resource, {'with_deleted': 'true'})
+    assert key != checkpoint_key('get', resource, {})
+    assert store.load(key)['cursor'] == 'c1'
+
+    # a resumed cursor saves under the same key
+    data = add_pages(3)
+    resumed = Cursor.resume(client, store.load(key), checkpoint_store=store)
+    assert [c.id for c in resumed] == [d['id'] for d in data[3:]]
+    assert store.load(key) is None
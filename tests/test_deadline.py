@@ -0,0 +1,104 @@
+import time
+
+import pytest
+import responses
+
+from tests.support import with_resource, load_account
+
+from twitter_ads.campaign import Campaign
+from twitter_ads.error import DeadlineExceeded
+from twitter_ads.http import Deadline
+from twitter_ads.scheduler import RateLimitScheduler
+from twitter_ads import API_VERSION
+
+
+CAMPAIGNS = with_resource('/' + API_VERSION + '/accounts/2iqph/campaigns')
+
+
+def test_deadline(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, 'monotonic', lambda: now[0])
+
+    deadline = Deadline(10)
+    assert Deadline.coerce(deadline) is deadline
+    assert Deadline.coerce(None) is None
+    assert Deadline.coerce(3).remaining() == 3
+
+    now[0] += 4
+    assert deadline.remaining() == 6
+    assert deadline.timeout(None) == 6
+    assert deadline.timeout(2) == 2
+    assert deadline.timeout((1.0, 30.0)) == (1.0, 6)
+    deadline.check(5)
+    with pytest.raises(DeadlineExceeded) as e:
+        deadline.check(6)
+    assert e.value.remaining == 6
+    assert e.value.wait == 6
+
+    now[0] += 10
+    assert deadline.expired
+    assert deadline.remaining() == 0
+
+
+@responses.activate
+def test_deadline_retries(monkeypatch):
+    now = [1000.0]
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    monkeypatch.setattr(time, 'monotonic', lambda: now[0])
+    monkeypatch.setattr(time, 'sleep', sleep)
+
+    account = load_account(retry_max=3, retry_delay=4000, retry_on_status=[503])
+    responses.add(responses.GET, CAMPAIGNS + '/2wap7', status=503, body='{}',
+                  content_type='application/json')
+
+    # the second retry delay would exceed the deadline
+    with pytest.raises(DeadlineExceeded):
+        Campaign.load(account, '2wap7', deadline=6)
+    assert sleeps == [4]
+    assert len(responses.calls) == 3
+
+
+@responses.activate
+def test_deadline_rate_limit(monkeypatch):
+    monkeypatch.setattr(time, 'sleep', lambda s: None)
+
+    account = load_account(handle_rate_limit=True)
+    responses.add(responses.GET, CAMPAIGNS, status=429, body='{}',
+                  content_type='application/json',
+                  headers={'x-account-rate-limit-reset': str(int(time.time()) + 600)})
+
+    with pytest.raises(DeadlineExceeded):
+        Campaign.all(account, deadline=30)
+    assert len(responses.calls) == 2
+
+
+@responses.activate
+def test_deadline_scheduler():
+    scheduler = RateLimitScheduler()
+    account = load_account(rate_limit_scheduler=scheduler)
+    scheduler.update(('2iqph', 'campaigns'), {
+        'x-account-rate-limit-limit': '100',
+        'x-account-rate-limit-remaining': '0',
+        'x-account-rate-limit-reset': str(int(time.time()) + 600)
+    })
+
+    with pytest.raises(DeadlineExceeded):
+        Campaign.all(account, deadline=30)
+    assert len(responses.calls) == 1
+
+
+def test_deadline_client_timeout(monkeypatch):
+    aiohttp = pytest.importorskip('aiohttp')
+    monkeypatch.setattr(time, 'monotonic', lambda: 1000.0)
+
+    # the per-attempt timeouts still apply, capped by the time left
+    timeout = Deadline(100).client_timeout(aiohttp.ClientTimeout(sock_connect=5, sock_read=10))
+    assert (timeout.total, timeout.sock_connect, timeout.sock_read) == (100, 5, 10)
+
+    timeout = Deadline(3).client_timeout(aiohttp.ClientTimeout(total=30, sock_read=10))
+    assert (timeout.total, timeout.sock_connect, timeout.sock_read) == (3, None, 3)
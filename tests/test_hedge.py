@@ -0,0 +1,131 @@
+import threading
+import time
+
+import pytest
+import responses
+
+from tests.support import with_resource, with_fixture, load_account
+
+from twitter_ads.campaign import Campaign
+from twitter_ads.hedge import HedgePolicy
+from twitter_ads import API_VERSION
+
+
+CAMPAIGN = with_resource('/' + API_VERSION + '/accounts/2iqph/campaigns/2wap7')
+KEY = ('2iqph', 'campaigns')
+
+
+def slow_first(headers=None):
+    """Returns a response callback which stalls the first request only."""
+    calls = []
+    release = threading.Event()
+
+    def callback(request):
+        calls.append(request)
+        if len(calls) == 1:
+            release.wait(5)
+        return 200, headers or {}, with_fixture('campaigns_load')
+    return calls, release, callback
+
+
+def test_hedge_policy_delay():
+    policy = HedgePolicy(percentile=90, min_delay=0.05, max_delay=1.0, min_samples=10)
+    assert policy.delay(KEY) is None
+
+    for i in range(10):
+        policy.record(KEY, (i + 1) / 10.0)
+    assert policy.latency(KEY) == 1.0
+    assert policy.latency(KEY, 50) == 0.6
+    assert policy.delay(KEY) == 1.0
+
+    for _ in range(100):
+        policy.record(KEY, 0.001)
+    assert policy.delay(KEY) == 0.05
+
+
+@responses.activate
+def test_hedge_first_response_wins():
+    policy = HedgePolicy(min_delay=0.05, min_samples=5)
+    account = load_account(hedge_policy=policy)
+    for _ in range(5):
+        policy.record(KEY, 0.01)
+
+    calls, release, callback = slow_first()
+    responses.add_callback(responses.GET, CAMPAIGN, callback=callback,
+                           content_type='application/json')
+
+    started_at = time.monotonic()
+    campaign = Campaign.load(account, '2wap7')
+    assert time.monotonic() - started_at < 2
+    assert campaign.id == '2wap7'
+    assert len(calls) == 2
+    assert policy.hedged == 1
+    assert policy.won == 1
+    release.set()
+
+
+@responses.activate
+def test_hedge_replaces_failed_request():
+    policy = HedgePolicy(min_delay=0.05, min_samples=5)
+    account = load_account(hedge_policy=policy)
+    for _ in range(5):
+        policy.record(KEY, 0.01)
+
+    calls = []
+    hedged = threading.Event()
+
+    def callback(request):
+        calls.append(request)
+        if len(calls) == 1:
+            # the original request fails while the hedge is still pending
+            hedged.wait(5)
+            return ConnectionError('connection reset')
+        hedged.set()
+        time.sleep(0.2)
+        return 200, {}, with_fixture('campaigns_load')
+
+    responses.add_callback(responses.GET, CAMPAIGN, callback=callback,
+                           content_type='application/json')
+
+    assert Campaign.load(account, '2wap7').id == '2wap7'
+    assert policy.won == 1
+
+
+@responses.activate
+def test_hedge_original_not_queued():
+    policy = HedgePolicy(min_delay=0.05, min_samples=5, max_workers=1)
+    account = load_account(hedge_policy=policy)
+    for _ in range(5):
+        policy.record(KEY, 0.01)
+
+    # a busy pool only delays the hedges
+    busy = threading.Event()
+    policy._executor.submit(busy.wait, 5)
+    responses.add(responses.GET, CAMPAIGN, body=with_fixture('campaigns_load'),
+                  content_type='application/json')
+
+    started_at = time.monotonic()
+    assert Campaign.load(account, '2wap7').id == '2wap7'
+    assert time.monotonic() - started_at < 2
+    busy.set()
+
+    policy.close()
+    with pytest.raises(RuntimeError):
+        policy._executor.submit(time.sleep, 0)
+
+
+@responses.activate
+def test_hedge_rate_limit_aware():
+    policy = HedgePolicy(min_delay=0.05, min_samples=5, min_remaining=10)
+    account = load_account(hedge_policy=policy)
+    for _ in range(5):
+        policy.record(KEY, 0.01, {'x-account-rate-limit-remaining': '3'})
+
+    calls, release, callback = slow_first()
+    responses.add_callback(responses.GET, CAMPAIGN, callback=callback,
+                           content_type='application/json')
+
+    threading.Timer(0.3, release.set).start()
+    Campaign.load(account, '2wap7')
+    assert len(calls) == 1
+    assert policy.hedged == 0
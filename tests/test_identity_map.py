@@ -0,0 +1,89 @@
+import responses
+
+from tests.support import with_resource, with_fixture, load_account
+
+from twitter_ads.account import Account
+from twitter_ads.cache import IdentityMap
+from twitter_ads.campaign import Campaign
+from twitter_ads import API_VERSION
+
+
+CAMPAIGNS = with_resource('/' + API_VERSION + '/accounts/2iqph/campaigns')
+
+
+@responses.activate
+def test_identity_map_load():
+    account = load_account(identity_map=IdentityMap())
+
+    responses.add(responses.GET, CAMPAIGNS + '/2wap7',
+                  body=with_fixture('campaigns_load'),
+                  content_type='application/json')
+
+    campaign = Campaign.load(account, '2wap7')
+    assert Campaign.load(account, '2wap7') is campaign
+    assert len(responses.calls) == 2
+
+    # params bypass the identity map
+    Campaign.load(account, '2wap7', with_deleted=True)
+    assert len(responses.calls) == 3
+
+
+@responses.activate
+def test_identity_map_cursor():
+    account = load_account(identity_map=IdentityMap())
+
+    responses.add(responses.GET, CAMPAIGNS,
+                  body=with_fixture('campaigns_all'),
+                  content_type='application/json')
+
+    campaigns = list(account.campaigns())
+    assert Campaign.load(account, '2wamv') is campaigns[1]
+    assert len(responses.calls) == 2
+
+
+@responses.activate
+def test_identity_map_invalidation():
+    account = load_account(identity_map=IdentityMap())
+
+    responses.add(responses.GET, CAMPAIGNS + '/2wap7',
+                  body=with_fixture('campaigns_load'),
+                  content_type='application/json')
+    responses.add(responses.PUT, CAMPAIGNS + '/2wap7',
+                  body=with_fixture('campaigns_load'),
+                  content_type='application/json')
+    responses.add(responses.DELETE, CAMPAIGNS + '/2wap7',
+                  body=with_fixture('campaigns_load'),
+                  content_type='application/json')
+
+    campaign = Campaign.load(account, '2wap7')
+    campaign.name = 'renamed'
+    campaign.save()
+    assert Campaign.load(account, '2wap7') is not campaign
+    assert len(responses.calls) == 4
+
+    Campaign.load(account, '2wap7').delete()
+    Campaign.load(account, '2wap7')
+    assert len(responses.calls) == 6
+
+
+def test_identity_map_eviction(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr('time.time', lambda: now[0])
+
+    account = Account(None)
+    account._id = '2iqph'
+    identity_map = IdentityMap(maxsize=2, ttl=60)
+    campaigns = []
+    for id in ('c1', 'c2', 'c3'):
+        campaign = Campaign(account)
+        campaign._id = id
+        campaigns.append(campaign)
+        identity_map.put(campaign)
+
+    # least recently used
+    assert identity_map.get(Campaign, '2iqph', 'c1') is None
+    assert identity_map.get(Campaign, '2iqph', 'c2') is campaigns[1]
+    assert len(identity_map) == 2
+
+    now[0] += 61
+    assert identity_map.get(Campaign, '2iqph', 'c3') is None
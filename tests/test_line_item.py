@@ -1,6 +1,9 @@
+import pytest
 import responses
 import unittest
 
+from urllib.parse import parse_qs, urlparse
+
 from tests.support import with_resource, with_fixture, characters
 
 from twitter_ads.account import Account
@@ -65,3 +68,58 @@ def test_line_item_load():
     line_item = LineItem.load(account, 'bw2')
     assert line_item.id == 'bw2'
     assert line_item.entity_status == 'ACTIVE'
+
+
+@responses.activate
+def test_line_item_save_changed_properties():
+    responses.add(responses.GET,
+                  with_resource('/' + API_VERSION + '/accounts/2iqph'),
+                  body=with_fixture('accounts_load'),
+                  content_type='application/json')
+
+    responses.add(responses.GET,
+                  with_resource('/' + API_VERSION + '/accounts/2iqph/line_items/bw2'),
+                  body=with_fixture('line_items_load'),
+                  content_type='application/json')
+
+    responses.add(responses.PUT,
+                  with_resource('/' + API_VERSION + '/accounts/2iqph/line_items/bw2'),
+                  body=with_fixture('line_items_load'),
+                  content_type='application/json')
+
+    client = Client(
+        characters(40),
+        characters(40),
+        characters(40),
+        characters(40)
+    )
+
+    account = Account.load(client, '2iqph')
+
+    line_item = LineItem.load(account, 'bw2')
+    line_item.save()
+    assert len(responses.calls) == 2
+
+    line_item.name = 'renamed'
+    line_item.entity_status = 'PAUSED'
+    line_item.save()
+    assert len(responses.calls) == 3
+    params = parse_qs(urlparse(responses.calls[2].request.url).query)
+    assert params == {'name': ['renamed'], 'entity_status': ['PAUSED']}
+
+    # populated from the response again
+    assert line_item.entity_status == 'ACTIVE'
+    line_item.save()
+    assert len(responses.calls) == 3
+
+    # in-place edits are only sent once marked as changed
+    line_item.categories.append('IAB3')
+    line_item.save()
+    assert len(responses.calls) == 3
+    line_item.mark_dirty('categories').save()
+    assert len(responses.calls) == 4
+    params = parse_qs(urlparse(responses.calls[3].request.url).query)
+    assert list(params) == ['categories']
+
+    with pytest.raises(ValueError):
+        line_item.mark_dirty('unknown')
@@ -0,0 +1,156 @@
+import gzip
+import json
+import responses
+import pytest
+
+from datetime import datetime
+
+from tests.support import with_resource, with_fixture, characters
+
+from twitter_ads.account import Account
+from twitter_ads.client import Client
+from twitter_ads.campaign import Campaign
+from twitter_ads.enum import METRIC_GROUP, GRANULARITY
+from twitter_ads import API_VERSION
+
+numpy = pytest.importorskip('numpy')
+
+from twitter_ads.metrics import MetricsFrame  # noqa: E402
+
+
+def hourly_data():
+    return [
+        {'id': 'aaaa', 'id_data': [{'segment': None, 'metrics': {
+            'impressions': [10] * 48,
+            'clicks': [1] * 48,
+            'conversion_purchases': {'post_view': [2] * 48, 'post_engagement': None}}}]},
+        {'id': 'bbbb', 'id_data': [{'segment': None, 'metrics': {
+            'impressions': [0] * 48,
+            'clicks': None,
+            'conversion_purchases': None}}]}
+    ]
+
+
+def test_metrics_frame_from_data():
+    frame = MetricsFrame.from_data(hourly_data(), 48)
+
+    assert frame.ids == ['aaaa', 'bbbb']
+    assert frame.segments == [None]
+    assert frame.shape == (2, 1, 48)
+    assert 'conversion_purchases.post_view' in frame
+    assert frame['clicks'].mask[1].all()
+    assert not frame['clicks'].mask[0].any()
+    assert frame['conversion_purchases.post_engagement'].mask.all()
+
+
+def test_metrics_frame_rollup_and_totals():
+    frame = MetricsFrame.from_data(hourly_data(), 48, granularity=GRANULARITY.HOUR)
+
+    daily = frame.daily()
+    assert daily.shape == (2, 1, 2)
+    assert daily['impressions'][0, 0].tolist() == [240, 240]
+    assert daily['clicks'].mask[1].all()
+    assert frame.total('impressions', axis='time')[:, 0].tolist() == [480, 0]
+    assert frame.total('clicks', axis='entity')[0].tolist() == [1] * 48
+
+    ctr = frame.ctr()
+    assert ctr[0, 0, 0] == pytest.approx(0.1)
+    assert ctr.mask[1].all()
+
+    with pytest.raises(ValueError):
+        frame.rollup(5)
+
+
+@responses.activate
+def test_analytics_all_stats_as_frame():
+    responses.add(responses.GET,
+                  with_resource('/' + API_VERSION + '/accounts/2iqph'),
+                  body=with_fixture('accounts_load'),
+                  content_type='application/json')
+
+    def callback(request):
+        ids = request.params['entity_ids'].split(',')
+        data = [{'id': id, 'id_data': [{'segment': None, 'metrics': {
+            'impressions': [1] * 24, 'clicks': [0] * 24}}]} for id in ids]
+        body = {'data': data, 'time_series_length': 24, 'data_type': 'stats'}
+        return (200, {}, json.dumps(body))
+
+    responses.add_callback(responses.GET,
+                           with_resource('/' + API_VERSION + '/stats/accounts/2iqph'),
+                           callback=callback,
+                           content_type='application/json')
+
+    client = Client(
+        characters(40),
+        characters(40),
+        characters(40),
+        characters(40)
+    )
+
+    account = Account.load(client, '2iqph')
+
+    frame = Campaign.all_stats(
+        account,
+        ['aaaa', 'bbbb'],
+        [METRIC_GROUP.ENGAGEMENT],
+        granularity=GRANULARITY.HOUR,
+        start_time=datetime(2019, 1, 1),
+        end_time=datetime(2019, 1, 2),
+        as_frame=True
+    )
+
+    assert isinstance(frame, MetricsFrame)
+    assert frame.shape == (2, 1, 24)
+    assert frame.daily()['impressions'][:, 0, 0].tolist() == [24, 24]
+
+    # buckets start at the hour the request was floored to
+    frame = Campaign.all_stats(
+        account,
+        ['aaaa', 'bbbb'],
+        [METRIC_GROUP.ENGAGEMENT],
+        granularity=GRANULARITY.HOUR,
+        start_time=datetime(2019, 1, 1, 13, 47),
+        end_time=datetime(2019, 1, 2, 13, 47),
+        as_frame=True
+    )
+    assert frame._start_time == datetime(2019, 1, 1, 13)
+
+
+@responses.activate
+def test_analytics_async_stats_job_data_as_frame():
+    responses.add(responses.GET,
+                  with_resource('/' + API_VERSION + '/accounts/2iqph'),
+                  body=with_fixture('accounts_load'),
+                  content_type='application/json')
+
+    body = {
+        'request': {'params': {'start_time': '2019-01-01T00:00:00Z',
+                               'end_time': '2019-01-02T00:00:00Z',
+                               'granularity': 'HOUR'}},
+        'data': [{'id': id, 'id_data': [{'segment': None, 'metrics': {'impressions': [1] * 24}}]}
+                 for id in ['aaaa', 'bbbb']],
+        'time_series_length': 24
+    }
+    url = 'https://ton.twimg.com/advertiser-api-async-analytics/stats.json.gz'
+    responses.add(responses.GET, url,
+                  body=gzip.compress(json.dumps(body).encode()),
+                  content_type='application/gzip')
+
+    client = Client(
+        characters(40),
+        characters(40),
+        characters(40),
+        characters(40)
+    )
+
+    account = Account.load(client, '2iqph')
+
+    frame = Campaign.async_stats_job_data(account, url=url, as_frame=True)
+    assert frame.shape == (2, 1, 24)
+    assert frame.daily()['impressions'][:, 0, 0].tolist() == [24, 24]
+
+    # explicit values win over the ones of the file
+    frame = Campaign.async_stats_job_data(account, url=url, as_frame=True,
+                                          granularity=GRANULARITY.DAY)
+    with pytest.raises(ValueError):
+        frame.daily()
@@ -0,0 +1,150 @@
+import json
+
+import responses
+
+from tests.support import with_resource, with_fixture, characters
+
+from twitter_ads.account import Account
+from twitter_ads.campaign import Campaign, LineItem, TargetingCriteria
+from twitter_ads.client import Client
+from twitter_ads.reconcile import Reconciler
+from twitter_ads import API_VERSION
+
+
+def collection(name):
+    return with_resource('/' + API_VERSION + '/accounts/2iqph/' + name)
+
+
+def batch(name):
+    return with_resource('/' + API_VERSION + '/batch/accounts/2iqph/' + name)
+
+
+def listing(data):
+    return json.dumps({'data': data, 'next_cursor': None})
+
+
+@responses.activate
+def test_reconcile():
+    responses.add(responses.GET,
+                  with_resource('/' + API_VERSION + '/accounts/2iqph'),
+                  body=with_fixture('accounts_load'),
+                  content_type='application/json')
+
+    responses.add(responses.GET, collection('campaigns'), body=listing([
+        {'id': 'c1', 'name': 'A', 'daily_budget_amount_local_micro': 100},
+        {'id': 'c2', 'name': 'B', 'daily_budget_amount_local_micro': 100}
+    ]), content_type='application/json')
+    responses.add(responses.GET, collection('line_items'), body=listing([
+        {'id': 'l1', 'campaign_id': 'c1', 'name': 'L1', 'bid_amount_local_micro': 500}
+    ]), content_type='application/json')
+    responses.add(responses.GET, collection('targeting_criteria'), body=listing([
+        {'id': 't1', 'line_item_id': 'l1', 'targeting_type': 'BROAD_KEYWORD',
+         'targeting_value': 'x', 'operator_type': 'EQ'},
+        {'id': 't2', 'line_item_id': 'l1', 'targeting_type': 'BROAD_KEYWORD',
+         'targeting_value': 'z', 'operator_type': 'EQ'}
+    ]), content_type='application/json')
+
+    batches = {}
+
+    def callback(request):
+        body = json.loads(request.body)
+        entity = request.url.rsplit('/', 1)[1]
+        batches.setdefault(entity, []).append(body)
+        data = [dict(item['params'], id=item['params'].get('campaign_id', 'c3'))
+                if entity == 'campaigns' else item['params'] for item in body]
+        return (200, {}, json.dumps({'data': data}))
+
+    for name in ('campaigns', 'line_items', 'targeting_criteria'):
+        responses.add_callback(responses.POST, batch(name), callback=callback,
+                               content_type='application/json')
+
+    client = Client(
+        characters(40),
+        characters(40),
+        characters(40),
+        characters(40)
+    )
+
+    account = Account.load(client, '2iqph')
+
+    desired = []
+    campaign = Campaign(account)
+    campaign.name = 'A'
+    campaign.daily_budget_amount_local_micro = 200
+    new_campaign = Campaign(account)
+    new_campaign.name = 'C'
+    desired.extend([campaign, new_campaign])
+
+    line_item = LineItem(account)
+    line_item.campaign_id = 'c1'
+    line_item.name = 'L1'
+    line_item.bid_amount_local_micro = 500
+    new_line_item = LineItem(account)
+    new_line_item.campaign_id = new_campaign
+    new_line_item.name = 'L2'
+    desired.extend([line_item, new_line_item])
+
+    for value in ('x', 'y'):
+        tc = TargetingCriteria(account)
+        tc.line_item_id = 'l1'
+        tc.targeting_type = 'BROAD_KEYWORD'
+        tc.targeting_value = value
+        desired.append(tc)
+
+    reconciler = Reconciler(account, prune=True)
+    plan = reconciler.reconcile(desired, dry_run=True)
+    assert str(plan).splitlines() == [
+        "Update Campaign c1: daily_budget_amount_local_micro=200",
+        "Create Campaign (new)",
+        "Delete Campaign c2",
+        "Create LineItem (new)",
+        "Create TargetingCriteria (new)",
+        "Delete TargetingCriteria t2"
+    ]
+    # 1 load + 3 listings, nothing was sent
+    assert len(responses.calls) == 4
+    assert 'campaign_ids=c1' in responses.calls[2].request.url
+    assert 'line_item_ids=l1' in responses.calls[3].request.url
+
+    reconciler.apply(plan)
+    assert [[item['operation_type'] for item in body] for body in batches['campaigns']] == \
+        [['Update', 'Create', 'Delete']]
+    assert batches['campaigns'][0][0]['params'] == {
+        'daily_budget_amount_local_micro': 200, 'campaign_id': 'c1'}
+    # the line item refers to the campaign created by the first batch
+    assert batches['line_items'][0][0]['params'] == {'campaign_id': 'c3', 'name': 'L2'}
+    assert [item['operation_type'] for item in batches['targeting_criteria'][0]] == \
+        ['Create', 'Delete']
+
+
+@responses.activate
+def test_reconcile_converges():
+    responses.add(responses.GET,
+                  with_resource('/' + API_VERSION + '/accounts/2iqph'),
+                  body=with_fixture('accounts_load'),
+                  content_type='application/json')
+    responses.add(responses.GET, collection('campaigns'), body=listing([
+        {'id': 'c1', 'name': 'A', 'standard_delivery': False, 'total_budget_amount_local_micro': 0}
+    ]), content_type='application/json')
+
+    client = Client(
+        characters(40),
+        characters(40),
+        characters(40),
+        characters(40)
+    )
+
+    account = Account.load(client, '2iqph')
+
+    campaign = Campaign(account)
+    campaign.name = 'A'
+    campaign.standard_delivery = False
+    campaign.total_budget_amount_local_micro = 0
+
+    reconciler = Reconciler(account)
+    for _ in range(2):
+        assert len(reconciler.reconcile([campaign], dry_run=True)) == 0
+
+    campaign.standard_delivery = True
+    assert str(reconciler.reconcile([campaign], dry_run=True)) == \
+        "Update Campaign c1: standard_delivery=True"
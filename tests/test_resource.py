@@ -0,0 +1,166 @@
+import pytest
+
+from datetime import datetime, timezone
+
+from twitter_ads.account import Account
+from twitter_ads.analytics import Analytics
+from twitter_ads.enum import TRANSFORM
+from twitter_ads.campaign import Campaign, LineItem
+from twitter_ads.resource import Batch, Persistence, Resource, compact, resource_property
+
+
+class Widget(Resource):
+
+    PROPERTIES = {}
+
+
+resource_property(Widget, 'id', readonly=True)
+resource_property(Widget, 'name')
+resource_property(Widget, 'paused', default=True)
+resource_property(Widget, 'bid_amount_local_micro')
+resource_property(Widget, 'created_at', readonly=True, transform=TRANSFORM.TIME)
+resource_property(Widget, 'start_time', transform=TRANSFORM.TIME)
+
+
+def test_from_response():
+    widget = Widget(None).from_response({
+        'id': 'abc1',
+        'name': 'my widget',
+        'paused': False,
+        'bid_amount_local_micro': 0,
+        'created_at': '2019-01-01T00:00:00Z'
+    })
+
+    assert widget.id == 'abc1'
+    assert widget.name == 'my widget'
+    # zero values are skipped, leaving the property default
+    assert widget.paused is True
+    assert widget.bid_amount_local_micro is None
+    assert widget.created_at == datetime(2019, 1, 1, tzinfo=timezone.utc)
+
+    widget.from_response({'id': 'abc1', 'bid_amount_local_micro': 0.0})
+    assert widget.name is None
+    assert widget.bid_amount_local_micro == 0.0
+
+
+def test_from_response_new_property():
+    Widget(None).from_response({'id': 'abc1'})
+    resource_property(Widget, 'currency')
+
+    widget = Widget(None).from_response({'id': 'abc1', 'currency': 'USD'})
+    assert widget.currency == 'USD'
+
+
+def test_time_properties():
+    widget = Widget(None).from_response({'id': 'abc1', 'start_time': '2019-01-01T12:30:00Z'})
+
+    # timestamps stay raw until accessed
+    assert widget._start_time == '2019-01-01T12:30:00Z'
+    assert widget.start_time == datetime(2019, 1, 1, 12, 30, tzinfo=timezone.utc)
+    assert widget.to_params()['start_time'] == '2019-01-01T12:30:00Z'
+
+    widget.start_time = datetime(2019, 2, 1)
+    assert widget.start_time == datetime(2019, 2, 1)
+
+
+def test_lazy_from_response():
+    response = {
+        'id': 'abc1',
+        'paused': False,
+        'bid_amount_local_micro': 0,
+        'start_time': '2019-01-01T12:30:00Z'
+    }
+    eager = Widget(None).from_response(response)
+    widget = Widget(None).from_response(response, lazy=True)
+
+    assert not hasattr(widget, '_id')
+    assert widget.to_params() == eager.to_params()
+    for name in Widget.PROPERTIES:
+        assert getattr(widget, name) == getattr(eager, name)
+
+    widget.name = 'renamed'
+    assert widget.name == 'renamed'
+    assert widget.to_params()['name'] == 'renamed'
+
+
+def test_compact():
+    CompactLineItem = compact(LineItem)
+    assert compact(LineItem) is CompactLineItem
+    assert CompactLineItem.__name__ == 'LineItem'
+
+    line_item = CompactLineItem(None).from_response(
+        {'id': 'abc1', 'name': 'my line item', 'created_at': '2019-01-01T00:00:00Z'},
+        headers={'x-account-rate-limit-remaining': '99', 'content-type': 'application/json'})
+    assert not hasattr(line_item, '__dict__')
+    assert line_item.name == 'my line item'
+    assert line_item.created_at == datetime(2019, 1, 1, tzinfo=timezone.utc)
+    assert line_item.response_headers == {'account_rate_limit_remaining': '99'}
+
+    line_item.name = 'renamed'
+    assert line_item.to_params()['name'] == 'renamed'
+    with pytest.raises(AttributeError):
+        line_item.unknown = True
+
+    lazy = CompactLineItem(None).from_response({'id': 'abc1', 'name': 'lazy'}, lazy=True)
+    assert lazy.name == 'lazy'
+
+    # regular objects keep exposing the headers as attributes
+    regular = LineItem(None).from_response({'id': 'abc1'},
+                                           headers={'x-account-rate-limit-remaining': '99'})
+    assert regular.account_rate_limit_remaining == '99'
+    assert regular.response_headers == {'account_rate_limit_remaining': '99'}
+
+
+def test_compact_keeps_base_classes():
+    # base classes keep their __dict__ and stay instantiable
+    assert Analytics(None).account is None
+    assert Resource(None).account is None
+    assert hasattr(LineItem(None), '__dict__')
+
+    line_item = compact(LineItem)(None)
+    assert isinstance(line_item, LineItem)
+    assert isinstance(line_item, Analytics)
+    assert isinstance(line_item, Resource)
+
+    account = compact(Account)('client')
+    assert not hasattr(account, '__dict__')
+    assert account.client == 'client'
+    assert isinstance(account, Account)
+
+
+def test_compact_bases(monkeypatch):
+    CompactLineItem = compact(LineItem)
+    line_item = CompactLineItem(None)
+    assert isinstance(line_item, Persistence)
+    assert isinstance(line_item, Batch)
+
+    # base classes are copied once and shared by every compact variant
+    names = [klass.__name__ for klass in CompactLineItem.__mro__]
+    assert names == ['LineItem', 'Analytics', 'Resource', 'Persistence', 'Batch', 'object']
+    assert CompactLineItem.__mro__[1:] == compact(Campaign).__mro__[1:]
+
+    # super() in copied methods resolves against the copies
+    monkeypatch.setattr(CompactLineItem.__mro__[3], 'save', lambda self: 'saved')
+    assert line_item.save() == 'saved'
+
+
+def test_compact_properties_frozen():
+    class Gadget(Resource):
+        PROPERTIES = {}
+
+    resource_property(Gadget, 'name')
+    assert compact(Gadget)(None).name is None
+    with pytest.raises(ValueError):
+        resource_property(Gadget, 'size')
+
+
+def test_dirty_properties():
+    widget = Widget(None).from_response({'id': 'abc1', 'name': 'my widget', 'paused': True})
+    assert widget.to_params(dirty=True) == {}
+
+    widget.name = 'renamed'
+    assert widget.to_params(dirty=True) == {'name': 'renamed'}
+    assert widget.to_params()['paused'] == 'true'
+
+    widget.from_response({'id': 'abc1', 'name': 'renamed'})
+    assert widget.to_params(dirty=True) == {}
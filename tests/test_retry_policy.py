@@ -0,0 +1,97 @@
+import random
+import time
+
+import responses
+
+from requests.exceptions import Timeout
+
+from tests.support import with_resource, with_fixture, characters
+
+from twitter_ads.account import Account
+from twitter_ads.campaign import Campaign
+from twitter_ads.client import Client
+from twitter_ads.retry import RetryBudget, RetryPolicy
+from twitter_ads import API_VERSION
+
+
+def test_retry_policy_backoff(monkeypatch):
+    monkeypatch.setattr(random, 'uniform', lambda a, b: b)
+
+    policy = RetryPolicy(max_retries=5, base_delay=1, max_delay=5)
+    assert [policy.retry_delay(i, status=503) for i in range(6)] == [1, 2, 4, 5, 5, None]
+    assert policy.retry_delay(0, status=404) is None
+    assert policy.retry_delay(0, error=Timeout()) == 1
+    assert policy.retry_delay(0, error=ValueError()) is None
+
+
+def test_retry_policy_jitter():
+    policy = RetryPolicy(base_delay=1, max_delay=60)
+    delays = [policy.retry_delay(2, status=500) for _ in range(100)]
+    assert all(0 <= delay <= 4 for delay in delays)
+    assert len(set(delays)) > 1
+
+
+def test_retry_policy_server_delay(monkeypatch):
+    monkeypatch.setattr(random, 'uniform', lambda a, b: 0)
+    monkeypatch.setattr(time, 'time', lambda: 1000.0)
+
+    policy = RetryPolicy()
+    assert policy.retry_delay(0, status=503, headers={'retry-after': '30'}) == 30
+    assert policy.retry_delay(
+        0, status=503, headers={'retry-after': 'Thu, 01 Jan 1970 00:17:00 GMT'}) == 20
+    assert policy.retry_delay(0, status=429, headers={'x-account-rate-limit-reset': '1042'}) == 42
+
+
+def test_retry_policy_rules():
+    policy = RetryPolicy(max_retries=1, retry_on_status={429: 3, 503: None})
+    assert policy.retry_delay(2, status=429) is not None
+    assert policy.retry_delay(3, status=429) is None
+    assert policy.retry_delay(1, status=503) is None
+    assert policy.retry_delay(0, status=500) is None
+
+
+def test_retry_budget():
+    policy = RetryPolicy(max_retries=10, budget=RetryBudget(max_tokens=4, token_ratio=0.5))
+    assert policy.retry_delay(0, status=503) is not None
+    assert policy.retry_delay(0, status=503) is None
+
+    for _ in range(4):
+        policy.success()
+    assert policy.retry_delay(0, status=503) is not None
+
+
+@responses.activate
+def test_retry_policy_option(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(time, 'sleep', lambda s: sleeps.append(s))
+
+    responses.add(responses.GET,
+                  with_resource('/' + API_VERSION + '/accounts/2iqph'),
+                  body=with_fixture('accounts_load'),
+                  content_type='application/json')
+
+    for status in (503, 503):
+        responses.add(responses.GET,
+                      with_resource('/' + API_VERSION + '/accounts/2iqph/campaigns'),
+                      status=status,
+                      body='{}',
+                      content_type='application/json',
+                      headers={'retry-after': '7'})
+    responses.add(responses.GET,
+                  with_resource('/' + API_VERSION + '/accounts/2iqph/campaigns'),
+                  body=with_fixture('campaigns_all'),
+                  content_type='application/json')
+
+    client = Client(
+        characters(40),
+        characters(40),
+        characters(40),
+        characters(40),
+        options={'retry_policy': RetryPolicy(jitter=False)}
+    )
+
+    account = Account.load(client, '2iqph')
+    cursor = Campaign.all(account)
+    assert cursor.count == 10
+    assert sleeps == [7, 7]
+    assert len(responses.calls) == 4
@@ -0,0 +1,174 @@
+import asyncio
+import threading
+import time
+
+import responses
+
+from tests.support import with_resource, with_fixture, characters
+
+from twitter_ads.account import Account
+from twitter_ads.campaign import LineItem
+from twitter_ads.client import Client
+from twitter_ads.enum import PRIORITY
+from twitter_ads.scheduler import RateLimitScheduler
+from twitter_ads.utils import endpoint_family
+from twitter_ads import API_VERSION
+
+
+KEY = ('2iqph', 'campaigns')
+
+
+def headers(remaining, reset_at, limit=100):
+    return {
+        'x-account-rate-limit-limit': str(limit),
+        'x-account-rate-limit-remaining': str(remaining),
+        'x-account-rate-limit-reset': str(reset_at)
+    }
+
+
+def test_endpoint_family():
+    assert endpoint_family('/' + API_VERSION + '/accounts/2iqph/campaigns/abc') == KEY
+    assert endpoint_family('/' + API_VERSION + '/stats/jobs/accounts/2iqph') == \
+        ('2iqph', 'stats/jobs')
+    assert endpoint_family('/' + API_VERSION + '/targeting_criteria/locations') == \
+        (None, 'targeting_criteria/locations')
+
+
+def test_scheduler_paces_remaining_budget(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, 'time', lambda: now[0])
+
+    scheduler = RateLimitScheduler(burst=1)
+    scheduler.acquire(KEY)
+    assert scheduler.budget(KEY) is None
+
+    # 10 requests left for the next 100 seconds
+    scheduler.update(KEY, headers(10, 1100))
+    assert scheduler.budget(KEY) == (100, 10, 1100)
+
+    # the burst allowance is available right away
+    scheduler.acquire(KEY)
+
+    waits = []
+    monkeypatch.setattr(threading.Condition, 'wait',
+                        lambda self, timeout=None: waits.append(timeout) or now.__setitem__(
+                            0, now[0] + (timeout or 0)))
+    scheduler.acquire(KEY)
+    # the 9 requests left are spread over the remaining 100 seconds
+    assert waits and abs(sum(waits) - 100.0 / 9) < 0.01
+    assert scheduler.budget(KEY) == (100, 8, 1100)
+
+
+def test_scheduler_waits_for_reset_when_exhausted(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, 'time', lambda: now[0])
+
+    scheduler = RateLimitScheduler(reserve=5)
+    scheduler.update(KEY, headers(5, 1060))
+
+    waits = []
+    monkeypatch.setattr(threading.Condition, 'wait',
+                        lambda self, timeout=None: waits.append(timeout) or now.__setitem__(
+                            0, now[0] + (timeout or 0)))
+
+    # the reserved budget is kept for high priority requests only
+    scheduler.acquire(KEY, PRIORITY.HIGH)
+    assert waits == []
+
+    scheduler.acquire(KEY, PRIORITY.LOW)
+    assert waits == [60]
+    assert scheduler.budget(KEY) is None
+
+
+def test_scheduler_releases_by_priority():
+    scheduler = RateLimitScheduler()
+    order = []
+
+    # hold the budget until both waiters are queued
+    scheduler.update(KEY, headers(0, int(time.time()) + 3600))
+
+    def worker(priority):
+        scheduler.acquire(KEY, priority)
+        order.append(priority)
+
+    threads = [threading.Thread(target=worker, args=(p,)) for p in (PRIORITY.LOW, PRIORITY.HIGH)]
+    threads[0].start()
+    time.sleep(0.05)
+    threads[1].start()
+    time.sleep(0.05)
+
+    # a new rate-limit window opens up
+    scheduler.update(KEY, headers(100, int(time.time()) + 7200))
+    for thread in threads:
+        thread.join(5)
+    assert order == [PRIORITY.HIGH, PRIORITY.LOW]
+
+
+def test_scheduler_cancelled_acquire_async():
+    scheduler = RateLimitScheduler()
+    scheduler.update(KEY, headers(0, int(time.time()) + 3600))
+
+    async def run():
+        # a request cancelled while rate limited must not block the ones queued behind
+        try:
+            await asyncio.wait_for(scheduler.acquire_async(KEY), 0.1)
+        except asyncio.TimeoutError:
+            pass
+        scheduler.update(KEY, headers(100, int(time.time()) + 7200))
+        await asyncio.wait_for(scheduler.acquire_async(KEY), 1)
+
+    asyncio.run(run())
+    assert scheduler.budget(KEY)[1] == 99
+
+
+@responses.activate
+def test_scheduler_records_response_headers():
+    responses.add(responses.GET,
+                  with_resource('/' + API_VERSION + '/accounts/2iqph'),
+                  body=with_fixture('accounts_load'),
+                  content_type='application/json',
+                  headers=headers(99, 1546300800))
+
+    scheduler = RateLimitScheduler()
+    client = Client(
+        characters(40),
+        characters(40),
+        characters(40),
+        characters(40),
+        options={'rate_limit_scheduler': scheduler}
+    )
+
+    Account.load(client, '2iqph')
+    assert scheduler._buckets[('2iqph', 'accounts')].remaining == 99
+
+
+@responses.activate
+def test_scheduler_request_priority():
+    responses.add(responses.GET,
+                  with_resource('/' + API_VERSION + '/accounts/2iqph'),
+                  body=with_fixture('accounts_load'),
+                  content_type='application/json')
+    responses.add(responses.GET,
+                  with_resource('/' + API_VERSION + '/accounts/2iqph/line_items'),
+                  body=with_fixture('line_items_all'),
+                  content_type='application/json')
+
+    scheduler = RateLimitScheduler()
+    priorities = []
+    acquire = scheduler.acquire
+    scheduler.acquire = lambda key, priority, **kwargs: \
+        priorities.append(priority) or acquire(key, priority, **kwargs)
+    client = Client(
+        characters(40),
+        characters(40),
+        characters(40),
+        characters(40),
+        options={'rate_limit_scheduler': scheduler, 'priority': PRIORITY.LOW}
+    )
+
+    account = Account.load(client, '2iqph', priority=PRIORITY.HIGH)
+    LineItem.all(account, priority=PRIORITY.HIGH)
+    LineItem.all(account)
+    assert priorities == [PRIORITY.HIGH, PRIORITY.HIGH, PRIORITY.LOW]
+    # the option is not sent to the API
+    assert 'priority' not in responses.calls[1].request.url
@@ -0,0 +1,80 @@
+import threading
+import time
+
+import responses
+
+from tests.support import with_resource, with_fixture, load_account
+
+from twitter_ads.campaign import Campaign
+from twitter_ads.error import NotFound
+from twitter_ads.singleflight import SingleFlight
+from twitter_ads import API_VERSION
+
+
+CAMPAIGN = with_resource('/' + API_VERSION + '/accounts/2iqph/campaigns/2wap7')
+
+
+def gated(status):
+    """Returns a response callback blocking until the returned event is set."""
+    calls = []
+    release = threading.Event()
+
+    def callback(request):
+        calls.append(request)
+        release.wait(5)
+        return status, {}, with_fixture('campaigns_load')
+    return calls, release, callback
+
+
+def load_concurrently(account, count, single_flight, release, **kwargs):
+    results = [None] * count
+
+    def load(index):
+        try:
+            results[index] = Campaign.load(account, '2wap7', **kwargs)
+        except Exception as e:
+            results[index] = e
+
+    threads = [threading.Thread(target=load, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    started_at = time.monotonic()
+    while single_flight.shared < count - 1 and time.monotonic() - started_at < 5:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+@responses.activate
+def test_single_flight():
+    single_flight = SingleFlight()
+    account = load_account(single_flight=single_flight)
+
+    calls, release, callback = gated(200)
+    responses.add_callback(responses.GET, CAMPAIGN, callback=callback,
+                           content_type='application/json')
+
+    campaigns = load_concurrently(account, 5, single_flight, release, with_deleted=True)
+    assert len(calls) == 1
+    assert [campaign.id for campaign in campaigns] == ['2wap7'] * 5
+    assert len(set(id(campaign) for campaign in campaigns)) == 5
+
+    # nothing is cached once the request completed
+    Campaign.load(account, '2wap7', with_deleted=True)
+    assert len(calls) == 2
+
+
+@responses.activate
+def test_single_flight_error():
+    single_flight = SingleFlight()
+    account = load_account(single_flight=single_flight)
+
+    calls, release, callback = gated(404)
+    responses.add_callback(responses.GET, CAMPAIGN, callback=callback,
+                           content_type='application/json')
+
+    errors = load_concurrently(account, 3, single_flight, release)
+    assert len(calls) == 1
+    assert all(isinstance(error, NotFound) for error in errors)
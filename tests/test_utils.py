@@ -1,7 +1,7 @@
 import datetime
 
 from twitter_ads.enum import GRANULARITY
-from twitter_ads.utils import to_time, Deprecated
+from twitter_ads.utils import to_time, Deprecated, parse_time
 
 
 t = datetime.datetime(2006, 3, 21, 0, 0, 0)
@@ -28,3 +28,23 @@ def test_decorator_deprecated():
         assert issubclass(log[-1].category, DeprecationWarning)
         assert "TestClass.test" in str(log[-1].message)
         assert "deprecated API" in str(log[-1].message)
+
+
+def test_iter_json_array():
+    from twitter_ads.utils import iter_json_array
+
+    chunks = ['{"request": {"data": [0]}, "da', 'ta": [1', '2, {"id": "a', 'b"}, 3', '4]',
+              ', "n": 1}']
+    assert list(iter_json_array(chunks, 'data')) == [12, {'id': 'ab'}, 34]
+    assert list(iter_json_array(['{"data": []}'], 'data')) == []
+    assert list(iter_json_array(['{}'], 'data')) == []
+
+
+def test_parse_time():
+    value = parse_time('2019-02-28T01:30:07Z')
+    assert value == datetime.datetime(2019, 2, 28, 1, 30, 7, tzinfo=datetime.timezone.utc)
+    assert parse_time('2019-02-28T01:30:07Z') is value
+    # unexpected shapes fall back to dateutil
+    assert parse_time('2019-02-28T01:30:07.250Z') == \
+        datetime.datetime(2019, 2, 28, 1, 30, 7, 250000, tzinfo=datetime.timezone.utc)
+    assert parse_time('2019-02-28') == datetime.datetime(2019, 2, 28)
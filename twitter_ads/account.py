@@ -5,7 +5,7 @@ A Twitter supported and maintained Ads API SDK for Python.
 """
 from twitter_ads.enum import TRANSFORM
 from twitter_ads.http import Request
-from twitter_ads.cursor import Cursor
+from twitter_ads.cursor import AsyncCursor, Cursor, pop_cursor_options
 from twitter_ads import API_VERSION
 
 from twitter_ads.resource import resource_property, Resource
@@ -42,16 +42,44 @@ class Account(Resource):
     @classmethod
     def load(klass, client, id, **kwargs):
         """Returns an object instance for a given resource."""
+        deadline = kwargs.pop('deadline', None)
+        priority = kwargs.pop('priority', None)
         resource = klass.RESOURCE.format(id=id)
-        response = Request(client, 'get', resource, params=kwargs).perform()
+        response = Request(client, 'get', resource, params=kwargs,
+                           deadline=deadline, priority=priority).perform()
         return klass(client).from_response(response.body['data'])
 
     @classmethod
     def all(klass, client, **kwargs):
         """Returns a Cursor instance for a given resource."""
+        deadline = kwargs.pop('deadline', None)
+        priority = kwargs.pop('priority', None)
+        options = pop_cursor_options(kwargs)
         resource = klass.RESOURCE_COLLECTION
-        request = Request(client, 'get', resource, params=kwargs)
-        return Cursor(klass, request, init_with=[client])
+        request = Request(client, 'get', resource, params=kwargs,
+                          deadline=deadline, priority=priority)
+        return Cursor(klass, request, init_with=[client], **options)
+
+    @classmethod
+    async def load_async(klass, client, id, **kwargs):
+        """Awaitable counterpart of :meth:`load`."""
+        deadline = kwargs.pop('deadline', None)
+        priority = kwargs.pop('priority', None)
+        resource = klass.RESOURCE.format(id=id)
+        response = await Request(client, 'get', resource, params=kwargs,
+                                 deadline=deadline, priority=priority).perform_async()
+        return klass(client).from_response(response.body['data'])
+
+    @classmethod
+    def all_async(klass, client, **kwargs):
+        """Returns an AsyncCursor instance for a given resource."""
+        deadline = kwargs.pop('deadline', None)
+        priority = kwargs.pop('priority', None)
+        options = pop_cursor_options(kwargs)
+        resource = klass.RESOURCE_COLLECTION
+        request = Request(client, 'get', resource, params=kwargs,
+                          deadline=deadline, priority=priority)
+        return AsyncCursor(klass, request, init_with=[client], **options)
 
     def reload(self, **kwargs):
         """
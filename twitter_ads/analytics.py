@@ -2,25 +2,36 @@
 
 """Container for all plugable resource object logic used by the Ads API SDK."""
 
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 try:
     from urllib.parse import urlparse
 except ImportError:
     from urlparse import urlparse
 
-from twitter_ads.utils import to_time, validate_whole_hours
-from twitter_ads.enum import ENTITY, GRANULARITY, PLACEMENT, TRANSFORM
-from twitter_ads.http import Request
+from twitter_ads.utils import to_time, validate_whole_hours, split_list
+from twitter_ads.utils import format_time, parse_time, remove_hours, remove_minutes
+from twitter_ads.utils import iter_gzip, iter_json_array
+from twitter_ads.enum import ENTITY, GRANULARITY, JOB_STATUS, PLACEMENT, TRANSFORM
+from twitter_ads.error import RateLimit
+from twitter_ads.http import Deadline, Request
 from twitter_ads.cursor import Cursor
+from twitter_ads.metrics import MetricsFrame
 from twitter_ads.resource import Resource, resource_property
 from twitter_ads import API_VERSION
 from twitter_ads.utils import FlattenParams
 
+logger = logging.getLogger(__name__)
+
 
 class Analytics(Resource):
     """
     Container for all analytics related logic used by API resource objects.
     """
+
     PROPERTIES = {}
 
     ANALYTICS_MAP = {
@@ -37,6 +48,21 @@ class Analytics(Resource):
     RESOURCE_ASYNC = '/' + API_VERSION + '/stats/jobs/accounts/{account_id}'
     RESOURCE_ACTIVE_ENTITIES = '/' + API_VERSION + '/stats/accounts/{account_id}/active_entities'
 
+    # per-request limits of the synchronous stats endpoint
+    SYNC_MAX_ENTITY_IDS = 20
+    SYNC_MAX_TIME_WINDOW = timedelta(days=7)
+
+    # per-job limits of the asynchronous stats endpoint
+    ASYNC_MAX_ENTITY_IDS = 20
+    ASYNC_MAX_TIME_WINDOW = timedelta(days=90)
+    ASYNC_MAX_JOB_IDS = 200
+
+    # time buckets of the granularities a stats cache can serve
+    _BUCKET_STEPS = {
+        GRANULARITY.HOUR: timedelta(hours=1),
+        GRANULARITY.DAY: timedelta(days=1)
+    }
+
     def stats(self, metrics, **kwargs):  # noqa
         """
         Pulls a list of metrics for the current object instance.
@@ -44,12 +70,20 @@ class Analytics(Resource):
         return self.__class__.all_stats(self.account, [self.id], metrics, **kwargs)
 
     @classmethod
-    def _standard_params(klass, ids, metric_groups, **kwargs):
+    def _time_range(klass, **kwargs):
         """
-        Sets the standard params for a stats request
+        Returns the requested (start_time, end_time) pair, defaulting to the last 7 days.
         """
         end_time = kwargs.get('end_time', datetime.utcnow())
         start_time = kwargs.get('start_time', end_time - timedelta(seconds=604800))
+        return start_time, end_time
+
+    @classmethod
+    def _standard_params(klass, ids, metric_groups, **kwargs):
+        """
+        Sets the standard params for a stats request
+        """
+        start_time, end_time = klass._time_range(**kwargs)
         granularity = kwargs.get('granularity', GRANULARITY.HOUR)
         placement = kwargs.get('placement', PLACEMENT.ALL_ON_TWITTER)
         entity = kwargs.get('entity', None)
@@ -71,12 +105,187 @@ class Analytics(Resource):
     def all_stats(klass, account, ids, metric_groups, **kwargs):
         """
         Pulls a list of metrics for a specified set of object IDs.
+
+        Any number of IDs and any time range may be passed: the work is split
+        into requests of at most ``SYNC_MAX_ENTITY_IDS`` IDs and
+        ``SYNC_MAX_TIME_WINDOW`` which are sent concurrently on up to
+        ``max_workers`` threads (defaults to the ``stats_max_workers`` client
+        option, or 4). Results are merged back per entity in input order.
+
+        A :class:`twitter_ads.cache.StatsCache` passed as ``cache`` (or set as
+        the ``stats_cache`` client option) serves the HOUR and DAY buckets it
+        holds locally, so only missing and still mutable buckets are requested.
+
+        Pass ``as_frame=True`` to get a :class:`twitter_ads.metrics.MetricsFrame`
+        instead of the list of entity dicts. A ``deadline`` bounds the time
+        spent on all of the requests.
+        """
+        if kwargs.get('deadline', None) is not None:
+            kwargs['deadline'] = Deadline.coerce(kwargs['deadline'])
+        granularity = kwargs.get('granularity', GRANULARITY.HOUR)
+        cache = kwargs.pop('cache', None) or account.client.options.get('stats_cache', None)
+        if cache is not None and granularity in klass._BUCKET_STEPS:
+            data = klass._cached_stats(cache, account, ids, metric_groups, **kwargs)
+        else:
+            data = klass._fetch_stats(account, ids, metric_groups, **kwargs)
+
+        if kwargs.get('as_frame', False):
+            start_time = klass._time_range(**kwargs)[0]
+            if granularity in klass._BUCKET_STEPS:
+                # requests start at the beginning of the bucket, and so does the data
+                start_time = _floor_time(start_time, granularity)
+            return MetricsFrame.from_data(data, start_time=start_time, granularity=granularity)
+        return data
+
+    @classmethod
+    def _fetch_stats(klass, account, ids, metric_groups, **kwargs):
+        """
+        Splits a stats query into requests within the endpoint limits, sends
+        them concurrently and returns the merged ``data``.
+        """
+        granularity = kwargs.get('granularity', GRANULARITY.HOUR)
+        windows = [klass._time_range(**kwargs)]
+        if granularity != GRANULARITY.TOTAL:
+            windows = klass._split_time_range(windows[0][0], windows[0][1],
+                                              klass.SYNC_MAX_TIME_WINDOW)
+        tasks = [(chunk, window) for window in windows
+                 for chunk in split_list(ids, klass.SYNC_MAX_ENTITY_IDS)]
+
+        def fetch(task):
+            chunk, (start_time, end_time) = task
+            options = dict(kwargs, start_time=start_time, end_time=end_time)
+            return klass._sync_stats(account, chunk, metric_groups, **options)
+
+        if not tasks:
+            # no entity IDs, nothing to request
+            return []
+        if len(tasks) == 1:
+            return fetch(tasks[0])['data']
+
+        max_workers = kwargs.get('max_workers', None) \
+            or account.client.options.get('stats_max_workers', 4)
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(tasks))) as executor:
+            bodies = list(executor.map(fetch, tasks))
+        size = len(bodies) // len(windows)
+        return klass._merge_stats(ids, [bodies[i:i + size] for i in range(0, len(bodies), size)])
+
+    @classmethod
+    def _cached_stats(klass, cache, account, ids, metric_groups, **kwargs):
+        """
+        Serves the time buckets found in a stats cache and only fetches the
+        missing (or expired) ones, which are stored back in the cache.
+        """
+        granularity = kwargs.get('granularity', GRANULARITY.HOUR)
+        step = klass._BUCKET_STEPS[granularity]
+        start_time, end_time = [_floor_time(t, granularity) for t in klass._time_range(**kwargs)]
+        starts = []
+        while start_time + step * len(starts) < end_time:
+            starts.append(start_time + step * len(starts))
+        buckets = [format_time(t) for t in starts]
+        if not buckets:
+            return klass._fetch_stats(account, ids, metric_groups, **kwargs)
+
+        query = '|'.join([','.join(sorted(map(str, metric_groups))),
+                          kwargs.get('placement', PLACEMENT.ALL_ON_TWITTER), granularity])
+        scope = (account.id, kwargs.get('entity') or klass.ANALYTICS_MAP[klass.__name__], query)
+        cached = cache.get(scope, ids, buckets)
+
+        # group the entities by the contiguous bucket ranges they are missing
+        missing = {}
+        for id in ids:
+            first = None
+            for i, bucket in enumerate(buckets + [None]):
+                if bucket is not None and (id, bucket) not in cached:
+                    first = i if first is None else first
+                elif first is not None:
+                    missing.setdefault((first, i), []).append(id)
+                    first = None
+
+        now = datetime.utcnow()
+        for (first, last), chunk in sorted(missing.items()):
+            options = dict(kwargs, start_time=starts[first], end_time=starts[last - 1] + step)
+            entries = []
+            for entry in klass._fetch_stats(account, chunk, metric_groups, **options):
+                for i in range(first, last):
+                    id_data = [dict(item, metrics=_slice_metrics(item['metrics'], i - first))
+                               for item in entry['id_data']]
+                    cached[(entry['id'], buckets[i])] = id_data
+                    entries.append((entry['id'], buckets[i], id_data,
+                                    cache.expires_at(starts[i] + step, now)))
+            cache.put(scope, entries)
+
+        data = []
+        for id in ids:
+            # entities the API returned no data for are left out, as without a cache
+            if not all((id, bucket) in cached for bucket in buckets):
+                continue
+            segments = {}
+            for i, bucket in enumerate(buckets):
+                for item in cached[(id, bucket)]:
+                    key = json.dumps(item.get('segment', None), sort_keys=True)
+                    segments.setdefault(key, (item, [None] * len(buckets)))[1][i] = \
+                        item['metrics']
+            id_data = [dict(item, metrics=_join_metrics(slices))
+                       for item, slices in segments.values()]
+            data.append({'id': id, 'id_data': id_data})
+        return data
+
+    @classmethod
+    def _sync_stats(klass, account, ids, metric_groups, **kwargs):
+        """
+        Sends a single synchronous stats request and returns the response body.
         """
         params = klass._standard_params(ids, metric_groups, **kwargs)
 
         resource = klass.RESOURCE_SYNC.format(account_id=account.id)
-        response = Request(account.client, 'get', resource, params=params).perform()
-        return response.body['data']
+        response = Request(account.client, 'get', resource, params=params,
+                           deadline=kwargs.get('deadline', None)).perform()
+        return response.body
+
+    @staticmethod
+    def _split_time_range(start_time, end_time, max_window):
+        """
+        Splits a time range into consecutive windows no longer than max_window.
+        """
+        windows = []
+        while end_time - start_time > max_window:
+            windows.append((start_time, start_time + max_window))
+            start_time = start_time + max_window
+        windows.append((start_time, end_time))
+        return windows
+
+    @classmethod
+    def _merge_stats(klass, ids, windows):
+        """
+        Merges the data of several stats responses, grouped by time window (in
+        time order), into one entry per entity. The time series of consecutive
+        windows are concatenated, and the windows an entity or segment has no
+        data in are padded with zeros so that every series covers the full range.
+        """
+        lengths = []
+        merged = {}
+        for i, bodies in enumerate(windows):
+            lengths.append(max([body.get('time_series_length', 1) for body in bodies] or [1]))
+            for body in bodies:
+                for entry in body['data']:
+                    segments = merged.setdefault(entry['id'], {})
+                    for id_data in entry['id_data']:
+                        key = json.dumps(id_data.get('segment', None), sort_keys=True)
+                        segments.setdefault(key, (id_data, {}))[1][i] = id_data['metrics']
+
+        data = []
+        for id in ids:
+            if id not in merged:
+                continue
+            id_data = []
+            for item, slices in merged[id].values():
+                metrics, length = None, 0
+                for i, window_length in enumerate(lengths):
+                    metrics = _concat_metrics(metrics, slices.get(i, None), length, window_length)
+                    length += window_length
+                id_data.append(dict(item, metrics=metrics))
+            data.append({'id': id, 'id_data': id_data})
+        return data
 
     @classmethod
     def queue_async_stats_job(klass, account, ids, metric_groups, **kwargs):
@@ -90,17 +299,27 @@ class Analytics(Resource):
         params['segmentation_type'] = kwargs.get('segmentation_type', None)
 
         resource = klass.RESOURCE_ASYNC.format(account_id=account.id)
-        response = Request(account.client, 'post', resource, params=params).perform()
+        response = Request(account.client, 'post', resource, params=params,
+                           deadline=kwargs.get('deadline', None)).perform()
         return Analytics(account).from_response(response.body['data'], headers=response.headers)
 
+    @classmethod
+    def async_stats_jobs(klass, account, ids, metric_groups, **kwargs):
+        """
+        Returns an :class:`AsyncStatsJobs` orchestrator queuing, polling and
+        downloading async stats jobs for any number of IDs and time windows.
+        """
+        return AsyncStatsJobs(klass, account, ids, metric_groups, **kwargs)
+
     @classmethod
     @FlattenParams
     def async_stats_job_result(klass, account, **kwargs):
         """
         Returns the results of the specified async job IDs
         """
+        deadline = kwargs.pop('deadline', None)
         resource = klass.RESOURCE_ASYNC.format(account_id=account.id)
-        request = Request(account.client, 'get', resource, params=kwargs)
+        request = Request(account.client, 'get', resource, params=kwargs, deadline=deadline)
 
         return Cursor(Analytics, request, init_with=[account])
 
@@ -108,15 +327,46 @@ class Analytics(Resource):
     def async_stats_job_data(klass, account, url, **kwargs):
         """
         Returns the results of the specified async job IDs
+
+        With ``stream=True`` a generator of the per-entity ``data`` records is
+        returned instead. The file is then decompressed and parsed incrementally
+        in ``chunk_size`` byte chunks, so memory use does not depend on its size.
+        With ``as_frame=True`` a :class:`twitter_ads.metrics.MetricsFrame` is returned.
+        Its time buckets start at the ``start_time`` and ``granularity`` of the
+        job, which are read from the file unless passed explicitly.
         """
         resource = urlparse(url)
         domain = '{0}://{1}'.format(resource.scheme, resource.netloc)
+        deadline = kwargs.get('deadline', None)
+
+        if kwargs.get('stream', False):
+            response = Request(account.client, 'get', resource.path, domain=domain,
+                               stream=True, raw_stream=True, deadline=deadline).perform()
+            return klass._iter_job_data(response.raw, kwargs.get('chunk_size', 65536))
 
         response = Request(account.client, 'get', resource.path, domain=domain,
-                           raw_body=True, stream=True).perform()
+                           raw_body=True, stream=True, deadline=deadline).perform()
 
+        if kwargs.get('as_frame', False):
+            params = (response.body.get('request', None) or {}).get('params', None) or {}
+            start_time = kwargs.get('start_time', params.get('start_time', None))
+            if isinstance(start_time, str):
+                start_time = parse_time(start_time)
+            return MetricsFrame.from_data(response.body['data'],
+                                          response.body.get('time_series_length', None),
+                                          start_time=start_time,
+                                          granularity=kwargs.get('granularity',
+                                                                 params.get('granularity', None)))
         return response.body
 
+    @staticmethod
+    def _iter_job_data(raw, chunk_size):
+        try:
+            for record in iter_json_array(iter_gzip(raw, chunk_size), 'data'):
+                yield record
+        finally:
+            raw.close()
+
     @classmethod
     @FlattenParams
     def active_entities(klass, account, start_time, end_time, **kwargs):
@@ -132,6 +382,7 @@ class Analytics(Resource):
         validate_whole_hours(start_time)
         validate_whole_hours(end_time)
 
+        deadline = kwargs.pop('deadline', None)
         params = {
             'entity': entity,
             'start_time': to_time(start_time, None),
@@ -140,9 +391,250 @@ class Analytics(Resource):
         params.update(kwargs)
 
         resource = klass.RESOURCE_ACTIVE_ENTITIES.format(account_id=account.id)
-        response = Request(account.client, 'get', resource, params=params).perform()
+        response = Request(account.client, 'get', resource, params=params,
+                           deadline=deadline).perform()
         return response.body['data']
 
+    @classmethod
+    def sync_stats(klass, account, metric_groups, **kwargs):
+        """
+        Incrementally pulls the metrics of the entities which had activity
+        since the last sync.
+
+        :meth:`active_entities` is queried for ``since`` until ``until``
+        (defaults to the current hour) and stats are only fetched for the
+        active entities, grouped by their whole-day activity range. Returns a
+        list of ``(start_time, end_time, data)`` tuples, one per range.
+
+        When a ``checkpoint_store`` is given, ``until`` is saved as a watermark
+        under ``checkpoint_key`` after a successful sync and used as ``since``
+        by the next call. A ``deadline`` bounds the whole sync. Any other
+        option is passed on to :meth:`all_stats`.
+        """
+        store = kwargs.pop('checkpoint_store', None)
+        key = kwargs.pop('checkpoint_key', None) or '{0}:{1}:sync_stats'.format(
+            account.id, kwargs.get('entity') or klass.ANALYTICS_MAP[klass.__name__])
+        since = kwargs.pop('since', None)
+        until = kwargs.pop('until', None) or remove_minutes(datetime.utcnow())
+
+        if since is None and store is not None:
+            watermark = store.load(key)
+            if watermark is not None:
+                since = _parse_time(watermark['watermark'])
+        if since is None:
+            raise ValueError("Error! 'since' is required when no watermark has been saved.")
+
+        kwargs['deadline'] = Deadline.coerce(kwargs.get('deadline', None))
+        options = {'deadline': kwargs['deadline']}
+        if kwargs.get('entity', None):
+            options['entity'] = kwargs['entity']
+        active = klass.active_entities(account, since, until, **options)
+
+        placement = kwargs.get('placement', PLACEMENT.ALL_ON_TWITTER)
+        results = []
+        for (start_time, end_time), ids in klass._activity_ranges(active, placement):
+            options = dict(kwargs, start_time=start_time, end_time=end_time)
+            results.append((start_time, end_time,
+                            klass.all_stats(account, ids, metric_groups, **options)))
+
+        if store is not None:
+            store.save(key, {'watermark': format_time(until)})
+        return results
+
+    @staticmethod
+    def _activity_ranges(active, placement):
+        """
+        Groups active entities by their activity range, widened to whole days
+        (see ``examples/active_entities.py``), skipping entities without
+        activity on the requested placement. Returns ``((start, end), ids)``
+        pairs ordered by range.
+        """
+        ranges = {}
+        for item in active:
+            if placement not in item.get('placements', [placement]):
+                continue
+            start_time = remove_hours(_parse_time(item['activity_start_time']))
+            end_time = remove_hours(_parse_time(item['activity_end_time'])) + timedelta(days=1)
+            ranges.setdefault((start_time, end_time), []).append(item['entity_id'])
+        return sorted(ranges.items())
+
+
+class AsyncStatsJobs(object):
+    """
+    Orchestrates the asynchronous analytics workflow for a set of entity IDs.
+
+    Every combination of entity ID chunk, time window and segmentation type is
+    queued as its own job, keeping at most ``max_concurrent_jobs`` (or the
+    ``x-concurrent-job-limit`` reported by the API) in flight. Job status is
+    polled in batches with an interval that grows by ``backoff`` while nothing
+    completes, and the data of each job is downloaded as soon as it succeeds.
+
+    Iterating the instance yields ``(job, data)`` pairs where ``job`` is the
+    :class:`Analytics` job and ``data`` its parsed ``data`` list (or, with
+    ``stream=True``, a generator streaming its records). Failed jobs are
+    collected in :attr:`failed`. A ``deadline`` bounds the whole run,
+    including the polling waits.
+
+    ..seealso:: :doc:`/examples/analytics.py`
+    """
+
+    def __init__(self, klass, account, ids, metric_groups, **kwargs):
+        self._klass = klass
+        self._account = account
+        self._metric_groups = metric_groups
+        self._windows = kwargs.pop('windows', None) or [klass._time_range(**kwargs)]
+        self._segmentation_types = kwargs.pop('segmentation_types', None) or [None]
+        self._max_concurrent_jobs = kwargs.pop('max_concurrent_jobs', None)
+        self._poll_interval = kwargs.pop('poll_interval', 5)
+        self._max_poll_interval = kwargs.pop('max_poll_interval', 60)
+        self._backoff = kwargs.pop('backoff', 1.5)
+        self._stream = kwargs.pop('stream', False)
+        self._deadline = Deadline.coerce(kwargs.pop('deadline', None))
+        self._options = dict(kwargs, deadline=self._deadline)
+
+        self._pending = [(chunk, window, segmentation_type)
+                         for segmentation_type in self._segmentation_types
+                         for start_time, end_time in self._windows
+                         for window in klass._split_time_range(
+                             start_time, end_time, klass.ASYNC_MAX_TIME_WINDOW)
+                         for chunk in split_list(ids, klass.ASYNC_MAX_ENTITY_IDS)]
+        self._active = {}
+        self._failed = []
+
+    @property
+    def failed(self):
+        """Returns the list of jobs which finished with a FAILED status."""
+        return self._failed
+
+    def run(self, callback):
+        """Runs all jobs to completion, calling callback(job, data) for each result."""
+        for job, data in self:
+            callback(job, data)
+
+    def __iter__(self):
+        interval = self._poll_interval
+        while self._pending or self._active:
+            self.__queue_jobs()
+            if self._deadline is not None:
+                self._deadline.check(interval)
+            time.sleep(interval)
+
+            completed = 0
+            for job in self.__poll():
+                completed += 1
+                if job.status == JOB_STATUS.SUCCESS and self._stream:
+                    yield job, self._klass.async_stats_job_data(
+                        self._account, url=job.url, stream=True, deadline=self._deadline)
+                elif job.status == JOB_STATUS.SUCCESS:
+                    data = self._klass.async_stats_job_data(self._account, url=job.url,
+                                                            deadline=self._deadline)
+                    yield job, data['data']
+                else:
+                    logger.warning("Async analytics job %s failed" % job.id)
+                    self._failed.append(job)
+
+            # poll again quickly once jobs start completing, back off otherwise
+            if completed:
+                interval = self._poll_interval
+            else:
+                interval = min(interval * self._backoff, self._max_poll_interval)
+
+    def __queue_jobs(self):
+        while self._pending:
+            if self._max_concurrent_jobs and len(self._active) >= self._max_concurrent_jobs:
+                return
+
+            ids, (start_time, end_time), segmentation_type = self._pending[0]
+            options = dict(self._options, start_time=start_time, end_time=end_time,
+                           segmentation_type=segmentation_type)
+            try:
+                job = self._klass.queue_async_stats_job(
+                    self._account, ids, self._metric_groups, **options)
+            except RateLimit:
+                # concurrent job limit reached, wait for running jobs to complete
+                if not self._active:
+                    raise
+                self._max_concurrent_jobs = len(self._active)
+                return
+
+            self._pending.pop(0)
+            self._active[str(job.id)] = job
+
+            remaining = getattr(job, 'concurrent_job_limit_remaining', None)
+            if remaining is not None and int(remaining) <= 0:
+                return
+
+    def __poll(self):
+        completed = []
+        for job_ids in split_list(list(self._active), self._klass.ASYNC_MAX_JOB_IDS):
+            cursor = self._klass.async_stats_job_result(self._account, job_ids=job_ids,
+                                                        deadline=self._deadline)
+            for job in cursor:
+                if job.status in (JOB_STATUS.SUCCESS, JOB_STATUS.FAILED):
+                    self._active.pop(str(job.id), None)
+                    completed.append(job)
+        return completed
+
+
+def _parse_time(value):
+    """Parses an API timestamp into a naive UTC datetime."""
+    return parse_time(value).replace(tzinfo=None)
+
+
+def _floor_time(value, granularity):
+    """Truncates a date or datetime to the start of its HOUR or DAY bucket."""
+    if not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+    if granularity == GRANULARITY.HOUR:
+        return remove_minutes(value)
+    return remove_hours(value)
+
+
+def _slice_metrics(metrics, index):
+    """Returns the single bucket at ``index`` of every (nested) metric series."""
+    sliced = {}
+    for name, values in metrics.items():
+        if isinstance(values, dict):
+            sliced[name] = _slice_metrics(values, index)
+        else:
+            sliced[name] = None if values is None else values[index:index + 1]
+    return sliced
+
+
+def _join_metrics(slices):
+    """
+    Joins single bucket metric slices (None for a bucket without data) into
+    full series, padding with zeros unless every bucket is ``None``.
+    """
+    names = set()
+    for metrics in slices:
+        names.update(metrics or {})
+    joined = {}
+    for name in names:
+        values = [(metrics or {}).get(name, None) for metrics in slices]
+        if any(isinstance(value, dict) for value in values):
+            joined[name] = _join_metrics([value if isinstance(value, dict) else None
+                                          for value in values])
+        elif all(value is None for value in values):
+            joined[name] = None
+        else:
+            joined[name] = [value[0] if value else 0 for value in values]
+    return joined
+
+
+def _concat_metrics(first, second, first_length, second_length):
+    """
+    Concatenates two metric series of consecutive time windows. A ``None``
+    series (no data in that window) is padded with zeros unless both are ``None``.
+    """
+    if first is None and second is None:
+        return None
+    if isinstance(first, dict) or isinstance(second, dict):
+        keys = set(first or {}) | set(second or {})
+        return dict((key, _concat_metrics((first or {}).get(key), (second or {}).get(key),
+                                          first_length, second_length)) for key in keys)
+    return (first or [0] * first_length) + (second or [0] * second_length)
+
 
 # Analytics properties
 # read-only
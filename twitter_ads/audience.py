@@ -6,7 +6,7 @@ from twitter_ads.enum import TRANSFORM
 from twitter_ads.resource import resource_property, Resource
 from twitter_ads.http import Request
 from twitter_ads.error import BadRequest
-from twitter_ads.cursor import Cursor
+from twitter_ads.cursor import Cursor, pop_cursor_options
 from twitter_ads import API_VERSION
 
 import json
@@ -113,13 +113,13 @@ class CustomAudiencePermission(Resource):
     @classmethod
     def all(klass, account, custom_audience_id, **kwargs):
         """Returns a Cursor instance for the given custom audience permission resource."""
-
+        options = pop_cursor_options(kwargs)
         resource = klass.RESOURCE_COLLECTION.format(
             account_id=account.id,
             custom_audience_id=custom_audience_id)
         request = Request(account.client, 'get', resource, params=kwargs)
 
-        return Cursor(klass, request, init_with=[account])
+        return Cursor(klass, request, init_with=[account], **options)
 
     def save(self):
         """
@@ -169,13 +169,13 @@ class CustomAudienceTargeted(Resource):
     @classmethod
     def all(klass, account, custom_audience_id, **kwargs):
         """Returns a Cursor instance for the given targeted custom audience resource."""
-
+        options = pop_cursor_options(kwargs)
         resource = klass.RESOURCE.format(
             account_id=account.id,
             custom_audience_id=custom_audience_id)
         request = Request(account.client, 'get', resource, params=kwargs)
 
-        return Cursor(klass, request, init_with=[account])
+        return Cursor(klass, request, init_with=[account], **options)
 
 
 # custom audience targeted properties
@@ -0,0 +1,122 @@
+# Copyright (C) 2015 Twitter, Inc.
+
+"""Container for the per-endpoint circuit breaker used by the Ads API SDK."""
+
+import threading
+import time
+
+from twitter_ads.enum import CIRCUIT_STATE
+from twitter_ads.error import CircuitOpen
+
+
+class _Circuit(object):
+    """State of the circuit of a single endpoint family."""
+
+    def __init__(self):
+        self.state = CIRCUIT_STATE.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.probes = 0
+
+
+class CircuitBreaker(object):
+    """
+    Fails requests fast while an endpoint family (see
+    :func:`twitter_ads.utils.endpoint_family`, e.g. ``stats/jobs`` or
+    ``batch/line_items``) is down, instead of letting every request go
+    through its full retry cycle.
+
+    A circuit opens after ``failure_threshold`` consecutive failures (a
+    status in ``failure_statuses``, a timeout or a connection error). While
+    open, requests raise :class:`twitter_ads.error.CircuitOpen` without being
+    sent. After ``recovery_timeout`` seconds the circuit is half-open and
+    lets ``half_open_max_calls`` requests through: a success closes it again,
+    a failure re-opens it.
+
+    A single breaker may be shared by several clients through the
+    ``circuit_breaker`` client option.
+    """
+
+    def __init__(self, failure_threshold=5, recovery_timeout=30, half_open_max_calls=1,
+                 failure_statuses=(500, 502, 503, 504)):
+        self._failure_threshold = failure_threshold
+        self._recovery_timeout = recovery_timeout
+        self._half_open_max_calls = half_open_max_calls
+        self._failure_statuses = failure_statuses
+        self._circuits = {}
+        self._lock = threading.Lock()
+
+    def state(self, family):
+        """Returns the :data:`twitter_ads.enum.CIRCUIT_STATE` of an endpoint family."""
+        with self._lock:
+            return self.__refresh(self.__circuit(family), time.time()).state
+
+    def states(self):
+        """Returns a ``{family: state}`` dict of every endpoint family seen so far."""
+        now = time.time()
+        with self._lock:
+            return dict((family, self.__refresh(circuit, now).state)
+                        for family, circuit in self._circuits.items())
+
+    def acquire(self, family):
+        """
+        Raises :class:`twitter_ads.error.CircuitOpen` if a request to the
+        endpoint family may not be sent right now.
+        """
+        with self._lock:
+            circuit = self.__refresh(self.__circuit(family), time.time())
+            if circuit.state == CIRCUIT_STATE.OPEN:
+                raise CircuitOpen(family, circuit.opened_at + self._recovery_timeout)
+            if circuit.state == CIRCUIT_STATE.HALF_OPEN:
+                if circuit.probes >= self._half_open_max_calls:
+                    raise CircuitOpen(family, time.time())
+                circuit.probes += 1
+
+    def release(self, family):
+        """Gives back the half-open probe taken by a request which was not sent after all."""
+        with self._lock:
+            circuit = self.__circuit(family)
+            if circuit.state == CIRCUIT_STATE.HALF_OPEN and circuit.probes > 0:
+                circuit.probes -= 1
+
+    def record(self, family, status=None):
+        """
+        Records the outcome of a request: its response status code or None
+        if it failed without a response.
+        """
+        success = status is not None and status not in self._failure_statuses
+        with self._lock:
+            circuit = self.__circuit(family)
+            if success:
+                circuit.state = CIRCUIT_STATE.CLOSED
+                circuit.failures = 0
+                circuit.probes = 0
+                return
+
+            circuit.failures += 1
+            if circuit.state == CIRCUIT_STATE.HALF_OPEN \
+                    or circuit.failures >= self._failure_threshold:
+                circuit.state = CIRCUIT_STATE.OPEN
+                circuit.opened_at = time.time()
+                circuit.probes = 0
+
+    def reset(self, family=None):
+        """Closes the circuit of an endpoint family or, without one, of all of them."""
+        with self._lock:
+            if family is None:
+                self._circuits.clear()
+            else:
+                self._circuits.pop(family, None)
+
+    def __circuit(self, family):
+        circuit = self._circuits.get(family, None)
+        if circuit is None:
+            circuit = self._circuits[family] = _Circuit()
+        return circuit
+
+    def __refresh(self, circuit, now):
+        if circuit.state == CIRCUIT_STATE.OPEN \
+                and now >= circuit.opened_at + self._recovery_timeout:
+            circuit.state = CIRCUIT_STATE.HALF_OPEN
+            circuit.probes = 0
+        return circuit
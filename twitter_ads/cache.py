@@ -0,0 +1,200 @@
+# Copyright (C) 2015 Twitter, Inc.
+
+"""Container for the local analytics and object caches used by the Ads API SDK."""
+
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+
+from twitter_ads.utils import format_time
+
+
+class StatsCache(object):
+    """
+    Base class for all analytics caches used by
+    :meth:`twitter_ads.analytics.Analytics.all_stats`.
+
+    Entries hold the ``id_data`` of a single entity for a single time bucket
+    and are scoped by ``(account_id, entity, query)`` where ``query`` covers
+    the metric groups, placement and granularity of the request. Buckets which
+    ended more than ``final_after`` ago are considered final and never expire;
+    more recent buckets expire ``recent_ttl`` seconds after being stored.
+    """
+
+    def __init__(self, final_after=timedelta(days=1), recent_ttl=900):
+        self.final_after = final_after
+        self.recent_ttl = recent_ttl
+
+    def expires_at(self, bucket_end, now):
+        """
+        Returns the expiry timestamp of a bucket stored at ``now`` (a naive UTC
+        datetime) or None if the bucket is final.
+        """
+        if bucket_end + self.final_after <= now:
+            return None
+        return time.time() + self.recent_ttl
+
+    def get(self, scope, entity_ids, buckets):
+        """
+        Returns a ``{(entity_id, bucket): id_data}`` dict of the unexpired
+        entries found for the given entity IDs and bucket strings.
+        """
+        raise NotImplementedError
+
+    def put(self, scope, entries):
+        """
+        Stores a list of ``(entity_id, bucket, id_data, expires_at)`` entries,
+        replacing any existing ones.
+        """
+        raise NotImplementedError
+
+    def invalidate(self, account_id, entity=None, entity_ids=None, start_time=None,
+                   end_time=None):
+        """
+        Removes the cached entries of an account, optionally narrowed down to
+        an entity type, a list of entity IDs and a ``[start_time, end_time)``
+        range of buckets.
+        """
+        raise NotImplementedError
+
+
+class SQLiteStatsCache(StatsCache):
+    """Stores analytics buckets in a table of a SQLite database file."""
+
+    def __init__(self, path, table='stats', **kwargs):
+        super(SQLiteStatsCache, self).__init__(**kwargs)
+        self._table = table
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS {0} (account_id TEXT NOT NULL, '
+                'entity TEXT NOT NULL, entity_id TEXT NOT NULL, query TEXT NOT NULL, '
+                'bucket TEXT NOT NULL, id_data TEXT NOT NULL, expires_at REAL, '
+                'PRIMARY KEY (account_id, entity, query, entity_id, bucket))'.format(table))
+
+    def get(self, scope, entity_ids, buckets):
+        account_id, entity, query = scope
+        found = {}
+        now = time.time()
+        with self._lock:
+            # one query per entity keeps the number of bound parameters small
+            for entity_id in entity_ids:
+                rows = self._connection.execute(
+                    'SELECT bucket, id_data FROM {0} WHERE account_id = ? AND entity = ? '
+                    'AND query = ? AND entity_id = ? AND bucket >= ? AND bucket <= ? '
+                    'AND (expires_at IS NULL OR expires_at > ?)'.format(self._table),
+                    (account_id, entity, query, entity_id, min(buckets), max(buckets), now))
+                for bucket, id_data in rows:
+                    found[(entity_id, bucket)] = json.loads(id_data)
+        return found
+
+    def put(self, scope, entries):
+        account_id, entity, query = scope
+        rows = [(account_id, entity, query, entity_id, bucket, json.dumps(id_data), expires_at)
+                for entity_id, bucket, id_data, expires_at in entries]
+        with self._lock, self._connection:
+            self._connection.executemany(
+                'INSERT OR REPLACE INTO {0} (account_id, entity, query, entity_id, bucket, '
+                'id_data, expires_at) VALUES (?, ?, ?, ?, ?, ?, ?)'.format(self._table), rows)
+
+    def invalidate(self, account_id, entity=None, entity_ids=None, start_time=None,
+                   end_time=None):
+        clauses, params = ['account_id = ?'], [account_id]
+        if entity is not None:
+            clauses.append('entity = ?')
+            params.append(entity)
+        if entity_ids is not None:
+            clauses.append('entity_id IN ({0})'.format(','.join('?' * len(entity_ids))))
+            params.extend(entity_ids)
+        if start_time is not None:
+            clauses.append('bucket >= ?')
+            params.append(format_time(start_time))
+        if end_time is not None:
+            clauses.append('bucket < ?')
+            params.append(format_time(end_time))
+        with self._lock, self._connection:
+            self._connection.execute(
+                'DELETE FROM {0} WHERE {1}'.format(self._table, ' AND '.join(clauses)), params)
+
+    def expire(self):
+        """Deletes all expired entries."""
+        with self._lock, self._connection:
+            self._connection.execute(
+                'DELETE FROM {0} WHERE expires_at IS NOT NULL AND expires_at <= ?'
+                .format(self._table), (time.time(),))
+
+    def close(self):
+        """Closes the underlying database connection."""
+        self._connection.close()
+
+
+class IdentityMap(object):
+    """
+    Keeps the resource objects loaded through a client, keyed by class,
+    account ID and object ID, so loading the same entity again costs no
+    request. Set it as the ``identity_map`` client option.
+
+    It is populated by ``load`` and by Cursor iteration, holds at most
+    ``maxsize`` objects (evicting the least recently used ones) and drops
+    entries ``ttl`` seconds after they were stored. Objects are invalidated
+    when they are saved or deleted.
+    """
+
+    def __init__(self, maxsize=10000, ttl=300):
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, klass, account_id, id):
+        """Returns the object stored for the given class, account and ID or None."""
+        key = (klass.__name__, account_id, id)
+        with self._lock:
+            entry = self._entries.get(key, None)
+            if entry is None:
+                return None
+            if entry[1] <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, obj):
+        """Stores (or refreshes) a resource object."""
+        key = _identity(obj)
+        if key is None:
+            return
+        with self._lock:
+            self._entries[key] = (obj, time.time() + self._ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def discard(self, obj):
+        """Removes a resource object, if stored."""
+        key = _identity(obj)
+        if key is None:
+            return
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Removes all stored objects."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def _identity(obj):
+    """Returns the identity map key of a resource object or None if it has no ID."""
+    id = getattr(obj, 'id', None)
+    account = getattr(obj, '_account', None)
+    if id is None or account is None:
+        return None
+    return (obj.__class__.__name__, account.id, id)
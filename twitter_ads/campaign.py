@@ -6,7 +6,7 @@ from twitter_ads.enum import TRANSFORM
 from twitter_ads.analytics import Analytics
 from twitter_ads.resource import resource_property, Resource, Persistence, Batch
 from twitter_ads.http import Request
-from twitter_ads.cursor import Cursor
+from twitter_ads.cursor import Cursor, pop_cursor_options
 from twitter_ads.utils import FlattenParams
 from twitter_ads import API_VERSION
 
@@ -17,6 +17,7 @@ class TargetingCriteria(Resource, Persistence, Batch):
 
     BATCH_RESOURCE_COLLECTION = '/' + API_VERSION + '/batch/accounts/{account_id}/\
 targeting_criteria'
+    BATCH_SIZE = 500
     RESOURCE_COLLECTION = '/' + API_VERSION + '/accounts/{account_id}/targeting_criteria'
     RESOURCE = '/' + API_VERSION + '/accounts/{account_id}/targeting_criteria/{id}'
     RESOURCE_OPTIONS = '/' + API_VERSION + '/targeting_criteria/'
@@ -25,9 +26,10 @@ targeting_criteria'
     @FlattenParams
     def all(klass, account, **kwargs):
         """Returns a Cursor instance for a given resource."""
+        options = pop_cursor_options(kwargs)
         resource = klass.RESOURCE_COLLECTION.format(account_id=account.id)
         request = Request(account.client, 'get', resource, params=kwargs)
-        return Cursor(klass, request, init_with=[account])
+        return Cursor(klass, request, init_with=[account], **options)
 
     @classmethod
     def app_store_categories(klass, account, **kwargs):
@@ -266,7 +268,7 @@ class LineItem(Analytics, Resource, Persistence, Batch):
             return TargetingCriteria.load(self.account, id, **kwargs)
 
     def save(self):
-        super(LineItem, self).save()
+        return super().save()
 
 
 # line item properties
@@ -424,12 +426,14 @@ class TaxSettings(Resource, Persistence):
 
     def save(self):
         """
-        Update the current object instance.
+        Update the current object instance, sending only the changed properties.
         """
+        if not getattr(self, '_dirty', None):
+            return self
         resource = self.RESOURCE.format(account_id=self.account.id)
         response = Request(
             self.account.client, 'put',
-            resource, params=self.to_params()).perform()
+            resource, params=self.to_params(dirty=True)).perform()
         return self.from_response(response.body['data'])
 
 
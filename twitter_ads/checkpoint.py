@@ -0,0 +1,97 @@
+# Copyright (C) 2015 Twitter, Inc.
+
+"""Container for the pluggable cursor checkpoint stores used by the Ads API SDK."""
+
+import json
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+
+
+class CheckpointStore(object):
+    """
+    Base class for all checkpoint stores. A store persists the JSON serializable
+    checkpoints returned by :meth:`twitter_ads.cursor.Cursor.checkpoint` under
+    a caller chosen key.
+    """
+
+    def load(self, key):
+        """Returns the checkpoint saved under the given key or None."""
+        raise NotImplementedError
+
+    def save(self, key, checkpoint):
+        """Saves (or replaces) the checkpoint stored under the given key."""
+        raise NotImplementedError
+
+    def delete(self, key):
+        """Deletes the checkpoint saved under the given key, if any."""
+        raise NotImplementedError
+
+
+class FileCheckpointStore(CheckpointStore):
+    """Stores each checkpoint as a JSON file inside a directory."""
+
+    def __init__(self, directory):
+        self._directory = directory
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    def load(self, key):
+        try:
+            with open(self.__path(key), 'r') as f:
+                return json.load(f)
+        except (IOError, OSError):
+            return None
+
+    def save(self, key, checkpoint):
+        # write to a temporary file first so a crash never leaves a truncated checkpoint
+        fd, path = tempfile.mkstemp(dir=self._directory, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(checkpoint, f)
+        os.replace(path, self.__path(key))
+
+    def delete(self, key):
+        try:
+            os.remove(self.__path(key))
+        except (IOError, OSError):
+            pass
+
+    def __path(self, key):
+        return os.path.join(self._directory, re.sub(r'[^\w.-]', '_', key) + '.json')
+
+
+class SQLiteCheckpointStore(CheckpointStore):
+    """Stores checkpoints in a table of a SQLite database file."""
+
+    def __init__(self, path, table='checkpoints'):
+        self._table = table
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS {0} (key TEXT PRIMARY KEY, '
+                'checkpoint TEXT NOT NULL, updated_at REAL NOT NULL)'.format(table))
+
+    def load(self, key):
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT checkpoint FROM {0} WHERE key = ?'.format(self._table), (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save(self, key, checkpoint):
+        with self._lock, self._connection:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO {0} (key, checkpoint, updated_at) '
+                'VALUES (?, ?, ?)'.format(self._table), (key, json.dumps(checkpoint), time.time()))
+
+    def delete(self, key):
+        with self._lock, self._connection:
+            self._connection.execute(
+                'DELETE FROM {0} WHERE key = ?'.format(self._table), (key,))
+
+    def close(self):
+        """Closes the underlying database connection."""
+        self._connection.close()
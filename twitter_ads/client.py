@@ -4,6 +4,23 @@
 A Twitter supported and maintained Ads API SDK for Python.
 """
 
+import threading
+import time
+
+try:
+    from urllib.parse import urlencode
+except ImportError:
+    from urllib import urlencode
+
+from oauthlib.oauth1 import Client as OAuth1Client
+from requests.adapters import HTTPAdapter
+from requests_oauthlib import OAuth1Session
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
 from twitter_ads.account import Account
 
 
@@ -13,6 +30,9 @@ class Client(object):
     API consumer information.
     """
 
+    # whether requests are sent with perform_async instead of perform
+    ASYNC = False
+
     def __init__(self,
                  consumer_key,
                  consumer_secret,
@@ -30,6 +50,9 @@ class Client(object):
         self._access_token_secret = access_token_secret
         self._options = kwargs.get('options', {})
         self._headers = kwargs.get('headers', {})
+        self._session = None
+        self._session_used_at = None
+        self._session_lock = threading.Lock()
 
     def __repr__(self):
         return '<{name} object at {mem} consumer_key={key}>'.format(
@@ -68,6 +91,52 @@ class Client(object):
         """Returns the access_token_secret value."""
         return self._access_token_secret
 
+    @property
+    def session(self):
+        """
+        Returns the keep-alive HTTP session shared by every request made
+        through this client instance. The session is created on first use and
+        recycled once it has been idle for longer than ``pool_idle_timeout``.
+        """
+        with self._session_lock:
+            now = time.time()
+            idle_timeout = self._options.get('pool_idle_timeout', None)
+            if self._session is not None and idle_timeout is not None \
+                    and now - self._session_used_at > idle_timeout:
+                self._session.close()
+                self._session = None
+            if self._session is None:
+                self._session = self.__build_session()
+            self._session_used_at = now
+            return self._session
+
+    def close(self):
+        """Closes the shared HTTP session and all of its pooled connections."""
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __build_session(self):
+        session = OAuth1Session(
+            self._consumer_key,
+            client_secret=self._consumer_secret,
+            resource_owner_key=self._access_token,
+            resource_owner_secret=self._access_token_secret)
+        adapter = HTTPAdapter(
+            pool_connections=self._options.get('pool_connections', 10),
+            pool_maxsize=self._options.get('pool_maxsize', 10),
+            pool_block=self._options.get('pool_block', False))
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
     def sandbox():
         """Enables and disables sandbox mode."""
         def fget(self):
@@ -98,3 +167,95 @@ class Client(object):
         the current access token.
         """
         return Account.load(self, id) if id else Account.all(self)
+
+
+class AsyncClient(Client):
+    """
+    An asyncio flavour of the Ads API :class:`Client`. Requests made through an
+    :class:`AsyncClient` are sent with :meth:`twitter_ads.http.Request.perform_async`
+    over a shared ``aiohttp`` session, so a single event loop can keep many
+    requests in flight at once. Requires the optional ``aiohttp`` dependency.
+    """
+
+    ASYNC = True
+
+    _FORM_ENCODED = 'application/x-www-form-urlencoded'
+
+    def __init__(self, *args, **kwargs):
+        if aiohttp is None:
+            raise ImportError("AsyncClient requires aiohttp: pip install twitter-ads[async]")
+        super(AsyncClient, self).__init__(*args, **kwargs)
+        self._oauth = OAuth1Client(
+            self._consumer_key,
+            client_secret=self._consumer_secret,
+            resource_owner_key=self._access_token,
+            resource_owner_secret=self._access_token_secret)
+
+    @property
+    def session(self):
+        """
+        Returns the ``aiohttp.ClientSession`` shared by every request made
+        through this client instance. Must be accessed from a running event loop.
+        """
+        if self._session is None or self._session.closed:
+            self._session = self.__build_session()
+        return self._session
+
+    async def close(self):
+        """Closes the shared HTTP session and all of its pooled connections."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def __enter__(self):
+        raise TypeError("Error! AsyncClient must be used with 'async with' instead of 'with'.")
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        raise TypeError("Error! AsyncClient must be used with 'async with' instead of 'with'.")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    def sign(self, method, url, params=None, data=None, headers=None):
+        """
+        Returns the OAuth1 signed ``(url, headers, body)`` triple for a request.
+        Query params are folded into the signed URL and form bodies are signed
+        as ``application/x-www-form-urlencoded``; any other body is sent as is.
+        """
+        headers = dict(headers or {})
+        if params:
+            query = urlencode([(k, v) for k, v in params.items() if v is not None])
+            url = url + ('&' if '?' in url else '?') + query if query else url
+
+        body = None
+        if isinstance(data, dict):
+            data = urlencode([(k, v) for k, v in data.items() if v is not None])
+            headers['Content-Type'] = self._FORM_ENCODED
+            body = data
+
+        url, headers, _ = self._oauth.sign(url, method.upper(), body, headers)
+        return url, headers, data
+
+    def accounts(self, id=None):
+        """
+        Returns an awaitable :class:`Account` when ``id`` is given, otherwise an
+        :class:`twitter_ads.cursor.AsyncCursor` over all available accounts.
+        """
+        return Account.load_async(self, id) if id else Account.all_async(self)
+
+    def __build_session(self):
+        timeout = self._options.get('timeout', None)
+        if isinstance(timeout, (tuple, list)):
+            timeout = aiohttp.ClientTimeout(sock_connect=timeout[0], sock_read=timeout[1])
+        elif timeout is not None:
+            timeout = aiohttp.ClientTimeout(total=timeout)
+        else:
+            timeout = aiohttp.ClientTimeout(total=None)
+        connector = aiohttp.TCPConnector(
+            limit=self._options.get('pool_limit', 100),
+            limit_per_host=self._options.get('pool_maxsize', 0),
+            keepalive_timeout=self._options.get('pool_idle_timeout', 15))
+        return aiohttp.ClientSession(connector=connector, timeout=timeout)
@@ -271,10 +271,12 @@ class MediaLibrary(Resource, Persistence):
         return self.from_response(response.body['data'])
 
     def update(self):
+        if not getattr(self, '_dirty', None):
+            return self
         resource = self.RESOURCE.format(account_id=self.account.id, id=self.media_key)
         response = Request(
             self.account.client, 'put',
-            resource, params=self.to_params()).perform()
+            resource, params=self.to_params(dirty=True)).perform()
 
         return self.from_response(response.body['data'])
 
@@ -2,15 +2,59 @@
 
 """Container for all Cursor logic used by the Ads API SDK."""
 
+import asyncio
+import hashlib
+import importlib
+import json
+import queue
+import threading
+import weakref
+
 # from twitter_ads import *
-from twitter_ads.http import Request
+from twitter_ads.http import Deadline, Request
 from twitter_ads.utils import extract_response_headers
 
 
+# keyword arguments of ``all`` calls which configure the cursor instead of being sent
+CURSOR_OPTIONS = ('checkpoint_key', 'checkpoint_store', 'lazy', 'prefetch', 'streaming')
+
+
+def pop_cursor_options(kwargs):
+    """
+    Pops the :data:`CURSOR_OPTIONS` out of the keyword arguments of an ``all``
+    call, so they are passed to its :class:`Cursor` instead of the API.
+    """
+    options = dict((name, kwargs.pop(name)) for name in CURSOR_OPTIONS if name in kwargs)
+    for name in ('lazy', 'streaming'):
+        # FlattenParams turns booleans into 'true' and 'false'
+        if options.get(name, None) in ('true', 'false'):
+            options[name] = options[name] == 'true'
+    return options
+
+
+def checkpoint_key(method, resource, params):
+    """
+    Returns the checkpoint key used when a ``checkpoint_store`` is given
+    without a ``checkpoint_key``, derived from the method, resource and params
+    (without the page ``cursor``) of the first request, so a resumed cursor
+    saves under the same key.
+    """
+    params = dict((name, value) for name, value in params.items() if name != 'cursor')
+    digest = hashlib.sha1(json.dumps(params, sort_keys=True, default=str).encode('utf-8'))
+    return '{0}:{1}:{2}'.format(method, resource, digest.hexdigest())
+
+
 class Cursor(object):
     """
-    The Ads API Client class which functions as a container for basic
-    API consumer information.
+    Iterates over a paginated API collection, fetching pages on demand.
+
+    By default every fetched item is kept so the cursor can be iterated more
+    than once. Pass ``streaming=True`` to keep only the current page in memory,
+    ``prefetch=N`` to fetch the next ``N`` pages in the background and
+    ``lazy=True`` to only convert the properties of an item which are read
+    (at the cost of keeping every raw item dict in memory).
+    A ``deadline`` (a :class:`twitter_ads.http.Deadline` or a number of
+    seconds) bounds the time spent fetching all pages.
     """
 
     def __init__(self, klass, request, **kwargs):
@@ -19,16 +63,119 @@ class Cursor(object):
         self._method = request.method
         self._resource = request.resource
 
+        # number of pages fetched ahead on a background thread (0 disables prefetching)
+        self._prefetch = kwargs.pop('prefetch', self._client.options.get('prefetch', 0))
+        self._pages = None
+        self._worker = None
+        self._stopped = threading.Event()
+
+        # keep only the current page in memory instead of every fetched item
+        self._streaming = kwargs.pop('streaming', False)
+
+        # keep the raw item dicts and only convert the properties which are read
+        self._lazy = kwargs.pop('lazy', self._client.options.get('lazy_hydration', False))
+
+        # store the hydrated objects so that later loads of the same entities are free
+        self._identity_map = self._client.options.get('identity_map', None)
+
+        # persist a checkpoint of every loaded page under the given (or derived) key
+        self._checkpoint_store = kwargs.pop('checkpoint_store', None)
+        self._checkpoint_key = kwargs.pop('checkpoint_key', None)
+        if self._checkpoint_store is not None and self._checkpoint_key is None:
+            self._checkpoint_key = checkpoint_key(
+                request.method, request.resource, request.options.get('params', {}))
+
+        # one time budget shared by all page requests
+        deadline = Deadline.coerce(kwargs.pop('deadline', None))
+
         self._options = kwargs.copy()
         self._options.update(request.options)
+        if deadline is not None:
+            self._options['deadline'] = request.options['deadline'] = deadline
 
         self._collection = []
         self._current_index = 0
         self._next_cursor = None
         self._total_count = 0
+        self._fetched = 0
+        self._first = None
+        self._page_cursor = request.options.get('params', {}).get('cursor', None)
+        self._page_start = 0
+        self._fetched_before_page = 0
 
         self.__from_response(request.perform())
 
+    def __del__(self):
+        # an abandoned cursor stops its prefetching worker
+        stopped = getattr(self, '_stopped', None)
+        if stopped is not None:
+            stopped.set()
+
+    @classmethod
+    def resume(klass, client, checkpoint, init_with=None, **kwargs):
+        """
+        Returns a new Cursor instance continuing from a checkpoint previously
+        returned by :meth:`checkpoint`. Items of the checkpointed page that were
+        already consumed are skipped.
+        """
+        resource_klass = None
+        if checkpoint['klass']:
+            module, name = checkpoint['klass'].rsplit('.', 1)
+            resource_klass = getattr(importlib.import_module(module), name)
+
+        if init_with is None and resource_klass is not None:
+            from twitter_ads.account import Account
+            if issubclass(resource_klass, Account):
+                init_with = [client]
+            elif checkpoint['account_id']:
+                init_with = [Account(client).from_response({'id': checkpoint['account_id']})]
+
+        params = dict(checkpoint['params'])
+        if checkpoint['cursor']:
+            params['cursor'] = checkpoint['cursor']
+        options = {'params': params}
+        if checkpoint.get('domain', None):
+            options['domain'] = checkpoint['domain']
+        if init_with is not None:
+            kwargs['init_with'] = init_with
+        store = kwargs.pop('checkpoint_store', None)
+        key = kwargs.pop('checkpoint_key', None) \
+            or checkpoint_key(checkpoint['method'], checkpoint['resource'], checkpoint['params'])
+
+        request = Request(client, checkpoint['method'], checkpoint['resource'], **options)
+        cursor = klass(resource_klass, request, **kwargs)
+        cursor._fetched += checkpoint['fetched']
+        cursor._fetched_before_page += checkpoint['fetched']
+        cursor._current_index += min(checkpoint['index'], len(cursor._collection))
+
+        if store is not None:
+            cursor._checkpoint_store = store
+            cursor._checkpoint_key = key
+            store.save(key, cursor.checkpoint())
+        return cursor
+
+    def checkpoint(self):
+        """
+        Returns a JSON serializable checkpoint of the current iteration position
+        which can be passed to :meth:`resume`.
+        """
+        init_with = self._options.get('init_with', None)
+        account = init_with[0] if init_with else None
+        params = dict(self._options.get('params', {}))
+        params.pop('cursor', None)
+        klass = self._klass
+        return {
+            'klass': '{0}.{1}'.format(klass.__module__, klass.__name__) if klass else None,
+            'account_id': getattr(account, 'id', None),
+            'method': self._method,
+            'resource': self._resource,
+            'domain': self._options.get('domain', None),
+            'params': params,
+            'cursor': self._page_cursor,
+            'index': self._current_index - self._page_start,
+            'fetched': self._fetched_before_page
+        }
+
     @property
     def exhausted(self):
         """
@@ -36,26 +183,34 @@ class Cursor(object):
         """
         return False if self._next_cursor else True
 
+    @property
+    def next_cursor(self):
+        """
+        Returns the token of the next page, which can be passed back as the
+        ``cursor`` request param to restart iteration from that page.
+        """
+        return self._next_cursor
+
     @property
     def count(self):
         """
         Returns the total number of items available to this cursor instance.
         """
-        return self._total_count or len(self._collection)
+        return self._total_count or self._fetched
 
     @property
     def first(self):
         """
         Returns the first item of available items available to the cursor instance.
         """
-        return next(iter(self._collection), None)
+        return self._first
 
     @property
     def fetched(self):
         """
         Returns the number of items fetched so far.
         """
-        return len(self._collection)
+        return self._fetched
 
     def __iter__(self):
         return self
@@ -70,7 +225,12 @@ class Cursor(object):
             self.__fetch_next()
             return self.next()
         else:
+            if self._checkpoint_store is not None:
+                self._checkpoint_store.delete(self._checkpoint_key)
+            if self._streaming:
+                self._collection = []
             self._current_index = 0
+            self.__die()
             raise StopIteration
 
     __next__ = next
@@ -81,13 +241,260 @@ class Cursor(object):
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.__die()
 
+    def close(self):
+        """Stops any background page prefetching of the cursor instance."""
+        self.__die()
+
+    def __die(self):
+        self._stopped.set()
+        if self._worker is not None:
+            self._worker.join()
+            self._worker = None
+
     def __fetch_next(self):
+        page_cursor = self._next_cursor
+        if self._prefetch > 0:
+            response = self.__next_prefetched()
+        else:
+            response = self.__request_page(self._next_cursor)
+        self._page_cursor = page_cursor
+        return self.__from_response(response)
+
+    def __request_page(self, next_cursor):
         options = self._options.copy()
-        params = options.get('params', {})
-        params.update({'cursor': self._next_cursor})
+        params = options.get('params', {}).copy()
+        params.update({'cursor': next_cursor})
         options['params'] = params
-        response = Request(self._client, self._method, self._resource, **options).perform()
-        return self.__from_response(response)
+        return Request(self._client, self._method, self._resource, **options).perform()
+
+    def __start_prefetch(self):
+        # started once the first page runs out, so cursors which are only
+        # partially read (e.g. for `first`) do not fetch pages in the background
+        if self._prefetch > 0 and self._next_cursor and self._worker is None:
+            self._stopped = threading.Event()
+            self._pages = queue.Queue(maxsize=self._prefetch)
+            self._worker = threading.Thread(
+                target=self.__prefetch,
+                args=(weakref.ref(self), self._pages, self._stopped, self._next_cursor))
+            self._worker.daemon = True
+            self._worker.start()
+
+    @staticmethod
+    def __prefetch(ref, pages, stopped, next_cursor):
+        # only holds the cursor while requesting a page, so it can be garbage collected
+        while next_cursor and not stopped.is_set():
+            cursor = ref()
+            if cursor is None:
+                return
+            try:
+                response = cursor.__request_page(next_cursor)
+            except Exception as e:
+                Cursor.__put_page(ref, pages, stopped, None, e)
+                return
+            finally:
+                del cursor
+            next_cursor = response.body.get('next_cursor', None)
+            Cursor.__put_page(ref, pages, stopped, response, None)
+
+    @staticmethod
+    def __put_page(ref, pages, stopped, response, error):
+        while not stopped.is_set() and ref() is not None:
+            try:
+                pages.put((response, error), timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def __next_prefetched(self):
+        self.__start_prefetch()
+        response, error = self._pages.get()
+        if error is not None:
+            # the worker is gone, the next call restarts it from the same page
+            self._worker.join()
+            self._worker = None
+            raise error
+        return response
+
+    def __from_response(self, response):
+        self._next_cursor = response.body.get('next_cursor', None)
+        if 'total_count' in response.body:
+            self._total_count = int(response.body['total_count'])
+
+        limits = extract_response_headers(response.headers)
+        for k in limits:
+            setattr(self, k, limits[k])
+
+        if self._streaming:
+            self._collection = []
+            self._current_index = 0
+
+        self._page_start = len(self._collection)
+        self._fetched_before_page = self._fetched
+        for item in response.body['data']:
+            self._collection.append(_hydrate(self._klass, self._options, item, self._lazy,
+                                             self._identity_map))
+
+        if self._first is None and self._collection:
+            self._first = self._collection[0]
+        self._fetched += len(response.body['data'])
+
+        if self._checkpoint_store is not None:
+            self._checkpoint_store.save(self._checkpoint_key, self.checkpoint())
+
+
+class AsyncCursor(object):
+    """
+    The asyncio counterpart of :class:`Cursor`, iterated with ``async for``.
+    Pages are fetched lazily through :meth:`twitter_ads.http.Request.perform_async`
+    and items are hydrated exactly like the synchronous cursor does.
+    """
+
+    def __init__(self, klass, request, **kwargs):
+        self._klass = klass
+        self._client = request.client
+        self._method = request.method
+        self._resource = request.resource
+        if 'checkpoint_store' in kwargs or 'checkpoint_key' in kwargs:
+            raise ValueError("Error! AsyncCursor does not support checkpoints.")
+
+        # number of pages fetched ahead on a background task (0 disables prefetching)
+        self._prefetch = kwargs.pop('prefetch', self._client.options.get('prefetch', 0))
+        self._pages = None
+        self._worker = None
+
+        # keep only the current page in memory instead of every fetched item
+        self._streaming = kwargs.pop('streaming', False)
+
+        # keep the raw item dicts and only convert the properties which are read
+        self._lazy = kwargs.pop('lazy', self._client.options.get('lazy_hydration', False))
+
+        # store the hydrated objects so that later loads of the same entities are free
+        self._identity_map = self._client.options.get('identity_map', None)
+
+        # one time budget shared by all page requests
+        deadline = Deadline.coerce(kwargs.pop('deadline', None))
+
+        self._options = kwargs.copy()
+        self._options.update(request.options)
+        if deadline is not None:
+            self._options['deadline'] = request.options['deadline'] = deadline
+
+        self._collection = []
+        self._current_index = 0
+        self._next_cursor = None
+        self._total_count = 0
+        self._fetched = 0
+        self._first = None
+        self._started = False
+
+    @property
+    def exhausted(self):
+        """
+        Returns True if the cursor instance is exhausted.
+        """
+        return self._started and not self._next_cursor
+
+    @property
+    def next_cursor(self):
+        """
+        Returns the token of the next page, which can be passed back as the
+        ``cursor`` request param to restart iteration from that page.
+        """
+        return self._next_cursor
+
+    @property
+    def count(self):
+        """
+        Returns the total number of items available to this cursor instance.
+        """
+        return self._total_count or self._fetched
+
+    @property
+    def fetched(self):
+        """
+        Returns the number of items fetched so far.
+        """
+        return self._fetched
+
+    async def first(self):
+        """
+        Returns the first item available to the cursor instance.
+        """
+        if not self._started:
+            await self.__fetch_next()
+        return self._first
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        """Returns the next item in the cursor."""
+        if not self._started:
+            await self.__fetch_next()
+        while self._current_index >= len(self._collection) and self._next_cursor:
+            await self.__fetch_next()
+        if self._current_index < len(self._collection):
+            value = self._collection[self._current_index]
+            self._current_index += 1
+            return value
+        if self._streaming:
+            self._collection = []
+        self._current_index = 0
+        raise StopAsyncIteration
+
+    async def close(self):
+        """Cancels any background page prefetching of the cursor instance."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    async def __fetch_next(self):
+        if not self._started:
+            self._started = True
+            response = await self.__request_page(None)
+        elif self._prefetch > 0:
+            response = await self.__next_prefetched()
+        else:
+            response = await self.__request_page(self._next_cursor)
+        self.__from_response(response)
+        self.__start_prefetch()
+
+    async def __request_page(self, next_cursor):
+        options = self._options.copy()
+        if next_cursor:
+            params = options.get('params', {}).copy()
+            params.update({'cursor': next_cursor})
+            options['params'] = params
+        request = Request(self._client, self._method, self._resource, **options)
+        return await request.perform_async()
+
+    def __start_prefetch(self):
+        if self._prefetch > 0 and self._next_cursor and self._worker is None:
+            self._pages = asyncio.Queue(maxsize=self._prefetch)
+            self._worker = asyncio.ensure_future(self.__prefetch(self._next_cursor))
+
+    async def __prefetch(self, next_cursor):
+        while next_cursor:
+            try:
+                response = await self.__request_page(next_cursor)
+            except Exception as e:
+                await self._pages.put((None, e))
+                return
+            next_cursor = response.body.get('next_cursor', None)
+            await self._pages.put((response, None))
+
+    async def __next_prefetched(self):
+        self.__start_prefetch()
+        response, error = await self._pages.get()
+        if error is not None:
+            # the worker is gone, the next call restarts it from the same page
+            self._worker = None
+            raise error
+        return response
 
     def __from_response(self, response):
         self._next_cursor = response.body.get('next_cursor', None)
@@ -98,10 +505,25 @@ class Cursor(object):
         for k in limits:
             setattr(self, k, limits[k])
 
+        if self._streaming:
+            self._collection = []
+            self._current_index = 0
+
         for item in response.body['data']:
-            if 'from_response' in dir(self._klass):
-                init_with = self._options.get('init_with', None)
-                obj = self._klass(*init_with) if init_with else self._klass()
-                self._collection.append(obj.from_response(item))
-            else:
-                self._collection.append(item)
+            self._collection.append(_hydrate(self._klass, self._options, item, self._lazy,
+                                             self._identity_map))
+
+        if self._first is None and self._collection:
+            self._first = self._collection[0]
+        self._fetched += len(response.body['data'])
+
+
+def _hydrate(klass, options, item, lazy=False, identity_map=None):
+    if hasattr(klass, 'from_response'):
+        init_with = options.get('init_with', None)
+        obj = klass(*init_with) if init_with else klass()
+        obj = obj.from_response(item, lazy=True) if lazy else obj.from_response(item)
+        if identity_map is not None:
+            identity_map.put(obj)
+        return obj
+    return item
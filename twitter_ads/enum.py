@@ -62,6 +62,13 @@ ENTITY = enum(
     PROMOTED_ACCOUNT='PROMOTED_ACCOUNT'
 )
 
+JOB_STATUS = enum(
+    QUEUED='QUEUED',
+    PROCESSING='PROCESSING',
+    SUCCESS='SUCCESS',
+    FAILED='FAILED'
+)
+
 ENTITY_STATUS = enum(
     ACTIVE="ACTIVE",
     DRAFT="DRAFT",
@@ -230,3 +237,15 @@ SEGMENTATION_TYPE = enum(
 BUDGET_OPTIMIZATION = enum(
     CAMPAIGN='CAMPAIGN'
 )
+
+PRIORITY = enum(
+    HIGH=0,
+    NORMAL=1,
+    LOW=2
+)
+
+CIRCUIT_STATE = enum(
+    CLOSED='CLOSED',
+    OPEN='OPEN',
+    HALF_OPEN='HALF_OPEN'
+)
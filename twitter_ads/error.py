@@ -100,6 +100,78 @@ class GatewayTimeout(Error):
     """Gateway Timeout (504)."""
 
 
+class BatchError(Error):
+    """
+    Raised by ``batch_save`` once all of its batch requests are done if some
+    of them failed. ``errors`` holds the error of every failed request and
+    ``failed`` an ``(object, errors)`` pair for every object of those requests
+    (batch requests are atomic, so none of them were saved).
+    """
+
+    def __init__(self, failures, **kwargs):
+        super(BatchError, self).__init__(failures[0][1].response, **kwargs)
+        self._errors = [error for _, error in failures]
+        self._failed = []
+        for objs, error in failures:
+            body = error.response.body if isinstance(error.response.body, dict) else {}
+            operation_errors = body.get('operation_errors', None) \
+                or [error.details] * len(objs)
+            self._failed.extend(zip(objs, operation_errors))
+
+    @property
+    def errors(self):
+        return self._errors
+
+    @property
+    def failed(self):
+        return self._failed
+
+
+class CircuitOpen(Exception):
+    """
+    Raised instead of sending a request while the circuit breaker of its
+    endpoint family is open. ``retry_at`` is the timestamp after which a
+    request may be sent again.
+    """
+
+    def __init__(self, family, retry_at):
+        super(CircuitOpen, self).__init__(
+            "Error! The circuit of endpoint family {0} is open.".format(family))
+        self._family = family
+        self._retry_at = retry_at
+
+    @property
+    def family(self):
+        return self._family
+
+    @property
+    def retry_at(self):
+        return self._retry_at
+
+
+class DeadlineExceeded(Exception):
+    """
+    Raised when the remaining time budget of a request (see
+    :class:`twitter_ads.http.Deadline`) can not cover its next attempt or
+    wait. ``wait`` is the number of seconds that would have been needed.
+    """
+
+    def __init__(self, remaining, wait):
+        super(DeadlineExceeded, self).__init__(
+            "Error! {0:.3f} seconds left before the deadline, {1:.3f} needed."
+            .format(remaining, wait))
+        self._remaining = remaining
+        self._wait = wait
+
+    @property
+    def remaining(self):
+        return self._remaining
+
+    @property
+    def wait(self):
+        return self._wait
+
+
 ERRORS = {
     400: BadRequest,
     401: NotAuthorized,
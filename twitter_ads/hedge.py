@@ -0,0 +1,166 @@
+# Copyright (C) 2015 Twitter, Inc.
+
+"""Container for the hedged request policy used by the Ads API SDK."""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+
+
+class HedgePolicy(object):
+    """
+    Cuts the tail latency of GET requests by sending a second, identical
+    request when the first one has not returned within the ``percentile``
+    latency of its endpoint family (see
+    :func:`twitter_ads.utils.endpoint_family`); the first response to arrive
+    wins. Set it as the ``hedge_policy`` client option.
+
+    Once a request may be hedged, the original request is sent from a thread
+    of its own, so it never waits for the pool of ``max_workers`` threads
+    which sends the hedges. The pool is only shut down by :meth:`close`,
+    since a policy may be shared by several clients.
+
+    Latencies of the last ``window`` requests of each endpoint family drive
+    the delay, clamped to ``[min_delay, max_delay]`` seconds. No hedge is sent
+    before ``min_samples`` latencies are known, while ``max_in_flight``
+    hedges are already pending or while the last known rate-limit budget of
+    the endpoint family is down to ``min_remaining`` requests.
+    """
+
+    def __init__(self, percentile=95, min_delay=0.05, max_delay=2.0, max_in_flight=4,
+                 min_samples=20, window=200, min_remaining=10, max_workers=32):
+        self._percentile = percentile
+        self._min_delay = min_delay
+        self._max_delay = max_delay
+        self._max_in_flight = max_in_flight
+        self._min_samples = min_samples
+        self._window = window
+        self._min_remaining = min_remaining
+        self._latencies = {}
+        self._remaining = {}
+        self._in_flight = 0
+        self._hedged = 0
+        self._won = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    @property
+    def hedged(self):
+        """Returns the number of hedges sent so far."""
+        return self._hedged
+
+    @property
+    def won(self):
+        """Returns the number of hedges which returned before their original request."""
+        return self._won
+
+    def latency(self, key, percentile=None):
+        """
+        Returns a latency percentile (defaults to the hedging one) of an
+        endpoint family in seconds or None if no request was recorded yet.
+        """
+        with self._lock:
+            samples = sorted(self._latencies.get(key, ()))
+        if not samples:
+            return None
+        percentile = self._percentile if percentile is None else percentile
+        return samples[min(len(samples) - 1, int(len(samples) * percentile / 100.0))]
+
+    def delay(self, key):
+        """Returns the number of seconds after which a request is hedged or None."""
+        with self._lock:
+            if len(self._latencies.get(key, ())) < self._min_samples:
+                return None
+        return min(self._max_delay, max(self._min_delay, self.latency(key)))
+
+    def record(self, key, latency, headers=None):
+        """Records the latency (and rate-limit headers) of a response."""
+        headers = headers or {}
+        remaining = headers.get('x-account-rate-limit-remaining') \
+            or headers.get('x-rate-limit-remaining')
+        with self._lock:
+            samples = self._latencies.get(key, None)
+            if samples is None:
+                samples = self._latencies[key] = deque(maxlen=self._window)
+            samples.append(latency)
+            if remaining is not None:
+                self._remaining[key] = int(remaining)
+
+    def perform(self, key, send):
+        """
+        Calls ``send`` (which sends the request and returns its response),
+        hedging it with a second call when it is slow. Errors of the first
+        call are raised only if the hedge failed too.
+        """
+        delay = self.delay(key)
+        if delay is None:
+            return self.__timed(key, send)
+
+        # the original request gets a thread of its own, a busy pool only delays hedges
+        primary = Future()
+        threading.Thread(target=self.__original, args=(primary, key, send), daemon=True).start()
+        done, _ = wait([primary], timeout=delay)
+        if done or not self.__start_hedge(key):
+            return primary.result()
+
+        try:
+            hedge = self._executor.submit(self.__timed, key, send)
+        except RuntimeError:
+            # the pool was shut down by close()
+            self.__end_hedge(None)
+            return primary.result()
+        hedge.add_done_callback(self.__end_hedge)
+        pending = [primary, hedge]
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in [f for f in pending if f in done]:
+                pending.remove(future)
+                if future.exception() is None:
+                    for other in pending:
+                        if not other.cancel():
+                            other.add_done_callback(_discard)
+                    if future is hedge:
+                        with self._lock:
+                            self._won += 1
+                    return future.result()
+        return primary.result()
+
+    def close(self):
+        """Shuts the pool sending the hedges down, without waiting for pending ones."""
+        self._executor.shutdown(wait=False)
+
+    def __timed(self, key, send):
+        started_at = time.monotonic()
+        response = send()
+        self.record(key, time.monotonic() - started_at, response.headers)
+        return response
+
+    def __original(self, future, key, send):
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(self.__timed(key, send))
+        except BaseException as e:
+            future.set_exception(e)
+
+    def __start_hedge(self, key):
+        with self._lock:
+            if self._in_flight >= self._max_in_flight:
+                return False
+            remaining = self._remaining.get(key, None)
+            if remaining is not None and remaining <= self._min_remaining:
+                return False
+            self._in_flight += 1
+            self._hedged += 1
+            return True
+
+    def __end_hedge(self, future):
+        with self._lock:
+            self._in_flight -= 1
+
+
+def _discard(future):
+    """Releases the connection of a response which lost the race."""
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
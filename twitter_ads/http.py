@@ -9,16 +9,79 @@ logger = logging.getLogger(__name__)
 import json
 import zlib
 import time
+import asyncio
 
 if sys.version_info[0] != 3:
     import httplib
 else:
     import http.client as httplib
 
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
 from requests.exceptions import Timeout
-from requests_oauthlib import OAuth1Session
-from twitter_ads.utils import get_version
-from twitter_ads.error import Error
+from twitter_ads.enum import PRIORITY
+from twitter_ads.utils import get_version, endpoint_family
+from twitter_ads.error import DeadlineExceeded, Error
+from twitter_ads.retry import RetryPolicy
+
+
+class Deadline(object):
+    """
+    End-to-end time budget of ``timeout`` seconds shared by every attempt,
+    retry delay and rate-limit wait of a request and, when passed to a
+    Cursor, by all of its page requests. Any ``deadline`` option also accepts
+    a number of seconds.
+    """
+
+    def __init__(self, timeout):
+        self._expires_at = time.monotonic() + timeout
+
+    @classmethod
+    def coerce(klass, value):
+        """Returns a Deadline for a number of seconds, an existing Deadline or None."""
+        if value is None or isinstance(value, Deadline):
+            return value
+        return klass(value)
+
+    def remaining(self):
+        """Returns the number of seconds left (0 once expired)."""
+        return max(0.0, self._expires_at - time.monotonic())
+
+    @property
+    def expired(self):
+        return self.remaining() == 0
+
+    def check(self, wait=0):
+        """
+        Raises :class:`twitter_ads.error.DeadlineExceeded` unless more than
+        ``wait`` seconds are left.
+        """
+        remaining = self.remaining()
+        if remaining <= wait:
+            raise DeadlineExceeded(remaining, wait)
+
+    def timeout(self, timeout):
+        """Caps a per-attempt ``timeout`` option (a number or a pair) to the time left."""
+        remaining = self.remaining()
+        if timeout is None:
+            return remaining
+        if isinstance(timeout, tuple):
+            return tuple(min(value, remaining) for value in timeout)
+        return min(timeout, remaining)
+
+    def client_timeout(self, timeout):
+        """Caps an ``aiohttp.ClientTimeout`` (e.g. the one of a session) to the time left."""
+        remaining = self.remaining()
+        capped = {}
+        for name in ('total', 'connect', 'sock_read', 'sock_connect'):
+            value = getattr(timeout, name, None)
+            capped[name] = None if value is None else min(value, remaining)
+        if capped['total'] is None:
+            capped['total'] = remaining
+        return aiohttp.ClientTimeout(**capped)
 
 
 class Request(object):
@@ -38,6 +101,8 @@ class Request(object):
         self._client = client
         self._resource = resource
         self._options = kwargs.copy()
+        if self._options.get('deadline', None) is not None:
+            self._options['deadline'] = Deadline.coerce(self._options['deadline'])
 
         method = method.lower()
         if method not in self._HTTP_METHOD:
@@ -63,14 +128,49 @@ class Request(object):
         return self._resource
 
     def perform(self):
+        if getattr(self._client, 'ASYNC', False):
+            raise TypeError("Error! Requests of an AsyncClient must be sent with perform_async, "
+                            "e.g. through all_async or load_async.")
         if self.client.trace:
             self.__enable_logging()
-        response = self.__oauth_request()
+        single_flight = self._client.options.get('single_flight', None)
+        if single_flight is not None and self.__coalescable():
+            response = single_flight.do(self.__flight_key(), self.__oauth_request,
+                                        self.options.get('deadline', None))
+        else:
+            response = self.__oauth_request()
         if response.code > 399:
             raise Error.from_response(response)
         return response
 
-    def __oauth_request(self):
+    async def perform_async(self):
+        """
+        Awaitable counterpart of :meth:`perform`. The request client must be an
+        :class:`twitter_ads.client.AsyncClient` instance.
+        """
+        if not getattr(self._client, 'ASYNC', False):
+            raise TypeError("Error! perform_async requires an AsyncClient, use perform instead.")
+        if self.client.trace:
+            self.__enable_logging()
+        response = await self.__oauth_request_async()
+        if response.code > 399:
+            raise Error.from_response(response)
+        return response
+
+    def __coalescable(self):
+        """Returns whether identical concurrent requests may share this one's response."""
+        return self._method == 'get' and not self.options.get('body', None) \
+            and not self.options.get('files', None) and not self.options.get('stream', False)
+
+    def __flight_key(self):
+        params = self.options.get('params', None) or {}
+        return (self._method, self.__domain(), self._resource,
+                tuple(sorted((key, str(value)) for key, value in params.items()
+                             if value is not None)),
+                tuple(sorted(self.__headers().items())),
+                self._client.consumer_key, self._client.access_token)
+
+    def __headers(self):
         headers = {'user-agent': self.__user_agent()}
         if 'headers' in self.options:
             headers.update(self.options['headers'].copy())
@@ -81,47 +181,83 @@ class Request(object):
         # Add headers from the client to the request (Client headers take priority)
         for key, val in self._client.headers.items():
             headers[key] = val
+        return headers
+
+    def __oauth_request(self):
+        headers = self.__headers()
         params = self.options.get('params', None)
         data = self.options.get('body', None)
         files = self.options.get('files', None)
         stream = self.options.get('stream', False)
 
         handle_rate_limit = self._client.options.get('handle_rate_limit', False)
-        retry_max = self._client.options.get('retry_max', 0)
-        retry_delay = self._client.options.get('retry_delay', 1500)
-        retry_on_status = self._client.options.get('retry_on_status', [500, 503])
-        retry_on_timeouts = self._client.options.get('retry_on_timeouts', False)
-        timeout = self._client.options.get('timeout', None)
+        retry_policy = self.__retry_policy()
         retry_count = 0
         retry_after = None
         timeout = self._client.options.get('timeout', None)
 
-        consumer = OAuth1Session(
-            self._client.consumer_key,
-            client_secret=self._client.consumer_secret,
-            resource_owner_key=self._client.access_token,
-            resource_owner_secret=self._client.access_token_secret)
+        scheduler = self._client.options.get('rate_limit_scheduler', None)
+        scheduler_key = endpoint_family(self._resource)
+        breaker = self._client.options.get('circuit_breaker', None)
+        deadline = self.options.get('deadline', None)
 
-        url = self.__domain() + self._resource
-        method = getattr(consumer, self._method)
+        # only idempotent, fully buffered requests may be sent twice
+        hedge = self._client.options.get('hedge_policy', None)
+        if self._method != 'get' or stream or files:
+            hedge = None
 
-        while (retry_count <= retry_max):
+        url = self.__domain() + self._resource
+        method = getattr(self._client.session, self._method)
+
+        while True:
+            if scheduler is not None:
+                if deadline is None:
+                    scheduler.acquire(scheduler_key, self.__priority())
+                elif not scheduler.acquire(scheduler_key, self.__priority(),
+                                           timeout=deadline.remaining()):
+                    raise DeadlineExceeded(deadline.remaining(), deadline.remaining())
+            if deadline is not None:
+                deadline.check()
+            attempt_timeout = timeout if deadline is None else deadline.timeout(timeout)
+            # right before sending, so that every half-open probe taken gets recorded
+            if breaker is not None:
+                breaker.acquire(scheduler_key[1])
             try:
-                response = method(url, headers=headers, data=data, params=params,
-                                  files=files, stream=stream, timeout=timeout)
-            except Timeout as e:
-                if retry_on_timeouts:
-                    if retry_count == retry_max:
+                if hedge is not None:
+                    response = hedge.perform(scheduler_key, lambda: method(
+                        url, headers=headers, data=data, params=params,
+                        timeout=attempt_timeout))
+                else:
+                    response = method(url, headers=headers, data=data, params=params,
+                                      files=files, stream=stream, timeout=attempt_timeout)
+            except BaseException as e:
+                if not isinstance(e, Exception):
+                    # e.g. cancelled, the endpoint did not fail
+                    if breaker is not None:
+                        breaker.release(scheduler_key[1])
+                    raise
+                if breaker is not None:
+                    breaker.record(scheduler_key[1])
+                delay = retry_policy.retry_delay(retry_count, error=e)
+                if delay is None:
+                    if isinstance(e, Timeout):
                         raise Exception(e)
-                    logger.warning("Timeout occurred: resume in %s seconds"
-                                   % (int(retry_delay) / 1000))
-                    time.sleep(int(retry_delay) / 1000)
-                    retry_count += 1
-                    continue
-                raise Exception(e)
+                    raise
+                logger.warning("%s occurred: resume in %s seconds" % (type(e).__name__, delay))
+                if deadline is not None:
+                    deadline.check(delay)
+                time.sleep(delay)
+                retry_count += 1
+                continue
+
+            if scheduler is not None:
+                scheduler.update(scheduler_key, response.headers)
+            if breaker is not None:
+                breaker.record(scheduler_key[1], response.status_code)
 
             # do not retry on 2XX status code
             if 200 <= response.status_code < 300:
+                retry_policy.success()
                 break
 
             if handle_rate_limit and retry_after is None:
@@ -132,21 +268,141 @@ class Request(object):
                     retry_after = int(rate_limit_reset) - int(time.time())
                     logger.warning("Request reached Rate Limit: resume in %d seconds"
                                    % retry_after)
+                    if deadline is not None:
+                        deadline.check(retry_after + 5)
                     time.sleep(retry_after + 5)
                     continue
 
-            if retry_max > 0:
-                if response.status_code not in retry_on_status:
-                    break
-                time.sleep(int(retry_delay) / 1000)
-
+            delay = retry_policy.retry_delay(retry_count, status=response.status_code,
+                                             headers=response.headers)
+            if delay is None:
+                break
+            if deadline is not None:
+                deadline.check(delay)
+            time.sleep(delay)
             retry_count += 1
 
+        if self.options.get('raw_stream', False) and response.status_code < 400:
+            # leave the body unread, callers consume it incrementally from Response.raw
+            return Response(response.status_code, response.headers, raw=response.raw)
+
         raw_response_body = response.raw.read() if stream else response.text
 
         return Response(response.status_code, response.headers,
                         body=response.raw, raw_body=raw_response_body)
 
+    async def __oauth_request_async(self):
+        headers = self.__headers()
+        params = self.options.get('params', None)
+        data = self.options.get('body', None)
+        stream = self.options.get('stream', False)
+
+        if self.options.get('files', None):
+            raise ValueError("Error! File uploads are not supported by perform_async.")
+
+        handle_rate_limit = self._client.options.get('handle_rate_limit', False)
+        retry_policy = self.__retry_policy()
+        retry_count = 0
+        retry_after = None
+
+        scheduler = self._client.options.get('rate_limit_scheduler', None)
+        scheduler_key = endpoint_family(self._resource)
+        breaker = self._client.options.get('circuit_breaker', None)
+        deadline = self.options.get('deadline', None)
+
+        url, headers, data = self._client.sign(
+            self._method, self.__domain() + self._resource, params, data, headers)
+        session = self._client.session
+
+        while True:
+            if scheduler is not None:
+                if deadline is None:
+                    await scheduler.acquire_async(scheduler_key, self.__priority())
+                elif not await scheduler.acquire_async(scheduler_key, self.__priority(),
+                                                       timeout=deadline.remaining()):
+                    raise DeadlineExceeded(deadline.remaining(), deadline.remaining())
+            options = {}
+            if deadline is not None:
+                deadline.check()
+                options['timeout'] = deadline.client_timeout(session.timeout)
+            # right before sending, so that every half-open probe taken gets recorded
+            if breaker is not None:
+                breaker.acquire(scheduler_key[1])
+            try:
+                async with session.request(self._method, url, headers=headers,
+                                           data=data, **options) as response:
+                    status = response.status
+                    response_headers = response.headers
+                    if stream:
+                        raw_response_body = await response.read()
+                    else:
+                        raw_response_body = await response.text()
+            except BaseException as e:
+                if not isinstance(e, Exception):
+                    # e.g. cancelled, the endpoint did not fail
+                    if breaker is not None:
+                        breaker.release(scheduler_key[1])
+                    raise
+                if breaker is not None:
+                    breaker.record(scheduler_key[1])
+                delay = retry_policy.retry_delay(retry_count, error=e)
+                if delay is None:
+                    if isinstance(e, asyncio.TimeoutError):
+                        raise Exception(e)
+                    raise
+                logger.warning("%s occurred: resume in %s seconds" % (type(e).__name__, delay))
+                if deadline is not None:
+                    deadline.check(delay)
+                await asyncio.sleep(delay)
+                retry_count += 1
+                continue
+
+            if scheduler is not None:
+                scheduler.update(scheduler_key, response_headers)
+            if breaker is not None:
+                breaker.record(scheduler_key[1], status)
+
+            # do not retry on 2XX status code
+            if 200 <= status < 300:
+                retry_policy.success()
+                break
+
+            if handle_rate_limit and retry_after is None:
+                rate_limit_reset = response_headers.get('x-account-rate-limit-reset') \
+                    or response_headers.get('x-rate-limit-reset')
+
+                if status == 429:
+                    retry_after = int(rate_limit_reset) - int(time.time())
+                    logger.warning("Request reached Rate Limit: resume in %d seconds"
+                                   % retry_after)
+                    if deadline is not None:
+                        deadline.check(retry_after + 5)
+                    await asyncio.sleep(retry_after + 5)
+                    continue
+
+            delay = retry_policy.retry_delay(retry_count, status=status, headers=response_headers)
+            if delay is None:
+                break
+            if deadline is not None:
+                deadline.check(delay)
+            await asyncio.sleep(delay)
+            retry_count += 1
+
+        return Response(status, response_headers, raw_body=raw_response_body)
+
+    def __retry_policy(self):
+        policy = self._client.options.get('retry_policy', None)
+        if policy is None:
+            # the retry_max, retry_delay, retry_on_status and retry_on_timeouts options
+            policy = RetryPolicy.from_options(self._client.options)
+        return policy
+
+    def __priority(self):
+        priority = self.options.get('priority', None)
+        if priority is None:
+            priority = self._client.options.get('priority', PRIORITY.NORMAL)
+        return priority
+
     def __enable_logging(self):
         httplib.HTTPConnection.debuglevel = 1
         logging.basicConfig(level=logging.DEBUG)
@@ -173,11 +429,17 @@ class Response(object):
         self._code = code
         self._headers = headers
         self._raw_body = kwargs.get('raw_body', None)
+        self._raw = kwargs.get('raw', None)
+
+        if self._raw is not None:
+            # body is left unread on the raw stream (see the raw_stream request option)
+            self._body = None
+            return
 
         if headers.get('content-type') == 'application/gzip':
             # Async analytics data arrives as a gzipped file so decompress it on-the-fly.
-            # Note: might need to consider using zlib.decompressobj() instead
-            # in case data streams gets large enough (data size doesn't fit into memory at once)
+            # Use twitter_ads.utils.iter_gzip() on a raw_stream response for files
+            # too large to be decompressed in memory at once.
             raw_response_body = zlib.decompress(self._raw_body, 16 + zlib.MAX_WBITS).decode('utf-8')
         else:
             raw_response_body = self._raw_body
@@ -203,6 +465,10 @@ class Response(object):
     def raw_body(self):
         return self._raw_body
 
+    @property
+    def raw(self):
+        return self._raw
+
     @property
     def error(self):
         return True if (self._code >= 400 and self._code <= 599) else False
@@ -0,0 +1,188 @@
+# Copyright (C) 2015 Twitter, Inc.
+
+"""Container for the columnar (NumPy) representation of analytics metrics."""
+
+import json
+from datetime import timedelta
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from twitter_ads.enum import GRANULARITY
+
+
+class MetricsFrame(object):
+    """
+    Columnar view of analytics ``id_data`` responses.
+
+    Every metric is stored as a ``numpy.ma.MaskedArray`` shaped
+    ``(entity, segment, time bucket)`` whose mask marks the ``None`` series
+    (and entity/segment combinations absent from the response). Nested metrics,
+    e.g. conversion metrics, are flattened into ``'name.field'`` columns.
+    Requires the optional ``numpy`` dependency.
+    """
+
+    _STEPS = {
+        GRANULARITY.HOUR: timedelta(hours=1),
+        GRANULARITY.DAY: timedelta(days=1)
+    }
+
+    def __init__(self, ids, segments, metrics, **kwargs):
+        if numpy is None:
+            raise ImportError("MetricsFrame requires numpy: pip install twitter-ads[numpy]")
+        self._ids = list(ids)
+        self._segments = list(segments)
+        self._metrics = metrics
+        self._start_time = kwargs.get('start_time', None)
+        self._granularity = kwargs.get('granularity', None)
+
+    @classmethod
+    def from_data(klass, data, time_series_length=None, **kwargs):
+        """
+        Builds a frame from the ``data`` list returned by ``all_stats`` or
+        ``async_stats_job_data``.
+        """
+        if numpy is None:
+            raise ImportError("MetricsFrame requires numpy: pip install twitter-ads[numpy]")
+
+        ids = [entry['id'] for entry in data]
+        segments, segment_index = [], {}
+        series = {}
+        for entity, entry in enumerate(data):
+            for id_data in entry['id_data']:
+                segment = id_data.get('segment', None)
+                key = json.dumps(segment, sort_keys=True)
+                if key not in segment_index:
+                    segment_index[key] = len(segments)
+                    segments.append(segment)
+                for name, values in _flatten(id_data['metrics']):
+                    series.setdefault(name, []).append((entity, segment_index[key], values))
+
+        length = time_series_length or max(
+            [len(values) for items in series.values() for _, _, values in items if values] or [0])
+        shape = (len(ids), len(segments), length)
+
+        metrics = {}
+        for name, items in series.items():
+            values = numpy.zeros(shape, dtype=numpy.float64)
+            mask = numpy.ones(shape, dtype=bool)
+            for entity, segment, row in items:
+                if row is not None:
+                    values[entity, segment, :len(row)] = row
+                    mask[entity, segment, :len(row)] = False
+            metrics[name] = numpy.ma.MaskedArray(values, mask=mask)
+
+        return klass(ids, segments, metrics, **kwargs)
+
+    @property
+    def ids(self):
+        """Returns the entity IDs along the first axis."""
+        return self._ids
+
+    @property
+    def segments(self):
+        """Returns the segments along the second axis (``None`` when not segmented)."""
+        return self._segments
+
+    @property
+    def metrics(self):
+        """Returns the sorted list of available metric names."""
+        return sorted(self._metrics)
+
+    @property
+    def shape(self):
+        """Returns the ``(entity, segment, time bucket)`` shape of every metric."""
+        return (len(self._ids), len(self._segments), self.__length())
+
+    def __getitem__(self, name):
+        return self._metrics[name]
+
+    def __contains__(self, name):
+        return name in self._metrics
+
+    def rollup(self, factor, granularity=None):
+        """
+        Returns a new frame whose time buckets are the sums of ``factor``
+        consecutive buckets, e.g. ``rollup(24)`` turns hourly into daily data.
+        A rolled up bucket is masked only if all of its buckets are masked.
+        """
+        length = self.__length()
+        if length % factor:
+            raise ValueError("Error! {0} time buckets can not be rolled up by {1}."
+                             .format(length, factor))
+        metrics = {}
+        for name, values in self._metrics.items():
+            shape = values.shape[:2] + (length // factor, factor)
+            metrics[name] = values.reshape(shape).sum(axis=3)
+        return MetricsFrame(self._ids, self._segments, metrics,
+                            start_time=self._start_time, granularity=granularity)
+
+    def daily(self):
+        """Rolls hourly data up into daily buckets."""
+        if self._granularity != GRANULARITY.HOUR:
+            raise ValueError("Error! Only HOUR granularity data can be rolled up to days.")
+        return self.rollup(24, granularity=GRANULARITY.DAY)
+
+    def total(self, name, axis='entity'):
+        """
+        Returns the masked sum of a metric over the ``entity``, ``segment`` or
+        ``time`` axis.
+        """
+        return self._metrics[name].sum(axis=['entity', 'segment', 'time'].index(axis))
+
+    def ratio(self, numerator, denominator):
+        """
+        Returns ``numerator / denominator`` element-wise, masked wherever
+        either metric is missing or the denominator is zero.
+        """
+        return numpy.ma.divide(self._metrics[numerator], self._metrics[denominator])
+
+    def ctr(self):
+        """Returns the click-through rate (``clicks / impressions``)."""
+        return self.ratio('clicks', 'impressions')
+
+    def to_pandas(self):
+        """
+        Returns a long ``pandas.DataFrame`` with one row per entity, segment
+        and time bucket and one column per metric (requires ``pandas``).
+        """
+        import pandas
+        return pandas.DataFrame(self.__columns())
+
+    def to_arrow(self):
+        """Returns the same table as :meth:`to_pandas` as a ``pyarrow.Table``."""
+        import pyarrow
+        return pyarrow.table(self.__columns())
+
+    def __length(self):
+        return next(iter(self._metrics.values())).shape[2] if self._metrics else 0
+
+    def __columns(self):
+        entities, segments, length = self.shape
+        columns = {
+            'id': numpy.repeat(numpy.array(self._ids, dtype=object), segments * length),
+            'segment': numpy.tile(numpy.repeat(numpy.array(
+                [None if s is None else json.dumps(s, sort_keys=True) for s in self._segments],
+                dtype=object), length), entities)
+        }
+        step = self._STEPS.get(self._granularity, None)
+        if self._start_time is not None and step is not None:
+            buckets = [self._start_time + step * i for i in range(length)]
+            columns['time'] = numpy.tile(numpy.array(buckets, dtype=object), entities * segments)
+        else:
+            columns['bucket'] = numpy.tile(numpy.arange(length), entities * segments)
+        for name in self.metrics:
+            columns[name] = self._metrics[name].reshape(-1).filled(numpy.nan)
+        return columns
+
+
+def _flatten(metrics, prefix=''):
+    """Yields ``(name, series)`` pairs, flattening nested metric dicts."""
+    for name, values in sorted(metrics.items()):
+        if isinstance(values, dict):
+            for item in _flatten(values, prefix + name + '.'):
+                yield item
+        else:
+            yield prefix + name, values
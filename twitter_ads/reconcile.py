@@ -0,0 +1,232 @@
+# Copyright (C) 2015 Twitter, Inc.
+
+"""Container for the desired-state reconciler of account entities."""
+
+from collections import namedtuple
+from datetime import datetime
+
+from twitter_ads.campaign import Campaign, LineItem, TargetingCriteria
+from twitter_ads.cursor import Cursor
+from twitter_ads.enum import TRANSFORM
+from twitter_ads.http import Request
+from twitter_ads.resource import Resource
+from twitter_ads.utils import format_time, parse_time, split_list
+
+
+# maximum number of campaign or line item IDs per listing request
+_MAX_PARENT_IDS = 200
+
+Operation = namedtuple('Operation', ['operation_type', 'obj', 'changes'])
+Operation.__doc__ = """
+A planned ``Create``, ``Update`` or ``Delete`` of an entity. ``obj`` is the
+object sent through ``batch_save`` and ``changes`` maps the properties to
+update to their desired value.
+"""
+
+
+class Plan(object):
+    """The operations needed to bring an account to the desired state, per entity type."""
+
+    def __init__(self):
+        self._operations = dict((klass.__name__, []) for klass in Reconciler.ENTITIES)
+
+    def add(self, klass, operation_type, obj, changes=None):
+        self._operations[klass.__name__].append(Operation(operation_type, obj, changes or {}))
+
+    def operations(self, klass):
+        """Returns the planned operations of an entity type."""
+        return self._operations[klass.__name__]
+
+    def __iter__(self):
+        for klass in Reconciler.ENTITIES:
+            for operation in self._operations[klass.__name__]:
+                yield klass, operation
+
+    def __len__(self):
+        return sum(len(operations) for operations in self._operations.values())
+
+    def __str__(self):
+        lines = []
+        for klass, (operation_type, obj, changes) in self:
+            line = '{0} {1} {2}'.format(operation_type, klass.__name__, obj.id or '(new)')
+            if changes:
+                line += ': ' + ', '.join('{0}={1!r}'.format(name, value)
+                                         for name, value in sorted(changes.items()))
+            lines.append(line)
+        return '\n'.join(lines)
+
+
+class Reconciler(object):
+    """
+    Reconciles the campaigns, line items and targeting criteria of an account
+    with a desired state.
+
+    The current state is fetched with a few bulk listings, diffed locally
+    against the desired objects and the resulting Create, Update and Delete
+    operations are sent through :meth:`twitter_ads.resource.Batch.batch_save`.
+    Desired objects are matched by ID or, without one, by the ``KEYS``
+    properties of their type (e.g. a campaign by its name). Only the
+    properties set on a desired object are compared. A line item's
+    ``campaign_id`` (or a targeting criterion's ``line_item_id``) may refer to
+    a desired object which does not exist yet; it is resolved once created.
+
+    With ``prune=True`` entities missing from the desired state are deleted:
+    campaigns of the account, line items of the campaigns the desired line
+    items belong to and targeting criteria of the desired line items.
+    """
+
+    # entity types, in the order their operations are applied
+    ENTITIES = (Campaign, LineItem, TargetingCriteria)
+
+    KEYS = {
+        'Campaign': ('name',),
+        'LineItem': ('campaign_id', 'name'),
+        'TargetingCriteria': ('line_item_id', 'targeting_type', 'targeting_value')
+    }
+
+    # properties compared against the current state
+    IGNORED = ('id', 'to_delete')
+
+    def __init__(self, account, **kwargs):
+        self._account = account
+        self._prune = kwargs.get('prune', False)
+        self._max_workers = kwargs.get('max_workers', None)
+        self._page_size = kwargs.get('page_size', 1000)
+
+    def reconcile(self, desired, dry_run=False):
+        """
+        Plans the operations for a list of desired objects and applies them
+        unless ``dry_run`` is set. Returns the :class:`Plan`.
+        """
+        plan = self.plan(desired)
+        if not dry_run:
+            self.apply(plan)
+        return plan
+
+    def plan(self, desired):
+        """Returns the :class:`Plan` bringing the account to the desired state."""
+        desired_by_type = dict((klass.__name__, []) for klass in self.ENTITIES)
+        for obj in desired:
+            desired_by_type[obj.__class__.__name__].append(obj)
+
+        plan = Plan()
+        for klass in self.ENTITIES:
+            objs = desired_by_type[klass.__name__]
+            if klass is Campaign:
+                current = self.__fetch(Campaign) if objs or self._prune else []
+            elif klass is LineItem:
+                current = self.__fetch_by(LineItem, 'campaign_ids', objs, 'campaign_id')
+            else:
+                current = self.__fetch_by(TargetingCriteria, 'line_item_ids', objs, 'line_item_id')
+            self.__diff(plan, klass, objs, current)
+        return plan
+
+    def apply(self, plan):
+        """Sends the operations of a plan through ``batch_save``, one entity type at a time."""
+        for klass in self.ENTITIES:
+            objs = []
+            for operation_type, obj, changes in plan.operations(klass):
+                if operation_type == 'Delete':
+                    obj.to_delete = True
+                for name, value in changes.items():
+                    setattr(obj, name, value)
+                for name in ('campaign_id', 'line_item_id'):
+                    # references to desired objects created by a previous batch
+                    if name in klass.PROPERTIES and isinstance(getattr(obj, name), Resource):
+                        setattr(obj, name, getattr(obj, name).id)
+                objs.append(obj)
+            if objs:
+                klass.batch_save(self._account, objs, max_workers=self._max_workers)
+        return plan
+
+    def __fetch(self, klass, **params):
+        params['count'] = self._page_size
+        resource = klass.RESOURCE_COLLECTION.format(account_id=self._account.id)
+        request = Request(self._account.client, 'get', resource, params=params)
+        return list(Cursor(klass, request, init_with=[self._account], lazy=True))
+
+    def __fetch_by(self, klass, param, desired, name):
+        """Fetches the entities belonging to the (existing) parents of the desired objects."""
+        ids = sorted(set(_value(obj, name) for obj in desired) - set([None]))
+        current = []
+        for chunk in split_list(ids, _MAX_PARENT_IDS):
+            current.extend(self.__fetch(klass, **{param: ','.join(chunk)}))
+        return current
+
+    def __diff(self, plan, klass, desired, current):
+        by_id = dict((obj.id, obj) for obj in current)
+        by_key = dict((self.__key(klass, obj), obj) for obj in current)
+        matched = set()
+
+        for obj in desired:
+            match = by_id.get(obj.id, None) if obj.id else by_key.get(self.__key(klass, obj), None)
+            if match is None and obj.id:
+                # an existing entity outside of the listed ones
+                plan.add(klass, 'Update', obj, self.__changes(klass, obj, klass(self._account)))
+                continue
+            if match is None:
+                plan.add(klass, 'Create', obj)
+                continue
+            matched.add(match.id)
+            changes = self.__changes(klass, obj, match)
+            if not changes:
+                continue
+            if klass is TargetingCriteria:
+                # targeting criteria can not be updated, only replaced
+                plan.add(klass, 'Delete', match)
+                plan.add(klass, 'Create', obj)
+            else:
+                plan.add(klass, 'Update', match, changes)
+
+        if self._prune:
+            for obj in current:
+                if obj.id not in matched:
+                    plan.add(klass, 'Delete', obj)
+
+    def __key(self, klass, obj):
+        return tuple(_value(obj, name) for name in self.KEYS[klass.__name__])
+
+    def __changes(self, klass, desired, current):
+        changes = {}
+        for name in desired.to_params():
+            if name in self.IGNORED or klass.PROPERTIES[name].get('readonly', False):
+                continue
+            value = getattr(desired, name)
+            if isinstance(value, Resource):
+                continue
+            if _normalized(_listed(current, name)) != _normalized(value):
+                changes[name] = value
+        return changes
+
+
+def _value(obj, name):
+    """Returns a property value, resolving references to other resource objects to their ID."""
+    value = getattr(obj, name, None)
+    if isinstance(value, Resource):
+        return value.id
+    return value
+
+
+def _listed(obj, name):
+    """Returns a property value of a listed object as the API returned it, zero values included."""
+    raw = getattr(obj, '_raw', None)
+    if raw is None or name not in raw or getattr(obj, '_' + name, None) is not None:
+        return getattr(obj, name, None)
+    value = raw[name]
+    if isinstance(value, str) and obj.PROPERTIES[name].get('transform', None) == TRANSFORM.TIME:
+        return parse_time(value)
+    return value
+
+
+def _normalized(value):
+    """
+    Returns a property value in a comparable form. The API omits zero values
+    (and False), so they compare equal to a missing value.
+    """
+    if isinstance(value, Resource):
+        return value.id
+    if isinstance(value, int) and value == 0:
+        return None
+    if isinstance(value, datetime):
+        return format_time(value)
+    return value
@@ -2,33 +2,183 @@
 
 """Container for all plugable resource object logic used by the Ads API SDK."""
 
-import dateutil.parser
 import json
 
+from abc import ABCMeta
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from twitter_ads.utils import format_time
+from types import FunctionType
+from twitter_ads.utils import format_time, parse_time, split_list
 from twitter_ads.enum import ENTITY, TRANSFORM
+from twitter_ads.error import BatchError, Error
 from twitter_ads.http import Request
-from twitter_ads.cursor import Cursor
+from twitter_ads.cursor import AsyncCursor, Cursor, pop_cursor_options
 from twitter_ads.utils import extract_response_headers, FlattenParams
 
 
+_HYDRATORS = {}
+_COMPACT = {}
+_SLOTTED = {}
+_MISSING = object()
+
+# attributes every compact resource needs on top of its properties
+_BASE_SLOTS = ('_account', '_client', '_dirty', '_raw', '_response_headers')
+
+
 def resource_property(klass, name, **kwargs):
     """Builds a resource object property."""
+    if klass in _COMPACT or klass in _SLOTTED:
+        raise ValueError("Error! {0} already has a compact variant, properties can not be added."
+                         .format(klass.__name__))
     klass.PROPERTIES[name] = kwargs
-
-    def getter(self):
-        return getattr(self, '_%s' % name, kwargs.get('default', None))
+    _HYDRATORS.clear()
+
+    attr = '_%s' % name
+    default = kwargs.get('default', None)
+
+    if kwargs.get('transform', None) == TRANSFORM.TIME:
+        def getter(self):
+            value = getattr(self, attr, _MISSING)
+            if value is _MISSING:
+                value = _raw_value(self, name, default)
+            if isinstance(value, str):
+                # timestamps are hydrated as strings and parsed on first access
+                value = parse_time(value)
+                setattr(self, attr, value)
+            return value
+    else:
+        def getter(self):
+            value = getattr(self, attr, _MISSING)
+            if value is _MISSING:
+                return _raw_value(self, name, default)
+            return value
 
     if kwargs.get('readonly', False):
         setattr(klass, name, property(getter))
     else:
         def setter(self, value):
-            setattr(self, '_%s' % name, value)
+            setattr(self, attr, value)
+            # record the change so updates only send the modified properties
+            dirty = getattr(self, '_dirty', None)
+            if dirty is None:
+                self._dirty = set([name])
+            else:
+                dirty.add(name)
         setattr(klass, name, property(getter, setter))
 
 
-class Resource(object):
+def _raw_value(resource, name, default):
+    """
+    Returns a property value straight from the raw response kept by a lazily
+    hydrated resource, with the same semantics as an eager hydration.
+    """
+    raw = getattr(resource, '_raw', None)
+    if raw is None:
+        return default
+    value = raw.get(name, None)
+    if isinstance(value, int) and value == 0:
+        return default
+    return value
+
+
+def _hydrator(klass):
+    """
+    Returns the function populating the attributes of a resource class from an
+    API response. It is generated once per class from its PROPERTIES, so the
+    attribute names are resolved ahead of time instead of for every object.
+    """
+    hydrator = _HYDRATORS.get(klass, None)
+    if hydrator is None:
+        lines = ['def hydrate(self, response):', '    get = response.get']
+        for name in klass.PROPERTIES:
+            lines.append('    value = get({0!r})'.format(name))
+            # zero values (and False) are skipped, leaving the property default
+            lines.append('    if value != 0 or not isinstance(value, int):')
+            if name.isidentifier():
+                lines.append('        self._{0} = value'.format(name))
+            else:
+                lines.append('        setattr(self, {0!r}, value)'.format('_' + name))
+        namespace = {}
+        exec('\n'.join(lines), namespace)
+        hydrator = _HYDRATORS[klass] = namespace['hydrate']
+    return hydrator
+
+
+def compact(klass):
+    """
+    Returns a variant of a resource class which stores its attributes in
+    ``__slots__`` generated from its PROPERTIES instead of a per-instance
+    ``__dict__``, e.g. ``compact(LineItem).all(account)``. It behaves like the
+    original class and passes ``isinstance`` checks against it and its bases,
+    but arbitrary attributes can not be set on its instances. Variants are
+    built once per class, so properties must be defined before.
+    """
+    compacted = _COMPACT.get(klass, None)
+    if compacted is None:
+        slots = tuple(sorted(set(_BASE_SLOTS) | set('_' + name for name in klass.PROPERTIES)))
+        compacted = _COMPACT[klass] = _copy(klass, slots)
+    return compacted
+
+
+def _slotted(klass):
+    """Returns the copy of a base class (and of its own bases) declaring empty ``__slots__``."""
+    if klass is object or ('__slots__' in vars(klass) and not klass.__dictoffset__):
+        return klass
+    slotted = _SLOTTED.get(klass, None)
+    if slotted is None:
+        slotted = _SLOTTED[klass] = _copy(klass, ())
+    return slotted
+
+
+def _copy(klass, slots):
+    namespace = dict((key, value) for key, value in vars(klass).items()
+                     if key not in ('__dict__', '__weakref__') and not key.startswith('_abc_'))
+    namespace['__slots__'] = slots
+    bases = tuple(_slotted(base) for base in klass.__bases__)
+    copy = type(klass)(klass.__name__, bases, namespace)
+    if copy.__dictoffset__:
+        raise ValueError("Error! {0} has base classes which can not be slotted."
+                         .format(klass.__name__))
+    for key, value in namespace.items():
+        rebound = _rebound(value, copy)
+        if rebound is not value:
+            setattr(copy, key, rebound)
+    if isinstance(klass, ABCMeta):
+        klass.register(copy)
+    return copy
+
+
+def _rebound(value, copy):
+    """
+    Returns a copy of a method whose zero-argument ``super()`` refers to the
+    class copy instead of the original class, or the method itself.
+    """
+    if isinstance(value, (classmethod, staticmethod)):
+        function = _rebound(value.__func__, copy)
+        return value if function is value.__func__ else type(value)(function)
+    if isinstance(value, property):
+        functions = tuple(_rebound(f, copy) for f in (value.fget, value.fset, value.fdel))
+        if functions == (value.fget, value.fset, value.fdel):
+            return value
+        return property(*functions, doc=value.__doc__)
+    if not isinstance(value, FunctionType) or '__class__' not in value.__code__.co_freevars:
+        return value
+    closure = tuple(_cell(copy) if name == '__class__' else cell
+                    for name, cell in zip(value.__code__.co_freevars, value.__closure__))
+    function = FunctionType(value.__code__, value.__globals__, value.__name__,
+                            value.__defaults__, closure)
+    function.__kwdefaults__ = value.__kwdefaults__
+    function.__qualname__ = value.__qualname__
+    function.__doc__ = value.__doc__
+    function.__dict__.update(value.__dict__)
+    return function
+
+
+def _cell(value):
+    return (lambda: value).__closure__[0]
+
+
+class Resource(object, metaclass=ABCMeta):
     """Base class for all API resource objects."""
 
     def __init__(self, account):
@@ -38,39 +188,80 @@ class Resource(object):
     def account(self):
         return self._account
 
-    def from_response(self, response, headers=None):
+    @property
+    def response_headers(self):
+        """
+        Returns the rate-limit (``x-``) headers of the response this object
+        was populated from, if any.
+        """
+        return getattr(self, '_response_headers', None) or {}
+
+    def mark_dirty(self, *names):
+        """
+        Records properties as changed, so that the next update sends them.
+        Assignments are recorded automatically, but in-place edits of list or
+        dict values (e.g. ``line_item.categories.append(...)``) are not.
+        """
+        for name in names:
+            if name not in self.PROPERTIES:
+                raise ValueError("Error! {0} has no property {1!r}."
+                                 .format(self.__class__.__name__, name))
+        dirty = getattr(self, '_dirty', None)
+        if dirty is None:
+            self._dirty = set(names)
+        else:
+            dirty.update(names)
+        return self
+
+    def from_response(self, response, headers=None, lazy=False):
         """
         Populates a given objects attributes from a parsed JSON API response.
         This helper handles all necessary type coercions as it assigns
         attribute values.
+
+        With ``lazy=True`` the response dict is kept as is and properties are
+        only read from it (and converted) when accessed. This is meant for
+        freshly created objects, such as the ones yielded by a Cursor. It
+        trades memory for time: the whole response dict stays alive with the
+        object, which takes about twice the memory of an eager one.
         """
         if headers is not None:
-            limits = extract_response_headers(headers)
-            for k in limits:
-                setattr(self, k, limits[k])
+            self._response_headers = extract_response_headers(headers)
+            if hasattr(self, '__dict__'):
+                # also exposed as attributes on regular (non compact) objects
+                self.__dict__.update(self._response_headers)
 
-        for name in self.PROPERTIES:
-            attr = '_{0}'.format(name)
-            transform = self.PROPERTIES[name].get('transform', None)
-            value = response.get(name, None)
-            if transform and transform == TRANSFORM.TIME and value:
-                setattr(self, attr, dateutil.parser.parse(value))
-            if isinstance(value, int) and value == 0:
-                continue  # skip attribute
-            else:
-                setattr(self, attr, value)
+        if lazy:
+            self._raw = response
+        else:
+            _hydrator(self.__class__)(self, response)
+
+        # the object now matches the API again
+        if getattr(self, '_dirty', None):
+            self._dirty = None
 
         return self
 
-    def to_params(self):
+    def to_params(self, dirty=False):
         """
         Generates a Hash of property values for the current object. This helper
         handles all necessary type coercions as it generates its output.
+
+        With ``dirty=True`` only the properties assigned (or passed to
+        :meth:`mark_dirty`) since the object was last populated from the API
+        are included.
         """
         params = {}
-        for name in self.PROPERTIES:
+        names = self.PROPERTIES
+        if dirty:
+            names = [name for name in names if name in (getattr(self, '_dirty', None) or ())]
+        for name in names:
             attr = '_{0}'.format(name)
-            value = getattr(self, attr, None) or getattr(self, name, None)
+            value = getattr(self, attr, _MISSING)
+            if value is _MISSING:
+                # unread properties of lazy objects serialize straight from the response
+                value = _raw_value(self, name, None)
+            value = value or getattr(self, name, None)
 
             # skip attribute
             if value is None:
@@ -87,18 +278,74 @@ class Resource(object):
 
     @classmethod
     def all(klass, account, **kwargs):
-        """Returns a Cursor instance for a given resource."""
+        """
+        Returns a Cursor instance for a given resource. A ``deadline`` bounds
+        the time spent fetching all of its pages and the
+        :data:`twitter_ads.cursor.CURSOR_OPTIONS` (e.g. ``streaming=True``)
+        are passed to the Cursor.
+        """
+        deadline = kwargs.pop('deadline', None)
+        priority = kwargs.pop('priority', None)
+        options = pop_cursor_options(kwargs)
         resource = klass.RESOURCE_COLLECTION.format(account_id=account.id)
-        request = Request(account.client, 'get', resource, params=kwargs)
-        return Cursor(klass, request, init_with=[account])
+        request = Request(account.client, 'get', resource, params=kwargs,
+                          deadline=deadline, priority=priority)
+        return Cursor(klass, request, init_with=[account], **options)
 
     @classmethod
     def load(klass, account, id, **kwargs):
-        """Returns an object instance for a given resource."""
+        """
+        Returns an object instance for a given resource. With an
+        ``identity_map`` client option, an object already loaded (without
+        params) is returned as is.
+        """
+        deadline = kwargs.pop('deadline', None)
+        priority = kwargs.pop('priority', None)
+        identity_map = account.client.options.get('identity_map', None)
+        if identity_map is not None and not kwargs:
+            obj = identity_map.get(klass, account.id, id)
+            if obj is not None:
+                return obj
+
         resource = klass.RESOURCE.format(account_id=account.id, id=id)
-        response = Request(account.client, 'get', resource, params=kwargs).perform()
+        response = Request(account.client, 'get', resource, params=kwargs,
+                           deadline=deadline, priority=priority).perform()
+
+        obj = klass(account).from_response(response.body['data'])
+        if identity_map is not None:
+            identity_map.put(obj)
+        return obj
+
+    @classmethod
+    def all_async(klass, account, **kwargs):
+        """Returns an AsyncCursor instance for a given resource."""
+        deadline = kwargs.pop('deadline', None)
+        priority = kwargs.pop('priority', None)
+        options = pop_cursor_options(kwargs)
+        resource = klass.RESOURCE_COLLECTION.format(account_id=account.id)
+        request = Request(account.client, 'get', resource, params=kwargs,
+                          deadline=deadline, priority=priority)
+        return AsyncCursor(klass, request, init_with=[account], **options)
 
-        return klass(account).from_response(response.body['data'])
+    @classmethod
+    async def load_async(klass, account, id, **kwargs):
+        """Awaitable counterpart of :meth:`load`."""
+        deadline = kwargs.pop('deadline', None)
+        priority = kwargs.pop('priority', None)
+        identity_map = account.client.options.get('identity_map', None)
+        if identity_map is not None and not kwargs:
+            obj = identity_map.get(klass, account.id, id)
+            if obj is not None:
+                return obj
+
+        resource = klass.RESOURCE.format(account_id=account.id, id=id)
+        response = await Request(account.client, 'get', resource, params=kwargs,
+                                 deadline=deadline, priority=priority).perform_async()
+
+        obj = klass(account).from_response(response.body['data'])
+        if identity_map is not None:
+            identity_map.put(obj)
+        return obj
 
     def reload(self, **kwargs):
         """
@@ -107,10 +354,17 @@ class Resource(object):
         if not self.id:
             return self
 
+        deadline = kwargs.pop('deadline', None)
+        priority = kwargs.pop('priority', None)
         resource = self.RESOURCE.format(account_id=self.account.id, id=self.id)
-        response = Request(self.account.client, 'get', resource, params=kwargs).perform()
+        response = Request(self.account.client, 'get', resource, params=kwargs,
+                           deadline=deadline, priority=priority).perform()
 
-        return self.from_response(response.body['data'])
+        self.from_response(response.body['data'])
+        identity_map = self.account.client.options.get('identity_map', None)
+        if identity_map is not None:
+            identity_map.put(self)
+        return self
 
     def __repr__(self):
         return '<{name} resource at {mem} id={id}>'.format(
@@ -134,7 +388,7 @@ class Resource(object):
             return klass.load(self, id, **kwargs)
 
 
-class Batch(object):
+class Batch(object, metaclass=ABCMeta):
 
     _ENTITY_MAP = {
         'LineItem': ENTITY.LINE_ITEM,
@@ -142,31 +396,66 @@ class Batch(object):
         'TargetingCriteria': ENTITY.TARGETING_CRITERION
     }
 
+    # maximum number of objects per batch request
+    BATCH_SIZE = 40
+
     @classmethod
-    def batch_save(klass, account, objs):
+    def batch_save(klass, account, objs, **kwargs):
         """
         Makes batch request(s) for a passed in list of objects
+
+        Objects are sent in chunks of at most ``BATCH_SIZE`` per request on up
+        to ``max_workers`` threads (defaults to the ``batch_max_workers`` client
+        option, or 4) and each object is populated from its result. A failed
+        request does not stop the others: a :class:`twitter_ads.error.BatchError`
+        mapping its errors back to the objects is raised once all of them are
+        done. Updates only send the changed properties and unchanged objects
+        are skipped.
         """
+        # updates of objects without changed properties are skipped
+        objs = [obj for obj in objs
+                if obj.id is None or obj.to_delete is True or getattr(obj, '_dirty', None)]
+        chunks = list(split_list(objs, klass.BATCH_SIZE))
+
+        def save(chunk):
+            try:
+                klass.__save_chunk(account, chunk)
+            except Error as e:
+                return chunk, e
+
+        if len(chunks) <= 1:
+            failures = [failure for failure in map(save, chunks) if failure]
+        else:
+            max_workers = kwargs.get('max_workers', None) \
+                or account.client.options.get('batch_max_workers', 4)
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as executor:
+                failures = [failure for failure in executor.map(save, chunks) if failure]
 
-        resource = klass.BATCH_RESOURCE_COLLECTION.format(account_id=account.id)
+        if failures:
+            raise BatchError(failures)
 
+    @classmethod
+    def __save_chunk(klass, account, objs):
+        entity_type = klass._ENTITY_MAP[klass.__name__].lower()
         json_body = []
 
         for obj in objs:
-            entity_type = klass._ENTITY_MAP[klass.__name__].lower()
-            obj_json = {'params': obj.to_params()}
-
             if obj.id is None:
-                obj_json['operation_type'] = 'Create'
+                obj_json = {'params': obj.to_params(), 'operation_type': 'Create'}
             elif obj.to_delete is True:
-                obj_json['operation_type'] = 'Delete'
+                obj_json = {'params': obj.to_params(), 'operation_type': 'Delete'}
                 obj_json['params'][entity_type + '_id'] = obj.id
             else:
-                obj_json['operation_type'] = 'Update'
+                obj_json = {'params': obj.to_params(dirty=True), 'operation_type': 'Update'}
                 obj_json['params'][entity_type + '_id'] = obj.id
 
             json_body.append(obj_json)
 
+        identity_map = account.client.options.get('identity_map', None)
+        if identity_map is not None:
+            for obj in objs:
+                identity_map.discard(obj)
+
         resource = klass.BATCH_RESOURCE_COLLECTION.format(account_id=account.id)
         response = Request(account.client,
                            'post', resource,
@@ -178,7 +467,7 @@ class Batch(object):
             obj = obj.from_response(res_obj)
 
 
-class Persistence(object):
+class Persistence(object, metaclass=ABCMeta):
     """
     Container for all persistence related logic used by API resource objects.
     """
@@ -196,18 +485,29 @@ class Persistence(object):
     def save(self):
         """
         Saves or updates the current object instance depending on the
-        presence of `object.id`.
+        presence of `object.id`. Updates only send the changed properties and
+        are skipped when nothing changed: call :meth:`Resource.mark_dirty`
+        after editing a list or dict property in place.
         """
         if self.id:
+            # updates only send the changed properties, if there are any
+            if not getattr(self, '_dirty', None):
+                return self
             method = 'put'
             resource = self.RESOURCE.format(account_id=self.account.id, id=self.id)
+            params = self.to_params(dirty=True)
         else:
             method = 'post'
             resource = self.RESOURCE_COLLECTION.format(account_id=self.account.id)
+            params = self.to_params()
+
+        identity_map = self.account.client.options.get('identity_map', None)
+        if identity_map is not None:
+            identity_map.discard(self)
 
         response = Request(
             self.account.client, method,
-            resource, params=self.to_params()).perform()
+            resource, params=params).perform()
 
         return self.from_response(response.body['data'])
 
@@ -216,6 +516,10 @@ class Persistence(object):
         Deletes the current object instance depending on the
         presence of `object.id`.
         """
+        identity_map = self.account.client.options.get('identity_map', None)
+        if identity_map is not None:
+            identity_map.discard(self)
+
         resource = self.RESOURCE.format(account_id=self.account.id, id=self.id)
         response = Request(self.account.client, 'delete', resource).perform()
         self.from_response(response.body['data'])
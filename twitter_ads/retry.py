@@ -0,0 +1,164 @@
+# Copyright (C) 2015 Twitter, Inc.
+
+"""Container for the retry policies applied to failed API requests."""
+
+import asyncio
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+from requests.exceptions import Timeout
+
+
+class RetryBudget(object):
+    """
+    Limits the share of retries across all requests using a policy, so a
+    struggling API is not flooded with retries.
+
+    Every failed attempt takes a token and every successful request gives
+    back ``token_ratio`` tokens, up to ``max_tokens``. Retries stop while
+    less than half of the tokens are left.
+    """
+
+    def __init__(self, max_tokens=100, token_ratio=0.1):
+        self._max_tokens = float(max_tokens)
+        self._token_ratio = token_ratio
+        self._tokens = float(max_tokens)
+        self._lock = threading.Lock()
+
+    @property
+    def tokens(self):
+        return self._tokens
+
+    def success(self):
+        """Records a successful request."""
+        with self._lock:
+            self._tokens = min(self._max_tokens, self._tokens + self._token_ratio)
+
+    def failure(self):
+        """Records a failed attempt and returns whether it may be retried."""
+        with self._lock:
+            self._tokens = max(0.0, self._tokens - 1)
+            return self._tokens > self._max_tokens / 2
+
+
+class RetryPolicy(object):
+    """
+    Decides whether (and after how long) a failed request is retried. Set it
+    as the ``retry_policy`` client option.
+
+    Retries back off exponentially from ``base_delay`` up to ``max_delay``
+    seconds (or wait ``base_delay`` when ``backoff`` is off) with full jitter,
+    so that concurrent clients spread out instead of retrying in lockstep. A
+    ``retry-after`` header or, for a 429, the rate-limit reset header sets the
+    minimum delay instead.
+
+    ``retry_on_status`` and ``retry_on_exceptions`` either list what is
+    retried up to ``max_retries`` times or map it to its own number of
+    retries, e.g. ``{429: 5, 503: 2}``. An optional :class:`RetryBudget`
+    caps the retries shared by every request of the client.
+    """
+
+    def __init__(self, max_retries=3, base_delay=0.5, max_delay=60, backoff=True, jitter=True,
+                 retry_on_status=(429, 500, 503),
+                 retry_on_exceptions=(Timeout, asyncio.TimeoutError),
+                 respect_retry_after=True, budget=None):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.backoff = backoff
+        self.jitter = jitter
+        self.retry_on_status = _rules(retry_on_status)
+        self.retry_on_exceptions = _rules(retry_on_exceptions)
+        self.respect_retry_after = respect_retry_after
+        self.budget = budget
+
+    @classmethod
+    def from_options(klass, options):
+        """
+        Returns the policy matching the ``retry_max``, ``retry_delay``,
+        ``retry_on_status`` and ``retry_on_timeouts`` client options: a fixed
+        delay without jitter.
+        """
+        delay = int(options.get('retry_delay', 1500)) / 1000
+        exceptions = (Timeout, asyncio.TimeoutError) \
+            if options.get('retry_on_timeouts', False) else ()
+        return klass(max_retries=options.get('retry_max', 0), base_delay=delay,
+                     max_delay=delay, jitter=False, backoff=False,
+                     retry_on_status=options.get('retry_on_status', [500, 503]),
+                     retry_on_exceptions=exceptions, respect_retry_after=False)
+
+    def success(self):
+        """Records a successful request."""
+        if self.budget is not None:
+            self.budget.success()
+
+    def retry_delay(self, attempt, status=None, headers=None, error=None):
+        """
+        Returns the number of seconds to wait before retrying a request which
+        failed with a status code (and response headers) or an exception, or
+        None if it must not be retried. ``attempt`` counts the retries so far.
+        """
+        if error is not None:
+            limit = _match(self.retry_on_exceptions, lambda rule: isinstance(error, rule))
+        else:
+            limit = _match(self.retry_on_status, lambda rule: rule == status)
+        if limit is _NO_RETRY:
+            return None
+        if attempt >= (self.max_retries if limit is None else limit):
+            return None
+        if self.budget is not None and not self.budget.failure():
+            return None
+
+        if self.backoff:
+            delay = min(self.max_delay, self.base_delay * 2 ** attempt)
+        else:
+            delay = self.base_delay
+        if self.jitter:
+            delay = random.uniform(0, delay)
+
+        hint = self.__server_delay(status, headers or {})
+        if hint is not None:
+            # wait for the server but still spread the clients waiting on it
+            delay = hint + (random.uniform(0, self.base_delay) if self.jitter else 0)
+        return delay
+
+    def __server_delay(self, status, headers):
+        if not self.respect_retry_after:
+            return None
+
+        retry_after = headers.get('retry-after', None)
+        if retry_after is not None:
+            try:
+                return max(0.0, float(retry_after))
+            except ValueError:
+                try:
+                    return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+                except (TypeError, ValueError):
+                    pass
+
+        if status == 429:
+            reset = headers.get('x-account-rate-limit-reset') \
+                or headers.get('x-rate-limit-reset')
+            if reset is not None:
+                return max(0.0, int(reset) - time.time())
+        return None
+
+
+_NO_RETRY = object()
+
+
+def _rules(rules):
+    """Normalizes a list of statuses or exception types to a ``{rule: max_retries}`` dict."""
+    if isinstance(rules, dict):
+        return dict(rules)
+    return dict((rule, None) for rule in rules)
+
+
+def _match(rules, matches):
+    """Returns the retry limit of the first matching rule (None meaning the default)."""
+    for rule, limit in rules.items():
+        if matches(rule):
+            return limit
+    return _NO_RETRY
@@ -0,0 +1,212 @@
+# Copyright (C) 2015 Twitter, Inc.
+
+"""Container for the rate-limit aware request scheduler used by the Ads API SDK."""
+
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+
+from twitter_ads.enum import PRIORITY
+
+
+class _Bucket(object):
+    """Token bucket tracking the rate-limit budget of a single endpoint family."""
+
+    def __init__(self, burst):
+        self.burst = burst
+        self.limit = None
+        self.remaining = None
+        self.reset_at = None
+        self.tokens = float(burst)
+        self.refilled_at = time.time()
+
+    def update(self, limit, remaining, reset_at):
+        if reset_at != self.reset_at:
+            # first budget seen for a new rate-limit window
+            self.tokens = float(self.burst)
+        self.limit = limit
+        self.remaining = remaining
+        self.reset_at = reset_at
+        self.tokens = min(self.tokens, float(max(remaining, 0)))
+
+    def rate(self, now):
+        """Returns the number of requests per second the remaining budget allows."""
+        return self.remaining / max(self.reset_at - now, 1.0)
+
+    def wait_time(self, now, reserve):
+        """Returns the number of seconds until a request may be sent (0 if right now)."""
+        if self.reset_at is None:
+            return 0.0
+
+        if now >= self.reset_at:
+            # a new rate-limit window started, the budget is unknown until the next response
+            self.remaining = self.limit
+            self.reset_at = None
+            self.tokens = float(self.burst)
+            return 0.0
+
+        if self.remaining - reserve <= 0:
+            return self.reset_at - now
+
+        self.tokens = min(float(self.burst),
+                          self.tokens + (now - self.refilled_at) * self.rate(now))
+        self.refilled_at = now
+        if self.tokens >= 1.0:
+            return 0.0
+        return (1.0 - self.tokens) / self.rate(now)
+
+    def take(self):
+        self.tokens -= 1.0
+        if self.remaining is not None:
+            self.remaining -= 1
+
+
+class RateLimitScheduler(object):
+    """
+    Paces requests ahead of time using the ``x-account-rate-limit-*`` (or
+    ``x-rate-limit-*``) response headers instead of waiting for a 429.
+
+    Budgets are tracked per ``(account_id, endpoint family)`` in a token bucket
+    which spreads the remaining requests of the current window until its reset.
+    Requests waiting on the same budget are released in priority order (see
+    :data:`twitter_ads.enum.PRIORITY`), so latency-sensitive calls do not queue
+    behind bulk jobs. A ``reserve`` of requests per window can be held back for
+    :data:`PRIORITY.HIGH` work only.
+
+    A single scheduler may be shared by several clients through the
+    ``rate_limit_scheduler`` client option.
+    """
+
+    def __init__(self, burst=10, reserve=0):
+        self._burst = burst
+        self._reserve = reserve
+        self._buckets = {}
+        self._queues = {}
+        self._counter = itertools.count()
+        self._lock = threading.Condition()
+
+    def budget(self, key):
+        """
+        Returns the last known ``(limit, remaining, reset_at)`` budget for a key
+        or ``None`` if nothing is known yet.
+        """
+        with self._lock:
+            bucket = self._buckets.get(key, None)
+            if bucket is None or bucket.reset_at is None:
+                return None
+            return bucket.limit, bucket.remaining, bucket.reset_at
+
+    def update(self, key, headers):
+        """Records the rate-limit budget returned in a set of response headers."""
+        limit = headers.get('x-account-rate-limit-limit') or headers.get('x-rate-limit-limit')
+        remaining = headers.get('x-account-rate-limit-remaining') \
+            or headers.get('x-rate-limit-remaining')
+        reset_at = headers.get('x-account-rate-limit-reset') \
+            or headers.get('x-rate-limit-reset')
+        if remaining is None or reset_at is None:
+            return
+
+        with self._lock:
+            bucket = self.__bucket(key)
+            bucket.update(int(limit or remaining), int(remaining), int(reset_at))
+            self._lock.notify_all()
+
+    def acquire(self, key, priority=PRIORITY.NORMAL, timeout=None):
+        """
+        Blocks until a request for the given key may be sent and returns True.
+        With a ``timeout`` (in seconds), returns False instead as soon as the
+        wait is known to exceed it.
+        """
+        expires_at = None if timeout is None else time.time() + timeout
+        with self._lock:
+            ticket = self.__enqueue(key, priority)
+            try:
+                while True:
+                    wait = self.__try_take(key, ticket)
+                    if wait == 0:
+                        return True
+                    if expires_at is not None:
+                        wait = self.__bounded_wait(key, ticket, wait, expires_at)
+                        if wait is None:
+                            return False
+                    self._lock.wait(wait)
+            except BaseException:
+                # e.g. KeyboardInterrupt, do not block the requests queued behind
+                self.__dequeue(key, ticket)
+                raise
+
+    async def acquire_async(self, key, priority=PRIORITY.NORMAL, timeout=None):
+        """Awaitable counterpart of :meth:`acquire` which never blocks the event loop."""
+        expires_at = None if timeout is None else time.time() + timeout
+        with self._lock:
+            ticket = self.__enqueue(key, priority)
+        try:
+            while True:
+                with self._lock:
+                    wait = self.__try_take(key, ticket)
+                    if wait != 0 and expires_at is not None:
+                        wait = self.__bounded_wait(key, ticket, wait, expires_at)
+                        if wait is None:
+                            return False
+                if wait == 0:
+                    return True
+                await asyncio.sleep(0.05 if wait is None else min(wait, 0.05))
+        except BaseException:
+            # e.g. cancelled by asyncio.wait_for, do not block the requests queued behind
+            with self._lock:
+                self.__dequeue(key, ticket)
+            raise
+
+    def __bucket(self, key):
+        bucket = self._buckets.get(key, None)
+        if bucket is None:
+            bucket = self._buckets[key] = _Bucket(self._burst)
+        return bucket
+
+    def __enqueue(self, key, priority):
+        ticket = (priority, next(self._counter))
+        heapq.heappush(self._queues.setdefault(key, []), ticket)
+        return ticket
+
+    def __bounded_wait(self, key, ticket, wait, expires_at):
+        """
+        Returns the time to wait before the ticket's timeout, or dequeues the
+        ticket and returns None if it can not be served in time.
+        """
+        remaining = expires_at - time.time()
+        if remaining > 0 and (wait is None or wait <= remaining):
+            return remaining if wait is None else wait
+        self.__dequeue(key, ticket)
+        return None
+
+    def __dequeue(self, key, ticket):
+        """Removes a ticket which will not be served, if still queued."""
+        queue = self._queues.get(key, [])
+        if ticket not in queue:
+            return
+        queue.remove(ticket)
+        heapq.heapify(queue)
+        if not queue:
+            del self._queues[key]
+        self._lock.notify_all()
+
+    def __try_take(self, key, ticket):
+        """
+        Takes a token for the ticket and returns 0, or returns the number of
+        seconds to wait before trying again (None meaning until notified).
+        """
+        queue = self._queues[key]
+        if queue[0] != ticket:
+            return None
+        reserve = 0 if ticket[0] == PRIORITY.HIGH else self._reserve
+        wait = self.__bucket(key).wait_time(time.time(), reserve)
+        if wait > 0:
+            return wait
+        self.__bucket(key).take()
+        heapq.heappop(queue)
+        if not queue:
+            del self._queues[key]
+        self._lock.notify_all()
+        return 0
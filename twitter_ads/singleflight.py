@@ -0,0 +1,73 @@
+# Copyright (C) 2015 Twitter, Inc.
+
+"""Container for the coalescing of identical concurrent requests used by the Ads API SDK."""
+
+import threading
+
+from twitter_ads.error import DeadlineExceeded
+
+
+class _Call(object):
+    """A request in flight and the outcome shared with its waiters."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight(object):
+    """
+    Shares one in-flight request between concurrent callers of the same key,
+    so a burst of identical GET requests costs a single round trip and a
+    single request of rate-limit budget. Set it as the ``single_flight``
+    client option; it may be shared by several clients since keys include
+    the credentials.
+
+    Every caller receives the same :class:`twitter_ads.http.Response` (or
+    exception). Only requests which are in flight at the same time are
+    coalesced, nothing is cached.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._shared = 0
+        self._lock = threading.Lock()
+
+    @property
+    def shared(self):
+        """Returns the number of calls served by another caller's request so far."""
+        return self._shared
+
+    def do(self, key, fn, deadline=None):
+        """
+        Returns ``fn()``, or waits for the result of the call in flight for the
+        same key. A waiter gives up with :class:`twitter_ads.error.DeadlineExceeded`
+        once its ``deadline`` (a :class:`twitter_ads.http.Deadline`) expires.
+        """
+        with self._lock:
+            call = self._calls.get(key, None)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self._shared += 1
+
+        if leader:
+            try:
+                call.result = fn()
+            except Exception as e:
+                call.error = e
+                raise
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+            return call.result
+
+        timeout = None if deadline is None else deadline.remaining()
+        if not call.done.wait(timeout):
+            raise DeadlineExceeded(deadline.remaining(), timeout)
+        if call.error is not None:
+            raise call.error
+        return call.result
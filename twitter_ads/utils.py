@@ -3,13 +3,19 @@ from __future__ import division
 
 """Container for all helpers and utilities used throughout the Ads API SDK."""
 
+import codecs
 import datetime
+import json
 import re
+import zlib
 import warnings
 warnings.simplefilter('default', DeprecationWarning)
 from email.utils import formatdate
+from functools import lru_cache
 from time import mktime
 
+import dateutil.parser
+
 from twitter_ads import VERSION
 from twitter_ads.enum import GRANULARITY
 
@@ -51,6 +57,22 @@ def format_time(time):
     return time.strftime('%Y-%m-%dT%H:%M:%SZ')
 
 
+_API_TIME = re.compile(r'(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2}):(\d{2})Z$')
+
+
+@lru_cache(maxsize=4096)
+def parse_time(value):
+    """
+    Parses an API timestamp into a UTC datetime. The ``YYYY-MM-DDTHH:MM:SSZ``
+    shape always returned by the Ads API is parsed directly and any other
+    shape falls back to ``dateutil``. Results are memoized.
+    """
+    match = _API_TIME.match(value)
+    if match:
+        return datetime.datetime(*map(int, match.groups()), tzinfo=datetime.timezone.utc)
+    return dateutil.parser.parse(value)
+
+
 def format_date(time):
     """Formats a datetime as an ISO 8601 compliant string, dropping time."""
     return time.strftime('%Y-%m-%d')
@@ -81,6 +103,121 @@ def extract_response_headers(headers):
     return values
 
 
+def endpoint_family(resource):
+    """
+    Returns the ``(account_id, family)`` pair identifying the endpoint family
+    a resource path belongs to, e.g. ``/11/accounts/abc1/line_items/xyz`` maps
+    to ``('abc1', 'line_items')`` and ``/11/stats/jobs/accounts/abc1`` maps to
+    ``('abc1', 'stats/jobs')``.
+    """
+    parts = [part for part in resource.split('?')[0].split('/') if part]
+    if parts and re.match(r'^\d+(\.\d+)?$', parts[0]):
+        parts = parts[1:]
+
+    if 'accounts' in parts:
+        index = parts.index('accounts')
+        account_id = parts[index + 1] if len(parts) > index + 1 else None
+        family = '/'.join(parts[:index] + parts[index + 2:index + 3])
+        return account_id, family or 'accounts'
+
+    family = parts[:1]
+    if len(parts) > 1 and '.' not in parts[1]:
+        family.append(parts[1])
+    return None, '/'.join(family)
+
+
+def iter_gzip(fileobj, chunk_size=65536):
+    """
+    Reads a gzip compressed file-like object in chunks and yields the
+    decompressed content as UTF-8 decoded text chunks.
+    """
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    while True:
+        data = fileobj.read(chunk_size)
+        if not data:
+            break
+        text = decoder.decode(decompressor.decompress(data))
+        if text:
+            yield text
+    text = decoder.decode(decompressor.flush(), final=True)
+    if text:
+        yield text
+
+
+def iter_json_array(chunks, key):
+    """
+    Incrementally parses a JSON object streamed as text chunks and yields the
+    elements of the array stored under the given top-level key one by one,
+    without ever holding the whole document in memory.
+    """
+    decoder = json.JSONDecoder()
+    chunks = iter(chunks)
+    state = {'buffer': '', 'pos': 0, 'eof': False}
+
+    def read_more():
+        if state['eof']:
+            raise ValueError("Unexpected end of JSON document.")
+        try:
+            chunk = next(chunks)
+        except StopIteration:
+            state['eof'] = True
+            return
+        state['buffer'] = state['buffer'][state['pos']:] + chunk
+        state['pos'] = 0
+
+    def peek():
+        while True:
+            buffer, pos = state['buffer'], state['pos']
+            while pos < len(buffer) and buffer[pos] in ' \t\r\n':
+                pos += 1
+            state['pos'] = pos
+            if pos < len(buffer):
+                return buffer[pos]
+            read_more()
+
+    def expect(chars):
+        char = peek()
+        if char not in chars:
+            raise ValueError("Unexpected character {0!r} in JSON document.".format(char))
+        state['pos'] += 1
+        return char
+
+    def value():
+        peek()
+        while True:
+            try:
+                obj, end = decoder.raw_decode(state['buffer'], state['pos'])
+                # a value is always followed by a delimiter, which guarantees that
+                # numbers and literals were not cut off at the end of the buffer
+                if end < len(state['buffer']) or state['eof']:
+                    state['pos'] = end
+                    return obj
+            except ValueError:
+                pass
+            read_more()
+
+    expect('{')
+    if peek() == '}':
+        return
+    while True:
+        name = value()
+        expect(':')
+        if name == key and peek() == '[':
+            expect('[')
+            if peek() == ']':
+                expect(']')
+            else:
+                while True:
+                    yield value()
+                    if expect(',]') == ']':
+                        break
+        else:
+            value()
+        if expect(',}') == '}':
+            return
+
+
 def split_list(list_, n):
     """Splits a list by a given number (n) and returns a generator object."""
     list_size = len(list_)